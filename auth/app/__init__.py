@@ -1,15 +1,39 @@
 from sanic import Sanic
-from sanic.response import text
+from sanic.response import json, raw, text
 from sanic_mongodb_ext import MongoDbExtension
 from sanic_redis_ext import RedisExtension
 from sanic_amqp_ext import AmqpExtension
 
+from app.broadcast import Broadcaster
+from app.groups.defaults import DefaultGroups, load_default_groups
+from app.loaders import DocumentLoaders
+from app.metrics import MetricsRegistry
+from app.permissions.api.workers.check_permissions import CheckPermissionsWorker
+from app.permissions.api.workers.check_permissions_batch import CheckPermissionsBatchWorker
+from app.permissions.index import PERMISSION_INDEX_UPDATE_EVENT, PermissionIndex, \
+    load_permission_index, refresh_permission_index
 from app.rabbitmq.workers import RegisterMicroserviceWorker
+from app.redis_storage import RedisStorage
+from app.singleflight import SingleFlight
 from app.token.api.workers.generate_token import GenerateTokenWorker
 from app.token.api.workers.refresh_token import RefreshTokenWorker
+from app.token.api.workers.revoke_token import RevokeTokenWorker
 from app.token.api.workers.verify_token import VerifyTokenWorker
+from app.token.api.workers.verify_token_batch import VerifyTokenBatchWorker
+from app.token.cache import VerifiedTokenCache
+from app.token.keys import KeySet
+from app.token.redis import ROTATE_REFRESH_TOKEN_SCRIPT
+from app.token.revocation import REVOKED_TOKEN_EVENT, RevocationList, add_revoked_token, \
+    load_revocation_list
+from app.token.rotation import SIGNING_KEYS_RELOAD_EVENT, reload_key_set
 from app.users.api.workers.register_game_client import RegisterGameClientWorker
 from app.users.api.workers.user_profile import UserProfileWorker
+from app.users.api.workers.user_profile_batch import UserProfileBatchWorker
+from app.users.api.workers.username_availability import UsernameAvailabilityWorker
+from app.users.cache import UserProfileCache
+from app.users.security import CryptoExecutor
+from app.users.usernames import USERNAME_ADDED_EVENT, USERNAME_FILTER_RELOAD_EVENT, \
+    UsernameFilter, add_username, load_username_filter, sync_username_filter
 
 
 app = Sanic('microservice-auth')
@@ -22,13 +46,92 @@ MongoDbExtension(app)
 RedisExtension(app)
 
 
+# Process-local components
+app.metrics = MetricsRegistry()
+app.redis_storage = RedisStorage(app)
+app.metrics.register('redis', app.redis_storage.get_stats)
+app.redis_storage.register_script(ROTATE_REFRESH_TOKEN_SCRIPT)
+app.single_flight = SingleFlight()
+app.metrics.register('single_flight', app.single_flight.get_stats)
+app.loaders = DocumentLoaders.from_config(app.config)
+app.metrics.register('loaders', app.loaders.get_stats)
+app.broadcaster = Broadcaster(app.config["BROADCAST_CHANNEL_NAME"])
+app.metrics.register('broadcaster', app.broadcaster.get_stats)
+app.crypto_executor = CryptoExecutor.from_config(app.config)
+app.metrics.register('crypto_executor', app.crypto_executor.get_stats)
+app.jwt_key_set = KeySet.from_config(app.config)
+app.jwt_token_cache = None
+if app.config["JWT_VERIFY_CACHE_SIZE"]:
+    app.jwt_token_cache = VerifiedTokenCache(max_size=app.config["JWT_VERIFY_CACHE_SIZE"])
+    app.metrics.register('verified_token_cache', app.jwt_token_cache.get_stats)
+
+app.profile_cache = None
+if app.config["USER_PROFILE_CACHE_TTL"]:
+    app.profile_cache = UserProfileCache.from_config(app.redis_storage, app.config)
+    app.metrics.register('user_profile_cache', app.profile_cache.get_stats)
+
+app.default_groups = DefaultGroups.from_config(app.config)
+app.metrics.register('default_groups', app.default_groups.get_stats)
+app.permission_index = PermissionIndex()
+app.metrics.register('permission_index', app.permission_index.get_stats)
+app.jwt_revocation_list = RevocationList.from_config(app.config)
+app.metrics.register('revocation_list', app.jwt_revocation_list.get_stats)
+app.username_filter = UsernameFilter.from_config(app.config)
+app.metrics.register('username_filter', app.username_filter.get_stats)
+
+app.broadcaster.register_handler(SIGNING_KEYS_RELOAD_EVENT, reload_key_set)
+app.broadcaster.register_handler(REVOKED_TOKEN_EVENT, add_revoked_token)
+app.broadcaster.register_handler(PERMISSION_INDEX_UPDATE_EVENT, refresh_permission_index)
+app.broadcaster.register_handler(PERMISSION_INDEX_UPDATE_EVENT, load_default_groups)
+app.broadcaster.register_handler(USERNAME_ADDED_EVENT, add_username)
+app.broadcaster.register_handler(USERNAME_FILTER_RELOAD_EVENT, load_username_filter)
+app.broadcaster.register_resync_handler(reload_key_set)
+app.broadcaster.register_resync_handler(
+    load_revocation_list, interval=app.config["JWT_REVOCATION_RESYNC_INTERVAL"]
+)
+app.broadcaster.register_resync_handler(load_permission_index)
+app.broadcaster.register_resync_handler(load_default_groups)
+if app.config["USERS_USERNAME_FILTER_RELOAD_INTERVAL"]:
+    app.broadcaster.register_resync_handler(
+        load_username_filter, interval=app.config["USERS_USERNAME_FILTER_RELOAD_INTERVAL"]
+    )
+app.broadcaster.register_resync_handler(
+    sync_username_filter, interval=app.config["USERS_USERNAME_FILTER_SYNC_INTERVAL"]
+)
+
+
+@app.listener('before_server_start')
+async def initialize_components(app_inner, loop):
+    await app_inner.redis_storage.load_scripts()
+    # The state is loaded after subscribing, so that no broadcast event
+    # published in the meantime is missed
+    await app_inner.broadcaster.start(app_inner, loop)
+    await reload_key_set(app_inner)
+    await load_revocation_list(app_inner)
+    await load_permission_index(app_inner)
+    await load_default_groups(app_inner)
+    await load_username_filter(app_inner)
+
+
+@app.listener('after_server_stop')
+async def shutdown_components(app_inner, _loop):
+    await app_inner.broadcaster.stop(app_inner)
+    app_inner.crypto_executor.shutdown()
+
+
 # RabbitMQ workers
 app.amqp.register_worker(RegisterMicroserviceWorker(app))
 app.amqp.register_worker(GenerateTokenWorker(app))
 app.amqp.register_worker(RefreshTokenWorker(app))
 app.amqp.register_worker(VerifyTokenWorker(app))
+app.amqp.register_worker(VerifyTokenBatchWorker(app))
+app.amqp.register_worker(RevokeTokenWorker(app))
 app.amqp.register_worker(RegisterGameClientWorker(app))
 app.amqp.register_worker(UserProfileWorker(app))
+app.amqp.register_worker(UserProfileBatchWorker(app))
+app.amqp.register_worker(UsernameAvailabilityWorker(app))
+app.amqp.register_worker(CheckPermissionsWorker(app))
+app.amqp.register_worker(CheckPermissionsBatchWorker(app))
 
 
 # Public API
@@ -36,4 +139,21 @@ async def health_check(request):
     return text('OK')
 
 
+async def runtime_metrics(request):
+    return json(request.app.metrics.collect())
+
+
+async def json_web_key_set(request):
+    body, etag = request.app.jwt_key_set.get_jwks_document()
+    headers = {
+        'ETag': etag,
+        'Cache-Control': 'public, max-age={}'.format(request.app.config["JWKS_MAX_AGE"]),
+    }
+    if request.headers.get('If-None-Match') == etag:
+        return raw(b'', status=304, headers=headers)
+    return raw(body, headers=headers, content_type='application/json')
+
+
 app.add_route(health_check, '/auth/api/health-check', methods=['GET', ], name='health-check')
+app.add_route(runtime_metrics, '/auth/api/metrics', methods=['GET', ], name='metrics')
+app.add_route(json_web_key_set, '/auth/api/.well-known/jwks.json', methods=['GET', ], name='jwks')
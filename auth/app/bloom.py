@@ -0,0 +1,42 @@
+from hashlib import blake2b
+from math import ceil, log
+
+
+class BloomFilter(object):
+    """
+    A probabilistic set: a membership test never gives false negatives and
+    gives false positives with a probability close to the `error_rate`,
+    while the filter holds no more than `capacity` items.
+    """
+
+    def __init__(self, capacity, error_rate=0.001):
+        self.capacity = max(capacity, 1)
+        self.error_rate = error_rate
+        self.size = int(ceil(-self.capacity * log(error_rate) / (log(2) ** 2)))
+        self.hash_count = max(int(round(self.size / self.capacity * log(2))), 1)
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _get_positions(self, item):
+        if isinstance(item, str):
+            item = item.encode('utf-8')
+        digest = blake2b(item, digest_size=16).digest()
+        # Double hashing: the k positions are derived from two 64-bit halves
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        return [(first + i * second) % self.size for i in range(self.hash_count)]
+
+    def add(self, item):
+        for position in self._get_positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item):
+        bits = self.bits
+        for position in self._get_positions(item):
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+    def __len__(self):
+        return self.count
@@ -0,0 +1,121 @@
+from asyncio import CancelledError, sleep
+
+from sanic.log import logger
+
+
+class Broadcaster(object):
+    """
+    Delivers events to every process of the microservice over Redis pub/sub.
+
+    Messages, published while the subscription is lost, are never delivered,
+    so after subscribing again the resync handlers reload the whole state,
+    that is kept up to date by the events.
+    """
+
+    def __init__(self, channel_name, reconnect_interval=1):
+        self.channel_name = channel_name
+        self.reconnect_interval = reconnect_interval
+        self.handlers = {}
+        self.resync_handlers = []
+        self._task = None
+        self._resync_tasks = []
+        self.reconnects = 0
+
+    def register_handler(self, event, handler):
+        self.handlers.setdefault(event, []).append(handler)
+
+    def register_resync_handler(self, handler, interval=None):
+        """
+        Registers a handler, that reloads the state after subscribing again
+        and, when the `interval` is specified, every `interval` seconds.
+        """
+        self.resync_handlers.append((handler, interval))
+
+    async def publish(self, redis, event, data=None):
+        await redis.publish_json(self.channel_name, {"event": event, "data": data})
+
+    async def dispatch(self, app, message):
+        for handler in self.handlers.get(message.get("event", None), []):
+            try:
+                await handler(app, message.get("data", None))
+            except Exception:
+                logger.exception("Broadcast handler for `%s` failed.", message.get("event"))
+
+    async def resync(self, app):
+        for handler, _interval in self.resync_handlers:
+            try:
+                await handler(app)
+            except Exception:
+                logger.exception("Broadcast resync handler failed.")
+
+    async def resync_periodically(self, app, handler, interval):
+        try:
+            while True:
+                await sleep(interval)
+                try:
+                    await handler(app)
+                except Exception:
+                    logger.exception("Periodic resync handler failed.")
+        except CancelledError:
+            pass
+
+    async def subscribe(self, app):
+        channel, = await app.redis.subscribe(self.channel_name)
+        return channel
+
+    async def resubscribe(self, app):
+        while True:
+            try:
+                return await self.subscribe(app)
+            except CancelledError:
+                raise
+            except Exception:
+                logger.exception("Subscribing to `%s` failed.", self.channel_name)
+                await sleep(self.reconnect_interval)
+
+    async def listen(self, app, channel):
+        try:
+            while True:
+                try:
+                    while await channel.wait_message():
+                        message = await channel.get_json()
+                        await self.dispatch(app, message)
+                except CancelledError:
+                    raise
+                except Exception:
+                    logger.exception("Listening to `%s` failed.", self.channel_name)
+
+                # The channel is closed when the connection to Redis drops
+                logger.warning("Subscription to `%s` was lost.", self.channel_name)
+                await sleep(self.reconnect_interval)
+                channel = await self.resubscribe(app)
+                self.reconnects += 1
+                await self.resync(app)
+        except CancelledError:
+            pass
+
+    def get_stats(self):
+        return {
+            "listening": self._task is not None and not self._task.done(),
+            "reconnects": self.reconnects,
+        }
+
+    async def start(self, app, loop):
+        channel = await self.subscribe(app)
+        self._task = loop.create_task(self.listen(app, channel))
+        self._resync_tasks = [
+            loop.create_task(self.resync_periodically(app, handler, interval))
+            for handler, interval in self.resync_handlers
+            if interval
+        ]
+
+    async def stop(self, app):
+        for task in [self._task, ] + self._resync_tasks:
+            if task is not None and not task.done():
+                task.cancel()
+        self._task = None
+        self._resync_tasks = []
+
+        redis = getattr(app, 'redis', None)
+        if redis is not None and not redis.closed:
+            await redis.unsubscribe(self.channel_name)
@@ -0,0 +1,99 @@
+from asyncio import get_event_loop
+
+from aioredis import create_redis_pool
+from motor.motor_asyncio import AsyncIOMotorClient
+from sanic_script import Command, Option
+
+from app import app
+from app.groups.defaults import find_groups_by_names
+from app.permissions.index import load_permission_index
+from app.users.api.workers.register_game_client import RegisterGameClientWorker
+from app.users.documents import User
+from app.users.imports import UserImporter, chunked, get_file_format, read_user_rows
+from app.users.permissions import get_effective_permissions
+from app.users.security import CryptoExecutor
+from app.users.usernames import USERNAME_FILTER_RELOAD_EVENT
+
+
+class ImportUsersCommand(Command):
+    """
+    Import users from a JSONL or CSV file with the `username` and `password` fields.
+    Passwords, that are already hashed with bcrypt, are stored as is.
+    """
+    app = app
+
+    option_list = (
+        Option('--file', '-f', dest='path', required=True),
+        Option('--format', dest='file_format', default=None),
+        Option('--group', '-g', dest='group', default=RegisterGameClientWorker.DEFAULT_GROUP_NAME),  # NOQA
+        Option('--chunk-size', '-c', dest='chunk_size', type=int, default=None),
+        Option('--workers', '-w', dest='workers', type=int, default=None),
+    )
+
+    async def get_effective_permissions(self, group_ids):
+        if not self.app.config["USERS_EFFECTIVE_PERMISSIONS"]:
+            return None
+        await load_permission_index(self.app)
+        return get_effective_permissions(self.app, group_ids)
+
+    async def import_users(self, path, file_format, group, chunk_size, workers):
+        file_format = get_file_format(path, file_format)
+        groups = await find_groups_by_names([group, ])
+        if not groups:
+            print("The `{}` group doesn't exist. Run `python manage.py prepare_mongodb` first.".format(group))  # NOQA
+            return
+        group_ids = [groups[0]['_id'], ]
+
+        crypto_executor = CryptoExecutor(
+            executor_type='process',
+            max_workers=workers,
+            max_queue_size=chunk_size
+        )
+        importer = UserImporter(
+            User.collection,
+            crypto_executor,
+            group_ids,
+            effective_permissions=await self.get_effective_permissions(group_ids)
+        )
+        print("Importing users from {}...".format(path))
+        try:
+            with open(path, newline='') as stream:
+                for rows in chunked(read_user_rows(stream, file_format), chunk_size):
+                    await importer.import_chunk(rows)
+                    print(importer.progress.report())
+        finally:
+            crypto_executor.shutdown()
+        print("Done! {}".format(importer.progress.report()))
+        if importer.progress.inserted:
+            await self.reload_username_filters()
+
+    async def reload_username_filters(self):
+        # The users are inserted without the document hooks, so the running
+        # servers have to read the usernames again
+        redis = await create_redis_pool(
+            (self.app.config["REDIS_HOST"], self.app.config["REDIS_PORT"]),
+            db=self.app.config["REDIS_DATABASE"]
+        )
+        try:
+            await self.app.broadcaster.publish(redis, USERNAME_FILTER_RELOAD_EVENT)
+        finally:
+            redis.close()
+            await redis.wait_closed()
+        print("Running servers were notified to reload the username filters.")
+
+    def init_lazy_umongo(self):
+        client = AsyncIOMotorClient(self.app.config['MONGODB_URI'])
+        database = client[self.app.config['MONGODB_DATABASE']]
+        lazy_umongo = self.app.config["LAZY_UMONGO"]
+        lazy_umongo.init(database)
+
+    def run(self, *args, **kwargs):
+        self.init_lazy_umongo()
+        loop = get_event_loop()
+        loop.run_until_complete(self.import_users(
+            kwargs['path'],
+            kwargs.get('file_format', None),
+            kwargs.get('group', RegisterGameClientWorker.DEFAULT_GROUP_NAME),
+            kwargs.get('chunk_size', None) or self.app.config["USERS_IMPORT_CHUNK_SIZE"],
+            kwargs.get('workers', None) or self.app.config["USERS_IMPORT_WORKERS"],
+        ))
@@ -0,0 +1,37 @@
+from asyncio import get_event_loop
+
+from aioredis import create_redis_pool
+from sanic_script import Command
+
+from app import app
+from app.token.api.schemas import DEFAULT_DEVICE_ID
+from app.token.redis import migrate_refresh_tokens
+
+
+class MigrateRefreshTokensCommand(Command):
+    """
+    Convert stored refresh tokens to the per-device format and set their expiration.
+    """
+    app = app
+
+    async def migrate(self):
+        redis = await create_redis_pool(
+            (self.app.config["REDIS_HOST"], self.app.config["REDIS_PORT"]),
+            db=self.app.config["REDIS_DATABASE"]
+        )
+        try:
+            print("Scanning refresh tokens...")
+            converted, expired = await migrate_refresh_tokens(
+                redis,
+                self.app,
+                DEFAULT_DEVICE_ID,
+                self.app.config["JWT_REFRESH_TOKEN_LIFETIME"]
+            )
+        finally:
+            redis.close()
+            await redis.wait_closed()
+        print("Converted tokens: {}. Keys with a new TTL: {}.".format(converted, expired))
+
+    def run(self, *args, **kwargs):
+        loop = get_event_loop()
+        loop.run_until_complete(self.migrate())
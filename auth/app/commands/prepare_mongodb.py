@@ -1,12 +1,14 @@
 from asyncio import get_event_loop
 
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import TEXT
 from sanic_script import Command
 
 from app import app
 from app.groups.documents import Group
 from app.microservices.documents import Microservice
 from app.permissions.documents import Permission
+from app.token.documents import JsonWebKey
 from app.users.documents import User
 
 
@@ -16,19 +18,32 @@ class PrepareMongoDbCommand(Command):
     """
     app = app
 
+    async def drop_outdated_indexes(self):
+        # Group names were indexed with a TEXT index, replaced by the collated one
+        indexes = await Group.collection.index_information()
+        for name, index in indexes.items():
+            if any(direction == TEXT for _field, direction in index['key']):
+                await Group.collection.drop_index(name)
+                print("The outdated `{}` index of groups was dropped...".format(name))
+
     async def create_indexes(self):
         print("Clearing collections...")
         await User.ensure_indexes()
         print("User document was initialized...")
 
+        await self.drop_outdated_indexes()
         await Group.ensure_indexes()
         print("Group document was initialized...")
 
         await Permission.ensure_indexes()
+        await Permission.assign_indexes()
         print("Permission document was initialized...")
 
         await Microservice.ensure_indexes()
         print("Microservice document was initialized...")
+
+        await JsonWebKey.ensure_indexes()
+        print("JsonWebKey document was initialized...")
         print("Done!")
 
     async def initialize_documents(self):
@@ -0,0 +1,33 @@
+from asyncio import get_event_loop
+
+from motor.motor_asyncio import AsyncIOMotorClient
+from sanic_script import Command
+
+from app import app
+from app.permissions.index import load_permission_index
+from app.users.permissions import update_effective_permissions
+
+
+class RebuildEffectivePermissionsCommand(Command):
+    """
+    Backfill or rebuild the denormalized permissions of all users.
+    """
+    app = app
+
+    async def rebuild(self):
+        print("Loading permissions of groups...")
+        await load_permission_index(self.app)
+        print("Updating users...")
+        updates = await update_effective_permissions(self.app)
+        print("Done! Distinct group combinations updated: {}.".format(updates))
+
+    def init_lazy_umongo(self):
+        client = AsyncIOMotorClient(self.app.config['MONGODB_URI'])
+        database = client[self.app.config['MONGODB_DATABASE']]
+        lazy_umongo = self.app.config["LAZY_UMONGO"]
+        lazy_umongo.init(database)
+
+    def run(self, *args, **kwargs):
+        self.init_lazy_umongo()
+        loop = get_event_loop()
+        loop.run_until_complete(self.rebuild())
@@ -0,0 +1,43 @@
+from asyncio import get_event_loop
+
+from aioredis import create_redis_pool
+from motor.motor_asyncio import AsyncIOMotorClient
+from sanic_script import Command, Option
+
+from app import app
+from app.token.rotation import rotate_signing_key
+
+
+class RotateSigningKeyCommand(Command):
+    """
+    Publish a new signing key for JSON Web Tokens, that replaces the active one
+    once the cached JWKS documents expire.
+    """
+    app = app
+
+    option_list = (
+        Option('--algorithm', '-a', dest='algorithm', default=None),
+    )
+
+    async def rotate(self, algorithm):
+        redis = await create_redis_pool(
+            (self.app.config["REDIS_HOST"], self.app.config["REDIS_PORT"]),
+            db=self.app.config["REDIS_DATABASE"]
+        )
+        try:
+            kid, activates_at = await rotate_signing_key(self.app, redis, algorithm)
+        finally:
+            redis.close()
+            await redis.wait_closed()
+        print("The `{}` key was published and becomes active at {} UTC.".format(kid, activates_at))
+
+    def init_lazy_umongo(self):
+        client = AsyncIOMotorClient(self.app.config['MONGODB_URI'])
+        database = client[self.app.config['MONGODB_DATABASE']]
+        lazy_umongo = self.app.config["LAZY_UMONGO"]
+        lazy_umongo.init(database)
+
+    def run(self, *args, **kwargs):
+        self.init_lazy_umongo()
+        loop = get_event_loop()
+        loop.run_until_complete(self.rotate(kwargs.get('algorithm', None)))
@@ -0,0 +1,75 @@
+from pymongo import ASCENDING
+
+
+GROUP_NAME_COLLATION = {"locale": "en", "strength": 2}
+
+
+class DefaultGroups(object):
+    """
+    A process-local cache of the IDs of the groups, declared in the
+    DEFAULT_GROUPS setting, that saves a query per user registration.
+    """
+
+    def __init__(self, names):
+        self.names = list(names)
+        self.group_ids = {}
+        self.loads = 0
+        self.misses = 0
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(config["DEFAULT_GROUPS"].keys())
+
+    @staticmethod
+    def normalize_name(name):
+        # Matches the case-insensitive collation of the `name` index
+        return name.casefold()
+
+    def replace(self, groups):
+        """
+        Rebuilds the cache from the `{"_id", "name"}` group documents. Group
+        names aren't unique, so only the first group with the name is used.
+        """
+        group_ids = {}
+        for group in groups:
+            key = self.normalize_name(group['name'])
+            group_ids.setdefault(key, [group['_id'], ])
+        self.group_ids = group_ids
+        self.loads += 1
+
+    def get(self, name):
+        return self.group_ids.get(self.normalize_name(name), [])
+
+    def get_stats(self):
+        return {
+            "groups": len(self.group_ids),
+            "loads": self.loads,
+            "misses": self.misses,
+        }
+
+
+async def find_groups_by_names(names):
+    from app.groups.documents import Group
+    cursor = Group.collection \
+        .find({"name": {"$in": list(names)}}, {"_id": 1, "name": 1}) \
+        .collation(GROUP_NAME_COLLATION) \
+        .sort("_id", ASCENDING)
+    return await cursor.to_list(None)
+
+
+async def load_default_groups(app, _data=None):
+    groups = await find_groups_by_names(app.default_groups.names)
+    app.default_groups.replace(groups)
+
+
+async def get_default_group_ids(app, name):
+    group_ids = app.default_groups.get(name)
+    if not group_ids:
+        # The group might be created after the cache was loaded, so missing
+        # entries are never cached and looked up again
+        app.default_groups.misses += 1
+        groups = await find_groups_by_names([name, ])
+        group_ids = [groups[0]['_id'], ] if groups else []
+        if group_ids:
+            await load_default_groups(app)
+    return group_ids
@@ -1,10 +1,13 @@
-from pymongo import TEXT
+from pymongo import ASCENDING, IndexModel
 from pymongo.collation import Collation
 from umongo import Document
 from umongo.fields import StringField, ListField, ReferenceField
 
 from app import app
 from app.permissions.documents import Permission
+from app.permissions.index import update_permission_index
+from app.users.cache import invalidate_user_profiles
+from app.users.permissions import update_effective_permissions
 
 
 instance = app.config["LAZY_UMONGO"]
@@ -17,16 +20,30 @@ class Group(Document):
 
     @classmethod
     async def synchronize_permissions(cls, old_permissions_ids, new_permissions_ids):
+        updated_groups = set()
         deleted_permissions = list(set(old_permissions_ids) - set(new_permissions_ids))
         if deleted_permissions:
+            updated_groups.update(
+                app.permission_index.get_group_ids_with_permissions(deleted_permissions)
+            )
             await Group.collection.update_many(
                 {},
                 {"$pull": {"permissions": {"$in": deleted_permissions}}}
             )
 
         new_permissions = list(set(new_permissions_ids) - set(old_permissions_ids))
-        if not new_permissions_ids:
-            return
+        if new_permissions:
+            updated_groups.update(await cls.add_default_permissions(new_permissions))
+
+        await update_permission_index(app, group_ids=updated_groups)
+        if updated_groups:
+            if app.config["USERS_EFFECTIVE_PERMISSIONS"]:
+                await update_effective_permissions(app, updated_groups)
+            await invalidate_user_profiles(app)
+
+    @classmethod
+    async def add_default_permissions(cls, new_permissions):
+        updated_groups = set()
 
         for group_name, config in app.config["DEFAULT_GROUPS"].items():
             inserted_permissions = new_permissions[:]
@@ -49,9 +66,17 @@ class Group(Document):
                     {"name": group_name},
                     {"$addToSet": {"permissions": {"$each": inserted_permissions}}}
                 )
+                cursor = Group.collection.find({"name": group_name}, {"_id": 1})
+                updated_groups.update([document['_id'] async for document in cursor])
+
+        return updated_groups
 
     class Meta:
-        indexes = {
-            "keys": [('name', TEXT), ],
-            "collation": Collation(locale="en", strength=2)
-        }
+        # Group names are looked up by equality, ignoring the case
+        indexes = [
+            IndexModel(
+                [('name', ASCENDING), ],
+                name="name_collated",
+                collation=Collation(locale="en", strength=2)
+            ),
+        ]
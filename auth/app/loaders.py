@@ -0,0 +1,108 @@
+from asyncio import ensure_future, get_event_loop
+
+
+class BatchLoader(object):
+    """
+    Gathers keys, requested by concurrent callers within one event loop
+    iteration (or within the `window` in seconds), and loads them with a
+    single `batch_load(keys)` call, that returns a dictionary of values.
+
+    Callers, requesting the same key, get the same value object, so the
+    values must be treated as read-only.
+    """
+
+    def __init__(self, batch_load, window=0.0, max_batch_size=1000):
+        self.batch_load = batch_load
+        self.window = window
+        self.max_batch_size = max_batch_size
+        self._queue = []
+        self._handle = None
+        self.loads = 0
+        self.batches = 0
+
+    async def load(self, key):
+        future = get_event_loop().create_future()
+        self._queue.append((key, future))
+        self.loads += 1
+
+        if len(self._queue) >= self.max_batch_size:
+            self._dispatch()
+        elif self._handle is None:
+            loop = get_event_loop()
+            if self.window:
+                self._handle = loop.call_later(self.window, self._dispatch)
+            else:
+                self._handle = loop.call_soon(self._dispatch)
+        return await future
+
+    def _dispatch(self):
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        queue, self._queue = self._queue, []
+        if queue:
+            self.batches += 1
+            ensure_future(self._load_batch(queue))
+
+    async def _load_batch(self, queue):
+        keys = list({key: None for key, _future in queue})
+        try:
+            values = await self.batch_load(keys)
+        except Exception as exc:
+            for _key, future in queue:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+
+        for key, future in queue:
+            if not future.done():
+                future.set_result(values.get(key, None))
+
+    def get_stats(self):
+        return {
+            "loads": self.loads,
+            "batches": self.batches,
+            "average_batch_size": self.loads / self.batches if self.batches else 0.0,
+        }
+
+
+def create_document_loader(get_collection, field, projection=None, **kwargs):
+    """
+    Creates a loader of raw MongoDB documents by the unique `field`.
+    """
+    async def batch_load(keys):
+        cursor = get_collection().find({field: {'$in': keys}}, projection)
+        return {document[field]: document async for document in cursor}
+
+    return BatchLoader(batch_load, **kwargs)
+
+
+class DocumentLoaders(object):
+    """
+    Batching loaders of users, shared by all messages, processed concurrently
+    by the workers. Groups and permissions are served by the permission index.
+    """
+
+    def __init__(self, window=0.0, max_batch_size=1000):
+        from app.users.documents import User
+        from app.users.lookups import LOGIN_PROJECTION, PROFILE_PROJECTION
+        options = {'window': window, 'max_batch_size': max_batch_size}
+        self.users_by_id = create_document_loader(
+            lambda: User.collection, '_id', PROFILE_PROJECTION, **options
+        )
+        self.users_by_username = create_document_loader(
+            lambda: User.collection, 'username', LOGIN_PROJECTION, **options
+        )
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(
+            window=config["MONGODB_BATCH_WINDOW"] / 1000.0,
+            max_batch_size=config["MONGODB_BATCH_MAX_SIZE"]
+        )
+
+    def get_stats(self):
+        return {
+            "users_by_id": self.users_by_id.get_stats(),
+            "users_by_username": self.users_by_username.get_stats(),
+        }
@@ -0,0 +1,16 @@
+from collections import OrderedDict
+
+
+class MetricsRegistry(object):
+    """
+    Gathers runtime statistics from the process-local components of the application.
+    """
+
+    def __init__(self):
+        self.collectors = OrderedDict()
+
+    def register(self, name, collector):
+        self.collectors[name] = collector
+
+    def collect(self):
+        return {name: collector() for name, collector in self.collectors.items()}
@@ -2,6 +2,7 @@ from marshmallow import UnmarshalResult
 from pymongo import UpdateOne
 
 from app import app
+from app.permissions.index import update_permission_index
 
 
 Microservice = app.config["LAZY_UMONGO"].Microservice
@@ -15,15 +16,25 @@ class MicroserviceSchema(Microservice.schema.as_marshmallow_schema()):
         if permissions.errors:
             errors_result.update({'permissions': permissions.errors})
 
+    @staticmethod
+    def get_permission_fields(permission):
+        # Bit indexes are assigned only by `Permission.assign_indexes`
+        return {key: value for key, value in permission.items() if key != 'index'}
+
     async def load_permissions(self, data, result):
         permissions = []
 
         if data:
             requests = [
-                UpdateOne({'codename': permission['codename']}, {'$set': permission}, upsert=True)
+                UpdateOne(
+                    {'codename': permission['codename']},
+                    {'$set': self.get_permission_fields(permission)},
+                    upsert=True
+                )
                 for permission in data
             ]
             await Permission.collection.bulk_write(requests)
+            await Permission.assign_indexes()
 
             pipeline = [
                 {'$match': {
@@ -37,6 +48,8 @@ class MicroserviceSchema(Microservice.schema.as_marshmallow_schema()):
             query_result = await Permission.collection.aggregate(pipeline).to_list(1)
             permissions = query_result[0]['ids'] if query_result else []
 
+            await update_permission_index(app, permission_ids=permissions)
+
         result['permissions'] = permissions
 
     def load(self, data, *args, **kwargs):
@@ -0,0 +1,54 @@
+from marshmallow import Schema, validate
+from marshmallow.fields import List, Nested, String
+
+
+class CheckPermissionsSchema(Schema):
+    MAX_PERMISSIONS = 100
+
+    access_token = String(
+        load_only=True,
+        required=True,
+        allow_none=False,
+        description='Access token.',
+        validate=validate.Length(min=1, error='Field cannot be blank.')
+    )
+    permissions = List(
+        String(allow_none=False),
+        load_only=True,
+        required=True,
+        allow_none=False,
+        description='List of permission codenames to check.',
+        validate=validate.Length(
+            min=1,
+            max=MAX_PERMISSIONS,
+            error='Field must contain from {min} to {max} permissions.'
+        )
+    )
+
+    class Meta:
+        fields = (
+            'access_token',
+            'permissions',
+        )
+
+
+class CheckPermissionsBatchSchema(Schema):
+    MAX_BATCH_SIZE = 1000
+
+    checks = List(
+        Nested(CheckPermissionsSchema),
+        load_only=True,
+        required=True,
+        allow_none=False,
+        description='List of access tokens with the permissions to check.',
+        validate=validate.Length(
+            min=1,
+            max=MAX_BATCH_SIZE,
+            error='Field must contain from {min} to {max} checks.'
+        )
+    )
+
+    class Meta:
+        fields = (
+            'checks',
+        )
@@ -0,0 +1,65 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+
+
+class PermissionSet(object):
+    """
+    A set of permissions, stored as a bitset of the permission indexes.
+    """
+    __slots__ = ('bits', )
+
+    def __init__(self, bits=0):
+        self.bits = bits
+
+    @classmethod
+    def from_indexes(cls, indexes):
+        bits = 0
+        for index in indexes:
+            bits |= 1 << index
+        return cls(bits)
+
+    @classmethod
+    def from_base64(cls, value):
+        padding = '=' * (-len(value) % 4)
+        return cls(int.from_bytes(urlsafe_b64decode(value + padding), 'little'))
+
+    def to_base64(self):
+        data = self.bits.to_bytes((self.bits.bit_length() + 7) // 8, 'little')
+        return urlsafe_b64encode(data).rstrip(b'=').decode('ascii')
+
+    def add(self, index):
+        self.bits |= 1 << index
+
+    def issuperset(self, other):
+        return self.bits & other.bits == other.bits
+
+    def __contains__(self, index):
+        return bool(self.bits >> index & 1)
+
+    def __or__(self, other):
+        return PermissionSet(self.bits | other.bits)
+
+    def __and__(self, other):
+        return PermissionSet(self.bits & other.bits)
+
+    def __eq__(self, other):
+        return isinstance(other, PermissionSet) and self.bits == other.bits
+
+    def __hash__(self):
+        return hash(self.bits)
+
+    def __len__(self):
+        return bin(self.bits).count('1')
+
+    def __bool__(self):
+        return self.bits != 0
+
+    def __iter__(self):
+        bits, index = self.bits, 0
+        while bits:
+            if bits & 1:
+                yield index
+            bits >>= 1
+            index += 1
+
+    def __repr__(self):
+        return '<PermissionSet {}>'.format(list(self))
@@ -1,11 +1,15 @@
+from pymongo import ASCENDING, IndexModel, ReturnDocument, UpdateOne
 from umongo import Document, validate
-from umongo.fields import StringField
+from umongo.fields import IntegerField, StringField
 
 from app import app
 
 
 instance = app.config["LAZY_UMONGO"]
 
+COUNTERS_COLLECTION_NAME = 'counters'
+PERMISSION_INDEX_COUNTER = 'permissions.index'
+
 
 @instance.register
 class Permission(Document):
@@ -19,6 +23,40 @@ class Permission(Document):
         )
     )
     description = StringField(allow_none=True)
+    # A stable position of the permission in bitsets. Never reused or changed,
+    # and written only by the `assign_indexes` method.
+    index = IntegerField(allow_none=True, required=False, dump_only=True)
 
     class Meta:
-        indexes = ['$codename', ]
+        indexes = [
+            '$codename',
+            IndexModel([('index', ASCENDING), ], unique=True, sparse=True),
+        ]
+
+    @classmethod
+    async def assign_indexes(cls):
+        """
+        Assigns the next free indexes to the permissions without them.
+        """
+        cursor = cls.collection.find({"index": None}, {"_id": 1}).sort("_id", ASCENDING)
+        permission_ids = [document['_id'] async for document in cursor]
+        if not permission_ids:
+            return 0
+
+        counters = cls.collection.database[COUNTERS_COLLECTION_NAME]
+        counter = await counters.find_one_and_update(
+            {"_id": PERMISSION_INDEX_COUNTER},
+            {"$inc": {"value": len(permission_ids)}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        first_index = counter["value"] - len(permission_ids)
+        requests = [
+            UpdateOne(
+                {"_id": permission_id, "index": None},
+                {"$set": {"index": first_index + offset}}
+            )
+            for offset, permission_id in enumerate(permission_ids)
+        ]
+        await cls.collection.bulk_write(requests, ordered=False)
+        return len(permission_ids)
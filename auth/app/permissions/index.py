@@ -0,0 +1,165 @@
+from bson.objectid import ObjectId
+
+from app.permissions.bitset import PermissionSet
+
+
+PERMISSION_INDEX_UPDATE_EVENT = 'permissions.index.update'
+
+
+class PermissionIndex(object):
+    """
+    A process-local materialized view of the permissions, granted to each
+    group, that answers permission checks without querying MongoDB.
+    """
+
+    def __init__(self):
+        self.indexes_by_id = {}
+        self.permission_indexes = {}
+        self.codenames = {}
+        self.group_permissions = {}
+        self.loads = 0
+        self.updates = 0
+
+    def replace(self, permissions, groups):
+        """
+        Rebuilds the index from the `{"_id", "codename", "index"}` permission
+        documents and the `{"_id", "permissions"}` group documents.
+        """
+        self.indexes_by_id = {}
+        self.permission_indexes = {}
+        self.codenames = {}
+        self.group_permissions = {}
+        self.update_permissions(permissions)
+        self.update_groups(groups)
+        self.loads += 1
+
+    def update_permissions(self, permissions):
+        for permission in permissions:
+            index = permission.get('index', None)
+            if index is None:
+                continue
+            self.indexes_by_id[permission['_id']] = index
+            self.permission_indexes[permission['codename']] = index
+            self.codenames[index] = permission['codename']
+
+    def update_groups(self, groups):
+        for group in groups:
+            self.group_permissions[str(group['_id'])] = PermissionSet.from_indexes(
+                self.indexes_by_id[permission_id]
+                for permission_id in group.get('permissions', [])
+                if permission_id in self.indexes_by_id
+            )
+
+    def get_group_ids_with_permissions(self, permission_ids):
+        permission_set = PermissionSet.from_indexes(
+            self.indexes_by_id[permission_id]
+            for permission_id in permission_ids
+            if permission_id in self.indexes_by_id
+        )
+        return [
+            group_id for group_id, group_permissions in self.group_permissions.items()
+            if group_permissions & permission_set
+        ]
+
+    def get_permission_set(self, group_ids):
+        result = PermissionSet()
+        for group_id in group_ids:
+            permission_set = self.group_permissions.get(str(group_id), None)
+            if permission_set is not None:
+                result = result | permission_set
+        return result
+
+    def get_codenames(self, group_ids):
+        permission_set = self.get_permission_set(group_ids)
+        return sorted(self.codenames[index] for index in permission_set if index in self.codenames)
+
+    def check_permissions(self, group_ids, codenames):
+        """
+        Returns a dictionary with the flag, whether the permission is granted, per codename.
+        """
+        permission_set = self.get_permission_set(group_ids)
+        result = {}
+        for codename in codenames:
+            index = self.permission_indexes.get(codename, None)
+            result[codename] = index is not None and index in permission_set
+        return result
+
+    def get_stats(self):
+        return {
+            "permissions": len(self.permission_indexes),
+            "groups": len(self.group_permissions),
+            "loads": self.loads,
+            "updates": self.updates,
+        }
+
+
+async def load_permission_index(app, _data=None):
+    from app.groups.documents import Group
+    from app.permissions.documents import Permission
+    # Permissions, created before the bit indexes were introduced, would be
+    # missing in the index otherwise. Concurrent calls are safe: an index is
+    # set only when it's still missing, at the cost of gaps in the sequence.
+    await Permission.assign_indexes()
+    permissions = await Permission.collection.find(
+        {}, {'_id': 1, 'codename': 1, 'index': 1}
+    ).to_list(None)
+    groups = await Group.collection.find({}, {'_id': 1, 'permissions': 1}).to_list(None)
+    app.permission_index.replace(permissions, groups)
+
+
+async def refresh_permission_index(app, data=None):
+    """
+    Reads again only the specified permissions and groups. Without the
+    data the whole index is rebuilt.
+    """
+    if not data:
+        await load_permission_index(app)
+        return
+
+    from app.groups.documents import Group
+    from app.permissions.documents import Permission
+    permission_ids = [ObjectId(obj_id) for obj_id in data.get('permissions', [])]
+    group_ids = [ObjectId(obj_id) for obj_id in data.get('groups', [])]
+    if permission_ids:
+        permissions = await Permission.collection.find(
+            {'_id': {'$in': permission_ids}}, {'_id': 1, 'codename': 1, 'index': 1}
+        ).to_list(None)
+        app.permission_index.update_permissions(permissions)
+    if group_ids:
+        groups = await Group.collection.find(
+            {'_id': {'$in': group_ids}}, {'_id': 1, 'permissions': 1}
+        ).to_list(None)
+        app.permission_index.update_groups(groups)
+    app.permission_index.updates += 1
+
+
+async def update_permission_index(app, permission_ids=(), group_ids=()):
+    """
+    Applies the changes of permissions and groups to the local index and
+    notifies other processes about them.
+    """
+    data = {
+        "permissions": [str(obj_id) for obj_id in permission_ids],
+        "groups": [str(obj_id) for obj_id in group_ids],
+    }
+    if not data["permissions"] and not data["groups"]:
+        return
+
+    await refresh_permission_index(app, data)
+    await app.broadcaster.publish(app.redis, PERMISSION_INDEX_UPDATE_EVENT, data)
+
+
+async def get_token_group_ids(app, claims):
+    group_ids = claims.get('groups', None)
+    if group_ids is None:
+        # Tokens, issued before the `groups` claim was added, require a lookup
+        from app.users.lookups import load_user_record_by_id
+        user = await load_user_record_by_id(app, claims.get('user_id', None))
+        group_ids = user.group_ids if user else []
+    return group_ids
+
+
+async def check_token_permissions(app, claims, codenames):
+    group_ids = await get_token_group_ids(app, claims)
+    permissions = app.permission_index.check_permissions(group_ids, codenames)
+    return {"is_allowed": all(permissions.values()), "permissions": permissions}
@@ -0,0 +1,94 @@
+from app.groups.documents import Group
+from app.permissions.bitset import PermissionSet
+from app.permissions.documents import Permission
+
+
+def build_user_permissions_pipeline(user_id):
+    """
+    Joins the user with the groups and then with the permissions, so that
+    the granted permissions are resolved in a single round trip. Both
+    joins are done by `_id`, that is always covered by the index.
+    """
+    return [
+        {'$match': {'_id': user_id}},
+        {'$project': {'_id': 0, 'groups': 1}},
+        {'$lookup': {
+            'from': Group.collection.name,
+            'localField': 'groups',
+            'foreignField': '_id',
+            'as': 'groups'
+        }},
+        {'$project': {
+            'permission_ids': {
+                '$reduce': {
+                    'input': '$groups.permissions',
+                    'initialValue': [],
+                    'in': {'$setUnion': ['$$value', '$$this']}
+                }
+            }
+        }},
+        {'$lookup': {
+            'from': Permission.collection.name,
+            'localField': 'permission_ids',
+            'foreignField': '_id',
+            'as': 'permissions'
+        }},
+        {'$project': {
+            'codenames': '$permissions.codename',
+            'indexes': '$permissions.index'
+        }},
+    ]
+
+
+async def resolve_user_permissions(user_id):
+    from app.users.documents import User
+    pipeline = build_user_permissions_pipeline(user_id)
+    result = await User.collection.aggregate(pipeline).to_list(1)
+    return result[0] if result else {'codenames': [], 'indexes': []}
+
+
+async def explain_user_permissions(user_id):
+    """
+    Returns the execution plan of the permission resolution pipeline.
+    """
+    from app.users.documents import User
+    return await User.collection.database.command(
+        'explain',
+        {
+            'aggregate': User.collection.name,
+            'pipeline': build_user_permissions_pipeline(user_id),
+            'cursor': {}
+        },
+        verbosity='executionStats'
+    )
+
+
+def get_used_indexes(plan):
+    """
+    Collects the names of the indexes, used by any stage of the explained plan.
+    """
+    indexes = set()
+    if isinstance(plan, dict):
+        if plan.get('stage', None) in ('IDHACK', 'EXPRESS_IXSCAN'):
+            indexes.add('_id_')
+        if 'indexName' in plan:
+            indexes.add(plan['indexName'])
+        indexes.update(plan.get('indexesUsed', []))
+        for value in plan.values():
+            indexes.update(get_used_indexes(value))
+    elif isinstance(plan, list):
+        for value in plan:
+            indexes.update(get_used_indexes(value))
+    return indexes
+
+
+async def collect_user_permissions(user):
+    result = await resolve_user_permissions(user.pk)
+    return sorted(set(result['codenames']))
+
+
+async def collect_user_permission_set(user):
+    result = await resolve_user_permissions(user.pk)
+    return PermissionSet.from_indexes(
+        index for index in result['indexes'] if index is not None
+    )
@@ -0,0 +1,137 @@
+from hashlib import sha1
+from time import monotonic
+
+from aioredis import Redis, ReplyError
+
+
+class RedisScript(object):
+    """
+    A Lua script, executed on the Redis side by its SHA1 digest.
+    """
+
+    def __init__(self, source):
+        self.source = source
+        self.sha = sha1(source.encode('utf-8')).hexdigest()
+
+
+class RedisStorage(object):
+    """
+    An access layer to Redis. Single commands are sent through the shared
+    connections of the pool, while multi-step operations are grouped into
+    pipelines and transactions on a dedicated connection, so that each of
+    them takes only one round trip.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.scripts = []
+        self.script_loads = 0
+        self.operations = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+        self.acquisitions = 0
+        self.total_pool_wait_time = 0.0
+        self.max_pool_wait_time = 0.0
+
+    @property
+    def redis(self):
+        return self.app.redis
+
+    @property
+    def pool(self):
+        return self.redis.connection
+
+    def _track_latency(self, started_at):
+        latency = monotonic() - started_at
+        self.operations += 1
+        self.total_latency += latency
+        self.max_latency = max(self.max_latency, latency)
+
+    async def acquire(self):
+        started_at = monotonic()
+        connection = await self.pool.acquire()
+        wait_time = monotonic() - started_at
+        self.acquisitions += 1
+        self.total_pool_wait_time += wait_time
+        self.max_pool_wait_time = max(self.max_pool_wait_time, wait_time)
+        return connection
+
+    def release(self, connection):
+        self.pool.release(connection)
+
+    async def execute(self, command, *args, **kwargs):
+        started_at = monotonic()
+        try:
+            return await self.redis.execute(command, *args, **kwargs)
+        finally:
+            self._track_latency(started_at)
+
+    async def _execute_batch(self, factory_name, commands):
+        started_at = monotonic()
+        connection = await self.acquire()
+        try:
+            batch = getattr(Redis(connection), factory_name)()
+            for method_name, *args in commands:
+                getattr(batch, method_name)(*args)
+            return await batch.execute()
+        finally:
+            self.release(connection)
+            self._track_latency(started_at)
+
+    async def pipeline(self, *commands):
+        """
+        Executes commands, specified as `(method_name, *args)` tuples, in one pipeline.
+        """
+        return await self._execute_batch('pipeline', commands)
+
+    async def transaction(self, *commands):
+        """
+        Executes commands, specified as `(method_name, *args)` tuples, in one MULTI/EXEC block.
+        """
+        return await self._execute_batch('multi_exec', commands)
+
+    def register_script(self, script):
+        """
+        Registers the script to be loaded into Redis on startup.
+        """
+        self.scripts.append(script)
+
+    async def load_script(self, script):
+        await self.execute('script', 'load', script.source)
+        self.script_loads += 1
+
+    async def load_scripts(self):
+        for script in self.scripts:
+            await self.load_script(script)
+
+    async def run_script(self, script, keys=(), args=()):
+        """
+        Runs the script via EVALSHA. When Redis doesn't have the script
+        in its cache (e.g. after a restart), it is loaded again once.
+        """
+        try:
+            return await self.execute('evalsha', script.sha, len(keys), *keys, *args)
+        except ReplyError as exc:
+            if not str(exc).startswith('NOSCRIPT'):
+                raise
+
+        await self.load_script(script)
+        return await self.execute('evalsha', script.sha, len(keys), *keys, *args)
+
+    def get_stats(self):
+        redis = getattr(self.app, 'redis', None)
+        pool = redis.connection if redis is not None else None
+        return {
+            "operations": self.operations,
+            "average_latency": self.total_latency / self.operations if self.operations else 0.0,
+            "max_latency": self.max_latency,
+            "pool_acquisitions": self.acquisitions,
+            "average_pool_wait_time": (
+                self.total_pool_wait_time / self.acquisitions if self.acquisitions else 0.0
+            ),
+            "max_pool_wait_time": self.max_pool_wait_time,
+            "script_loads": self.script_loads,
+            "pool_size": pool.size if pool is not None else 0,
+            "pool_free_size": pool.freesize if pool is not None else 0,
+            "pool_max_size": pool.maxsize if pool is not None else 0,
+        }
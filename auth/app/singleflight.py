@@ -0,0 +1,49 @@
+from asyncio import CancelledError, get_event_loop, shield
+
+
+class SingleFlight(object):
+    """
+    Coalesces concurrent calls with the same key: while a call is in
+    flight, callers with the same key wait for its result instead of
+    doing the same work again.
+    """
+
+    def __init__(self):
+        self._futures = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    async def do(self, key, func, *args, **kwargs):
+        future = self._futures.get(key, None)
+        if future is not None:
+            self.coalesced += 1
+            # Cancelling a follower mustn't cancel the result shared with others
+            return await shield(future)
+
+        self.calls += 1
+        future = get_event_loop().create_future()
+        self._futures[key] = future
+        try:
+            result = await func(*args, **kwargs)
+        except CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            if not future.done():
+                future.set_exception(exc)
+                # Marks the exception as retrieved, when nobody else waits for it
+                future.exception()
+            raise
+        else:
+            if not future.done():
+                future.set_result(result)
+            return result
+        finally:
+            del self._futures[key]
+
+    def get_stats(self):
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._futures),
+        }
@@ -1,5 +1,8 @@
 from marshmallow import Schema, validate
-from marshmallow.fields import String
+from marshmallow.fields import List, String
+
+
+DEFAULT_DEVICE_ID = 'default'
 
 
 class LoginSchema(Schema):
@@ -19,10 +22,24 @@ class LoginSchema(Schema):
         validate=validate.Length(min=1, error='Field cannot be blank.')
     )
 
+    device_id = String(
+        load_only=True,
+        required=False,
+        allow_none=False,
+        missing=DEFAULT_DEVICE_ID,
+        description='Identifier of the device, that is used by the user.',
+        validate=validate.Length(
+            min=1,
+            max=64,
+            error='Field must contain from {min} to {max} characters.'
+        )
+    )
+
     class Meta:
         fields = (
             'username',
-            'password'
+            'password',
+            'device_id',
         )
 
 
@@ -42,6 +59,28 @@ class VerifyTokenSchema(Schema):
         )
 
 
+class VerifyTokenBatchSchema(Schema):
+    MAX_BATCH_SIZE = 1000
+
+    access_tokens = List(
+        String(allow_none=False),
+        load_only=True,
+        required=True,
+        allow_none=False,
+        description='List of access tokens.',
+        validate=validate.Length(
+            min=1,
+            max=MAX_BATCH_SIZE,
+            error='Field must contain from {min} to {max} tokens.'
+        )
+    )
+
+    class Meta:
+        fields = (
+            'access_tokens',
+        )
+
+
 class RefreshTokenSchema(Schema):
 
     access_token = String(
@@ -59,8 +98,22 @@ class RefreshTokenSchema(Schema):
         validate=validate.Length(min=1, error='Field cannot be blank.')
     )
 
+    device_id = String(
+        load_only=True,
+        required=False,
+        allow_none=False,
+        missing=DEFAULT_DEVICE_ID,
+        description='Identifier of the device, that is used by the user.',
+        validate=validate.Length(
+            min=1,
+            max=64,
+            error='Field must contain from {min} to {max} characters.'
+        )
+    )
+
     class Meta:
         fields = (
             'access_token',
             'refresh_token',
+            'device_id',
         )
@@ -7,7 +7,7 @@ from sage_utils.constants import VALIDATION_ERROR, NOT_FOUND_ERROR
 from sage_utils.wrappers import Response
 
 
-from app.token.json_web_token import build_payload, generate_token_pair
+from app.token.json_web_token import build_payload, build_user_claims, generate_token_pair
 
 
 class GenerateTokenWorker(AmqpWorker):
@@ -18,10 +18,10 @@ class GenerateTokenWorker(AmqpWorker):
 
     def __init__(self, app, *args, **kwargs):
         super(GenerateTokenWorker, self).__init__(app, *args, **kwargs)
-        from app.users.documents import User
         from app.token.api.schemas import LoginSchema
-        self.user_document = User
+        from app.users.lookups import load_user_record_by_username
         self.schema = LoginSchema
+        self.load_user_record_by_username = load_user_record_by_username
 
     def validate_data(self, raw_data):
         try:
@@ -36,20 +36,31 @@ class GenerateTokenWorker(AmqpWorker):
 
         return result.data
 
+    async def verify_password(self, user, password):
+        if not user.password:
+            return False
+        return await self.app.crypto_executor.verify_password(password, user.password)
+
     async def generate_token(self, raw_data):
         try:
             data = self.validate_data(raw_data)
         except ValidationError as exc:
             return Response.from_error(VALIDATION_ERROR, exc.normalized_messages())
 
-        user = await self.user_document.find_one({"username": data["username"]})
-        if not user or (user and not user.verify_password(data["password"])):
+        # Unknown usernames are rejected without querying the database
+        user = None
+        if self.app.username_filter.might_exist(data["username"]):
+            user = await self.load_user_record_by_username(self.app, data["username"])
+        if not user or not await self.verify_password(user, data["password"]):
             return Response.from_error(
                 NOT_FOUND_ERROR, "User wasn't found or specified an invalid password."
             )
 
-        payload = build_payload(self.app, extra_data={"user_id": str(user.pk)})
-        response = await generate_token_pair(self.app, payload, user.username)
+        claims = await build_user_claims(self.app, user)
+        payload = build_payload(self.app, extra_data=claims)
+        response = await generate_token_pair(
+            self.app, payload, user.username, data["device_id"]
+        )
         return Response.with_content(response)
 
     async def process_request(self, channel, body, envelope, properties):
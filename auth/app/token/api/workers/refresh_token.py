@@ -1,16 +1,15 @@
 import json
 
 from aioamqp import AmqpClosedConnection
-from bson.objectid import ObjectId
 from jwt.exceptions import InvalidTokenError, InvalidSignatureError
 from marshmallow import ValidationError
 from sage_utils.constants import VALIDATION_ERROR, NOT_FOUND_ERROR, TOKEN_ERROR
 from sage_utils.wrappers import Response
 from sanic_amqp_ext import AmqpWorker
 
-from app.token.json_web_token import build_payload, extract_and_decode_token, \
-    get_redis_key_by_user, generate_access_token
-from app.token.redis import get_refresh_token_from_redis
+from app.token.json_web_token import build_payload, build_user_claims, get_redis_key_by_user, \
+    generate_access_token, generate_refresh_token, verify_access_token
+from app.token.redis import rotate_refresh_token_in_redis
 
 
 class RefreshTokenWorker(AmqpWorker):
@@ -22,8 +21,8 @@ class RefreshTokenWorker(AmqpWorker):
     def __init__(self, app, *args, **kwargs):
         super(RefreshTokenWorker, self).__init__(app, *args, **kwargs)
         from app.token.api.schemas import RefreshTokenSchema
-        from app.users.documents import User
-        self.user_document = User
+        from app.users.lookups import load_user_record_by_id
+        self.load_user_record_by_id = load_user_record_by_id
         self.schema = RefreshTokenSchema
 
     def validate_data(self, raw_data):
@@ -40,16 +39,14 @@ class RefreshTokenWorker(AmqpWorker):
         return result.data
 
     async def get_user_by_id(self, user_id):
-        if not user_id:
-            return None
-
-        user = await self.user_document.find_one({"_id": ObjectId(user_id)})
-        return user
+        return await self.app.single_flight.do(
+            ('token.refresh.user', user_id), self.load_user_record_by_id, self.app, user_id
+        )
 
     async def refresh_token(self, raw_data):
         try:
             data = self.validate_data(raw_data)
-            access_token = extract_and_decode_token(self.app, data)
+            access_token = await verify_access_token(self.app, data)
         except ValidationError as exc:
             return Response.from_error(VALIDATION_ERROR, exc.normalized_messages())
         except (InvalidTokenError, InvalidSignatureError) as exc:
@@ -61,17 +58,23 @@ class RefreshTokenWorker(AmqpWorker):
             return Response.from_error(NOT_FOUND_ERROR, "User wasn't found.")
 
         refresh_token = data['refresh_token'].strip()
+        new_refresh_token = generate_refresh_token()
         key = get_redis_key_by_user(self.app, user.username)
-        existing_refresh_token = await get_refresh_token_from_redis(self.app.redis, key)
+        is_rotated = await rotate_refresh_token_in_redis(
+            self.app.redis_storage, key, data['device_id'], refresh_token, new_refresh_token,
+            self.app.config["JWT_REFRESH_TOKEN_LIFETIME"]
+        )
 
-        if existing_refresh_token != refresh_token:
+        if not is_rotated:
             return Response.from_error(TOKEN_ERROR, "Specified an invalid `refresh_token`.")
 
-        secret = self.app.config["JWT_SECRET_KEY"]
-        algorithm = self.app.config["JWT_ALGORITHM"]
-        payload = build_payload(self.app, extra_data={"user_id": str(user.pk)})
-        new_access_token = generate_access_token(payload, secret, algorithm)
-        response = {self.app.config["JWT_ACCESS_TOKEN_FIELD_NAME"]: new_access_token}
+        claims = await build_user_claims(self.app, user)
+        payload = build_payload(self.app, extra_data=claims)
+        new_access_token = generate_access_token(payload, self.app.jwt_key_set.active_key)
+        response = {
+            self.app.config["JWT_ACCESS_TOKEN_FIELD_NAME"]: new_access_token,
+            self.app.config["JWT_REFRESH_TOKEN_FIELD_NAME"]: new_refresh_token
+        }
         return Response.with_content(response)
 
     async def process_request(self, channel, body, envelope, properties):
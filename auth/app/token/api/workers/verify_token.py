@@ -8,7 +8,7 @@ from sage_utils.constants import VALIDATION_ERROR, TOKEN_ERROR
 from sage_utils.wrappers import Response
 
 
-from app.token.json_web_token import extract_and_decode_token
+from app.token.json_web_token import verify_access_token
 
 
 class VerifyTokenWorker(AmqpWorker):
@@ -21,6 +21,7 @@ class VerifyTokenWorker(AmqpWorker):
         super(VerifyTokenWorker, self).__init__(app, *args, **kwargs)
         from app.token.api.schemas import VerifyTokenSchema
         self.schema = VerifyTokenSchema
+        self.deserializer = self.schema()
 
     def validate_data(self, raw_data):
         try:
@@ -28,17 +29,16 @@ class VerifyTokenWorker(AmqpWorker):
         except json.decoder.JSONDecodeError:
             data = {}
 
-        deserializer = self.schema()
-        result = deserializer.load(data)
+        result = self.deserializer.load(data)
         if result.errors:
             raise ValidationError(result.errors)
 
         return result.data
 
-    def verify_token(self, raw_data):
+    async def verify_token(self, raw_data):
         try:
             data = self.validate_data(raw_data)
-            extract_and_decode_token(self.app, data)
+            await verify_access_token(self.app, data)
         except ValidationError as exc:
             return Response.from_error(VALIDATION_ERROR, exc.normalized_messages())
         except (InvalidTokenError, InvalidSignatureError) as exc:
@@ -47,7 +47,7 @@ class VerifyTokenWorker(AmqpWorker):
         return Response.with_content({"is_valid": True})
 
     async def process_request(self, channel, body, envelope, properties):
-        response = self.verify_token(body)
+        response = await self.verify_token(body)
         response.data[Response.EVENT_FIELD_NAME] = properties.correlation_id
 
         if properties.reply_to:
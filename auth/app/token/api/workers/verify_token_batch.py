@@ -0,0 +1,99 @@
+import json
+
+from aioamqp import AmqpClosedConnection
+from jwt.exceptions import InvalidTokenError, InvalidSignatureError
+from marshmallow import ValidationError
+from sanic_amqp_ext import AmqpWorker
+from sage_utils.constants import VALIDATION_ERROR, TOKEN_ERROR
+from sage_utils.wrappers import Response
+
+
+from app.token.json_web_token import verify_access_token
+
+
+class VerifyTokenBatchWorker(AmqpWorker):
+    QUEUE_NAME = 'auth.token.verify.batch'
+    REQUEST_EXCHANGE_NAME = 'open-matchmaking.auth.token.verify.batch.direct'
+    RESPONSE_EXCHANGE_NAME = 'open-matchmaking.responses.direct'
+    CONTENT_TYPE = 'application/json'
+
+    def __init__(self, app, *args, **kwargs):
+        super(VerifyTokenBatchWorker, self).__init__(app, *args, **kwargs)
+        from app.token.api.schemas import VerifyTokenBatchSchema
+        self.schema = VerifyTokenBatchSchema
+        self.deserializer = self.schema()
+
+    def validate_data(self, raw_data):
+        try:
+            data = json.loads(raw_data.strip())
+        except json.decoder.JSONDecodeError:
+            data = {}
+
+        result = self.deserializer.load(data)
+        if result.errors:
+            raise ValidationError(result.errors)
+
+        return result.data
+
+    async def check_access_token(self, access_token):
+        field_name = self.app.config['JWT_ACCESS_TOKEN_FIELD_NAME']
+        try:
+            claims = await verify_access_token(self.app, {field_name: access_token})
+        except (InvalidTokenError, InvalidSignatureError) as exc:
+            error = Response.from_error(TOKEN_ERROR, str(exc)).data[Response.ERROR_FIELD_NAME]
+            return {"is_valid": False, Response.ERROR_FIELD_NAME: error}
+
+        return {"is_valid": True, "claims": claims}
+
+    async def verify_tokens(self, raw_data):
+        try:
+            data = self.validate_data(raw_data)
+        except ValidationError as exc:
+            return Response.from_error(VALIDATION_ERROR, exc.normalized_messages())
+
+        results = [await self.check_access_token(token) for token in data['access_tokens']]
+        return Response.with_content({"results": results})
+
+    async def process_request(self, channel, body, envelope, properties):
+        response = await self.verify_tokens(body)
+        response.data[Response.EVENT_FIELD_NAME] = properties.correlation_id
+
+        if properties.reply_to:
+            await channel.publish(
+                json.dumps(response.data),
+                exchange_name=self.RESPONSE_EXCHANGE_NAME,
+                routing_key=properties.reply_to,
+                properties={
+                    'content_type': self.CONTENT_TYPE,
+                    'delivery_mode': 2,
+                    'correlation_id': properties.correlation_id
+                },
+                mandatory=True
+            )
+
+        await channel.basic_client_ack(delivery_tag=envelope.delivery_tag)
+
+    async def consume_callback(self, channel, body, envelope, properties):
+        self.app.loop.create_task(self.process_request(channel, body, envelope, properties))
+
+    async def run(self, *args, **kwargs):
+        try:
+            _transport, protocol = await self.connect()
+        except AmqpClosedConnection as exc:
+            print(exc)
+            return
+
+        channel = await protocol.channel()
+        await channel.queue_declare(
+            queue_name=self.QUEUE_NAME,
+            durable=True,
+            passive=False,
+            auto_delete=False
+        )
+        await channel.queue_bind(
+            queue_name=self.QUEUE_NAME,
+            exchange_name=self.REQUEST_EXCHANGE_NAME,
+            routing_key=self.QUEUE_NAME
+        )
+        await channel.basic_qos(prefetch_count=50, prefetch_size=0, connection_global=False)
+        await channel.basic_consume(self.consume_callback, queue_name=self.QUEUE_NAME)
@@ -0,0 +1,62 @@
+from collections import OrderedDict
+from hashlib import blake2b
+from time import time
+
+
+class VerifiedTokenCache(object):
+    """
+    A bounded LRU cache of decoded access tokens. Each entry expires at
+    the `exp` claim of the token, so that expired tokens are never served.
+    """
+
+    def __init__(self, max_size=10000):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def get_digest(token):
+        return blake2b(token.encode('utf-8'), digest_size=16).digest()
+
+    def get(self, token):
+        digest = self.get_digest(token)
+        entry = self._entries.get(digest, None)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, claims = entry
+        if expires_at <= time():
+            del self._entries[digest]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(digest)
+        self.hits += 1
+        return claims
+
+    def set(self, token, claims):
+        expires_at = claims.get('exp', None)
+        if not isinstance(expires_at, (int, float)):
+            return
+
+        digest = self.get_digest(token)
+        self._entries[digest] = (expires_at, claims)
+        self._entries.move_to_end(digest)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+
+    def get_stats(self):
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,19 @@
+from umongo import Document
+from umongo.fields import DateTimeField, StringField
+
+from app import app
+
+
+instance = app.config["LAZY_UMONGO"]
+
+
+@instance.register
+class JsonWebKey(Document):
+    kid = StringField(unique=True, allow_none=False, required=True)
+    algorithm = StringField(allow_none=True)
+    # Keys without data mark the retired keys, that were loaded from the configuration.
+    # The key data is encrypted with the `JWT_KEYS_ENCRYPTION_KEY` setting.
+    key = StringField(allow_none=True)
+    created_at = DateTimeField(allow_none=False, required=True)
+    activates_at = DateTimeField(allow_none=True)
+    retired_at = DateTimeField(allow_none=True)
@@ -1,40 +1,85 @@
-from datetime import datetime, timedelta
+import os
+from binascii import hexlify
+from time import time
 from typing import Dict
 
-from jwt import encode, decode
-from passlib.pwd import genword
+from jwt import decode, get_unverified_header
 
 from app.token.redis import get_redis_key_by_user, save_refresh_token_in_redis
+from app.token.revocation import ensure_token_is_not_revoked
+
+
+class RefreshTokenGenerator(object):
+    """
+    Generates refresh tokens from a pool of random bytes, that is
+    refilled from the OS CSPRNG in large chunks.
+    """
+
+    def __init__(self, token_size=16, pool_size=4096):
+        self.token_size = token_size
+        self.pool_size = pool_size - pool_size % token_size
+        self._pool = b''
+        self._offset = 0
+        self._pid = None
+
+    def generate(self):
+        # Forked processes must never reuse the bytes inherited from the parent
+        if self._offset >= len(self._pool) or self._pid != os.getpid():
+            self._pool = os.urandom(self.pool_size)
+            self._offset = 0
+            self._pid = os.getpid()
+
+        chunk = self._pool[self._offset:self._offset + self.token_size]
+        self._offset += self.token_size
+        return hexlify(chunk).decode('ascii')
+
+
+refresh_token_generator = RefreshTokenGenerator()
+token_id_generator = RefreshTokenGenerator(token_size=8)
 
 
 def build_payload(app, extra_data={}):
-    iat = datetime.now()
-    exp = iat + timedelta(seconds=app.config.JWT_LIFETIME)
+    iat = int(time())
     payload = {
         'iat': iat,
-        'exp': exp
+        'exp': iat + app.config.JWT_LIFETIME,
+        'jti': token_id_generator.generate()
     }
     payload.update(extra_data)
     return payload
 
 
-def generate_access_token(payload, secret, algorithm):
-    return encode(payload, secret, algorithm=algorithm).decode('utf-8')
+async def build_user_claims(app, user):
+    claims = {
+        "user_id": str(user.pk),
+        "groups": [str(group_id) for group_id in user.group_ids]
+    }
+    if app.config["JWT_EMBED_PERMISSIONS"]:
+        from app.permissions.resolution import collect_user_permissions, \
+            collect_user_permission_set
+        if app.config["JWT_PERMISSIONS_FORMAT"] == 'bitset':
+            permission_set = await collect_user_permission_set(user)
+            claims["permissions"] = permission_set.to_base64()
+        else:
+            claims["permissions"] = await collect_user_permissions(user)
+    return claims
+
 
+def generate_access_token(payload, signing_key):
+    return signing_key.encode(payload)
 
-def generate_refresh_token(length=32, entropy=48):
-    return genword(entropy=entropy, length=length, charset="hex")
 
+def generate_refresh_token():
+    return refresh_token_generator.generate()
 
-async def generate_token_pair(app, payload, username):
-    secret = app.config["JWT_SECRET_KEY"]
-    algorithm = app.config["JWT_ALGORITHM"]
 
-    access_token = generate_access_token(payload, secret, algorithm)
+async def generate_token_pair(app, payload, username, device_id):
+    access_token = generate_access_token(payload, app.jwt_key_set.active_key)
     refresh_token = generate_refresh_token()
 
     key = get_redis_key_by_user(app, username)
-    await save_refresh_token_in_redis(app.redis, key, refresh_token)
+    lifetime = app.config["JWT_REFRESH_TOKEN_LIFETIME"]
+    await save_refresh_token_in_redis(app.redis_storage, key, device_id, refresh_token, lifetime)
 
     return {
         app.config["JWT_ACCESS_TOKEN_FIELD_NAME"]: access_token,
@@ -42,18 +87,33 @@ async def generate_token_pair(app, payload, username):
     }
 
 
-def decode_token(token, secret, algorithm):
-    return decode(
+def decode_token(token, key_set, cache=None):
+    if cache is not None:
+        claims = cache.get(token)
+        if claims is not None:
+            return claims
+
+    header = get_unverified_header(token)
+    signing_key = key_set.get(header.get('kid', None))
+    claims = decode(
         token,
-        secret,
-        algorithms=[algorithm, ],
+        signing_key.verifying_key,
+        algorithms=[signing_key.algorithm, ],
         verify=True,
         options={'verify_exp': True}
     )
 
+    if cache is not None:
+        cache.set(token, claims)
+    return claims
+
 
 def extract_and_decode_token(app, data: Dict):
     raw_access_token = data.get(app.config['JWT_ACCESS_TOKEN_FIELD_NAME'], '')
-    secret = app.config["JWT_SECRET_KEY"]
-    algorithm = app.config["JWT_ALGORITHM"]
-    return decode_token(raw_access_token, secret, algorithm)
+    return decode_token(raw_access_token, app.jwt_key_set, app.jwt_token_cache)
+
+
+async def verify_access_token(app, data: Dict):
+    claims = extract_and_decode_token(app, data)
+    await ensure_token_is_not_revoked(app, claims)
+    return claims
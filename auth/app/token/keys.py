@@ -0,0 +1,310 @@
+import hashlib
+import json
+import os
+from base64 import urlsafe_b64encode
+from collections import OrderedDict
+from datetime import timezone
+from time import time
+
+from cryptography.exceptions import InvalidSignature
+from cryptography.fernet import Fernet, InvalidToken
+from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+from cryptography.hazmat.primitives.serialization import Encoding, PublicFormat, \
+    load_pem_private_key
+from jwt import register_algorithm
+from jwt.algorithms import Algorithm, get_default_algorithms
+from jwt.exceptions import InvalidTokenError
+
+
+SYMMETRIC_ALGORITHMS = ('HS256', 'HS384', 'HS512')
+RSA_ALGORITHMS = ('RS256', 'RS384', 'RS512', 'PS256', 'PS384', 'PS512')
+EC_CURVES = {
+    'secp256r1': ('P-256', 'ES256'),
+    'secp384r1': ('P-384', 'ES384'),
+    'secp521r1': ('P-521', 'ES512'),
+}
+DEFAULT_KEY_ID = 'default'
+
+
+class EdDSAAlgorithm(Algorithm):
+    """
+    Signs and verifies tokens with Ed25519 keys (RFC 8037), that
+    aren't supported by PyJWT out of the box.
+    """
+
+    def prepare_key(self, key):
+        if isinstance(key, (ed25519.Ed25519PrivateKey, ed25519.Ed25519PublicKey)):
+            return key
+        raise TypeError('Expecting an Ed25519 key object.')
+
+    def sign(self, msg, key):
+        return key.sign(msg)
+
+    def verify(self, msg, key, sig):
+        try:
+            key.verify(sig, msg)
+            return True
+        except InvalidSignature:
+            return False
+
+
+register_algorithm('EdDSA', EdDSAAlgorithm())
+ALGORITHMS = get_default_algorithms()
+ALGORITHMS['EdDSA'] = EdDSAAlgorithm()
+
+
+def base64url_encode(data):
+    return urlsafe_b64encode(data).rstrip(b'=')
+
+
+def int_to_base64url(value, length=None):
+    length = length or (value.bit_length() + 7) // 8
+    return base64url_encode(value.to_bytes(length, 'big')).decode('ascii')
+
+
+def to_timestamp(value):
+    if value is None:
+        return None
+    return value.replace(tzinfo=timezone.utc).timestamp()
+
+
+def get_key_cipher(secret):
+    # Fernet expects a 32-byte key, so any configured secret is hashed to fit
+    digest = hashlib.sha256(secret.encode('utf-8')).digest()
+    return Fernet(urlsafe_b64encode(digest))
+
+
+def encrypt_key_data(data, secret):
+    return get_key_cipher(secret).encrypt(data.encode('utf-8')).decode('ascii')
+
+
+def decrypt_key_data(data, secret):
+    try:
+        return get_key_cipher(secret).decrypt(data.encode('ascii')).decode('utf-8')
+    except InvalidToken:
+        raise ValueError("Stored signing keys can't be decrypted with the configured secret.")
+
+
+def public_key_to_jwk(public_key):
+    if isinstance(public_key, rsa.RSAPublicKey):
+        numbers = public_key.public_numbers()
+        return {
+            'kty': 'RSA',
+            'n': int_to_base64url(numbers.n),
+            'e': int_to_base64url(numbers.e),
+        }
+
+    if isinstance(public_key, ec.EllipticCurvePublicKey):
+        numbers = public_key.public_numbers()
+        length = (public_key.curve.key_size + 7) // 8
+        return {
+            'kty': 'EC',
+            'crv': EC_CURVES[public_key.curve.name][0],
+            'x': int_to_base64url(numbers.x, length),
+            'y': int_to_base64url(numbers.y, length),
+        }
+
+    if isinstance(public_key, ed25519.Ed25519PublicKey):
+        raw_key = public_key.public_bytes(Encoding.Raw, PublicFormat.Raw)
+        return {'kty': 'OKP', 'crv': 'Ed25519', 'x': base64url_encode(raw_key).decode('ascii')}
+
+    raise TypeError('Unsupported public key type: {}.'.format(type(public_key).__name__))
+
+
+def guess_algorithm(private_key, preferred_algorithm=None):
+    if isinstance(private_key, rsa.RSAPrivateKey):
+        return preferred_algorithm if preferred_algorithm in RSA_ALGORITHMS else 'RS256'
+
+    if isinstance(private_key, ec.EllipticCurvePrivateKey):
+        if private_key.curve.name not in EC_CURVES:
+            raise ValueError('Unsupported elliptic curve: {}.'.format(private_key.curve.name))
+        return EC_CURVES[private_key.curve.name][1]
+
+    if isinstance(private_key, ed25519.Ed25519PrivateKey):
+        return 'EdDSA'
+
+    raise TypeError('Unsupported private key type: {}.'.format(type(private_key).__name__))
+
+
+class SigningKey(object):
+    """
+    A key that is used for signing and verifying JSON Web Tokens.
+
+    The key object and the encoded header segment are prepared once, so
+    that signing a token only serializes the payload and computes the signature.
+    """
+
+    def __init__(self, kid, algorithm, key, expires_at=None):
+        if algorithm not in ALGORITHMS or algorithm == 'none':
+            raise ValueError('Unsupported signing algorithm: {}.'.format(algorithm))
+
+        self.kid = kid
+        self.expires_at = expires_at
+        self.algorithm = algorithm
+        self.is_symmetric = algorithm in SYMMETRIC_ALGORITHMS
+        self.algorithm_obj = ALGORITHMS[algorithm]
+        self.signing_key = self.algorithm_obj.prepare_key(key)
+        if self.is_symmetric:
+            self.verifying_key = self.signing_key
+        else:
+            self.verifying_key = self.signing_key.public_key()
+        self.headers = {'typ': 'JWT', 'alg': algorithm, 'kid': kid}
+        self.header_segment = base64url_encode(
+            json.dumps(self.headers, separators=(',', ':')).encode('utf-8')
+        )
+
+    @classmethod
+    def from_pem(cls, kid, data, preferred_algorithm=None):
+        private_key = load_pem_private_key(data, password=None, backend=default_backend())
+        algorithm = guess_algorithm(private_key, preferred_algorithm)
+        return cls(kid, algorithm, private_key)
+
+    @classmethod
+    def from_record(cls, record, secret, expires_at=None):
+        key = decrypt_key_data(record['key'], secret)
+        if record['algorithm'] not in SYMMETRIC_ALGORITHMS:
+            key = load_pem_private_key(
+                key.encode('utf-8'), password=None, backend=default_backend()
+            )
+        return cls(record['kid'], record['algorithm'], key, expires_at=expires_at)
+
+    @property
+    def is_expired(self):
+        return self.expires_at is not None and self.expires_at <= time()
+
+    def encode(self, payload):
+        payload_segment = base64url_encode(
+            json.dumps(payload, separators=(',', ':')).encode('utf-8')
+        )
+        signing_input = self.header_segment + b'.' + payload_segment
+        signature = self.algorithm_obj.sign(signing_input, self.signing_key)
+        return (signing_input + b'.' + base64url_encode(signature)).decode('ascii')
+
+    def to_jwk(self):
+        jwk = public_key_to_jwk(self.verifying_key)
+        jwk.update({'kid': self.kid, 'alg': self.algorithm, 'use': 'sig'})
+        return jwk
+
+
+class KeySet(object):
+    """
+    A ring of keys, which are accepted for verifying tokens. New tokens are
+    always signed with the active key. Retired keys stay in the ring until
+    the last token signed with them expires.
+
+    Pending keys are published in the JWKS document before they are used, and
+    each of them replaces the active key at its `activates_at` timestamp.
+    """
+
+    def __init__(self, keys, active_kid, pending_keys=()):
+        self.keys = OrderedDict((key.kid, key) for key in keys)
+        if active_kid not in self.keys:
+            raise ValueError('Active key `{}` is missing in the key set.'.format(active_kid))
+        self._active_key = self.keys[active_kid]
+        # `(activates_at, kid)` pairs, ordered by the activation time
+        self.pending_keys = sorted(pending_keys)
+        for _activates_at, kid in self.pending_keys:
+            if kid not in self.keys:
+                raise ValueError('Pending key `{}` is missing in the key set.'.format(kid))
+        self._jwks_document = None
+
+    @property
+    def active_key(self):
+        while self.pending_keys and self.pending_keys[0][0] <= time():
+            _activates_at, kid = self.pending_keys.pop(0)
+            self._active_key = self.keys[kid]
+        return self._active_key
+
+    @classmethod
+    def from_config(cls, config, records=()):
+        """
+        Creates the key ring from the keys specified in the configuration and
+        the rotated keys, that were stored in the database.
+        """
+        keys, active_kid = cls.load_config_keys(config)
+        keys = OrderedDict((key.kid, key) for key in keys)
+        pending_keys = []
+        now = time()
+
+        for record in sorted(records, key=lambda obj: obj['created_at']):
+            expires_at = None
+            retired_at = to_timestamp(record.get('retired_at', None))
+            if retired_at is not None:
+                expires_at = retired_at + config["JWT_LIFETIME"]
+
+            kid = record['kid']
+            if record.get('key', None) is None:
+                if kid in keys:
+                    keys[kid].expires_at = expires_at
+            else:
+                secret = config["JWT_KEYS_ENCRYPTION_KEY"]
+                if not secret:
+                    raise ValueError('Stored signing keys require the `JWT_KEYS_ENCRYPTION_KEY` setting.')  # NOQA
+                keys[kid] = SigningKey.from_record(record, secret, expires_at=expires_at)
+
+            if kid not in keys:
+                continue
+
+            activates_at = to_timestamp(record.get('activates_at', None))
+            if activates_at is not None and activates_at > now:
+                pending_keys.append((activates_at, kid))
+            elif retired_at is None or retired_at > now:
+                active_kid = kid
+
+        keys = [key for key in keys.values() if not key.is_expired]
+        return cls(keys, active_kid, pending_keys)
+
+    @classmethod
+    def load_config_keys(cls, config):
+        algorithm = config["JWT_ALGORITHM"]
+        active_kid = config["JWT_KEY_ID"]
+
+        if algorithm in SYMMETRIC_ALGORITHMS:
+            kid = active_kid or DEFAULT_KEY_ID
+            return [SigningKey(kid, algorithm, config["JWT_SECRET_KEY"]), ], kid
+
+        directory = config["JWT_KEYS_DIRECTORY"]
+        if not directory:
+            raise ValueError('The `{}` algorithm requires a keys directory.'.format(algorithm))
+
+        keys = []
+        for filename in sorted(os.listdir(directory)):
+            kid, extension = os.path.splitext(filename)
+            if extension != '.pem':
+                continue
+
+            with open(os.path.join(directory, filename), 'rb') as key_file:
+                keys.append(SigningKey.from_pem(kid, key_file.read(), algorithm))
+
+        if not keys:
+            raise ValueError('No private keys were found in `{}`.'.format(directory))
+
+        return keys, active_kid or keys[-1].kid
+
+    def get(self, kid):
+        # Tokens issued before introducing the `kid` header are verified by the active key
+        if kid is None:
+            return self.active_key
+
+        try:
+            signing_key = self.keys[kid]
+        except (KeyError, TypeError):
+            raise InvalidTokenError('Unknown signing key')
+
+        if signing_key.is_expired:
+            raise InvalidTokenError('Signing key has expired')
+        return signing_key
+
+    def to_jwks(self):
+        return {'keys': [
+            key.to_jwk() for key in self.keys.values()
+            if not key.is_symmetric and not key.is_expired
+        ]}
+
+    def get_jwks_document(self):
+        if self._jwks_document is None:
+            body = json.dumps(self.to_jwks(), separators=(',', ':'), sort_keys=True).encode('utf-8')
+            etag = '"{}"'.format(hashlib.sha256(body).hexdigest())
+            self._jwks_document = (body, etag)
+        return self._jwks_document
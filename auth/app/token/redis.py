@@ -1,4 +1,38 @@
+from binascii import hexlify, unhexlify
+from struct import Struct
+from time import time
+
+from aioredis import MultiExecError, ReplyError
+
+from app.redis_storage import RedisScript
+
+
 REFRESH_KEY_TEMPLATE = "{prefix}_{username}"
+# Each device session is stored as a hash field with a packed value:
+# 4 bytes of the expiration timestamp, followed by the raw token bytes
+REFRESH_TOKEN_HEADER = Struct('>I')
+
+# Compares the presented refresh token with the stored one and replaces it
+# with the new token in a single atomic step, so that a refresh token can be
+# exchanged only once.
+# KEYS[1] - the user key; ARGV - device ID, presented token (raw bytes),
+# new packed value, current timestamp and the lifetime of the session
+ROTATE_REFRESH_TOKEN_SCRIPT = RedisScript("""
+if redis.call('TYPE', KEYS[1]).ok ~= 'hash' then
+    return 0
+end
+local value = redis.call('HGET', KEYS[1], ARGV[1])
+if not value or string.len(value) < 4 then
+    return 0
+end
+local expires_at = struct.unpack('>I4', value)
+if expires_at <= tonumber(ARGV[4]) or string.sub(value, 5) ~= ARGV[2] then
+    return 0
+end
+redis.call('HSET', KEYS[1], ARGV[1], ARGV[3])
+redis.call('EXPIRE', KEYS[1], ARGV[5])
+return 1
+""")
 
 
 def get_redis_key_by_user(app, username):
@@ -8,12 +42,95 @@ def get_redis_key_by_user(app, username):
     )
 
 
-async def get_refresh_token_from_redis(redis_pool, key):
-    with await redis_pool as redis:
-        value = await redis.execute('get', key)
-    return value.decode('utf-8')
+def encode_refresh_token(token, expires_at):
+    return REFRESH_TOKEN_HEADER.pack(expires_at) + unhexlify(token)
+
+
+def decode_refresh_token(value):
+    expires_at, = REFRESH_TOKEN_HEADER.unpack_from(value)
+    token = hexlify(value[REFRESH_TOKEN_HEADER.size:]).decode('utf-8')
+    return token, expires_at
+
+
+async def get_refresh_token_from_redis(storage, key, device_id):
+    try:
+        value = await storage.execute('hget', key, device_id)
+    except ReplyError:
+        # Tokens saved in the legacy format are treated as missing
+        value = None
+
+    if value is None:
+        return None
+
+    token, expires_at = decode_refresh_token(value)
+    if expires_at <= time():
+        return None
+    return token
 
 
-async def save_refresh_token_in_redis(redis_pool, key, token):
-    with await redis_pool as redis:
-        await redis.execute('set', key, token)
+async def save_refresh_token_in_redis(storage, key, device_id, token, lifetime):
+    now = int(time())
+    commands = (
+        ('hset', key, device_id, encode_refresh_token(token, now + lifetime)),
+        ('expire', key, lifetime),
+        ('hgetall', key),
+    )
+    try:
+        _, _, sessions = await storage.transaction(*commands)
+    except MultiExecError:
+        # The key still contains a token in the legacy format
+        await storage.execute('del', key)
+        _, _, sessions = await storage.transaction(*commands)
+
+    expired_devices = [
+        field for field, value in sessions.items()
+        if decode_refresh_token(value)[1] <= now
+    ]
+    if expired_devices:
+        await storage.execute('hdel', key, *expired_devices)
+
+
+async def rotate_refresh_token_in_redis(storage, key, device_id, token, new_token, lifetime):
+    """
+    Replaces the refresh token of the device with the new one, if the
+    specified token is valid. Returns True when the token was rotated.
+    """
+    try:
+        raw_token = unhexlify(token)
+    except (TypeError, ValueError):
+        return False
+
+    now = int(time())
+    result = await storage.run_script(
+        ROTATE_REFRESH_TOKEN_SCRIPT,
+        keys=[key],
+        args=[device_id, raw_token, encode_refresh_token(new_token, now + lifetime), now, lifetime]
+    )
+    return result == 1
+
+
+async def migrate_refresh_tokens(redis_pool, app, default_device_id, lifetime):
+    """
+    Converts refresh tokens, stored as plain strings without expiration, to
+    the per-device hashes and sets the expiration for the keys without TTL.
+    """
+    pattern = REFRESH_KEY_TEMPLATE.format(
+        prefix=app.config["JWT_REFRESH_TOKEN_FIELD_NAME"],
+        username='*'
+    )
+    converted, expired = 0, 0
+    async for key in redis_pool.iscan(match=pattern):
+        key_type = await redis_pool.type(key)
+        if key_type == b'string':
+            token = (await redis_pool.get(key)).decode('utf-8')
+            value = encode_refresh_token(token, int(time()) + lifetime)
+            transaction = redis_pool.multi_exec()
+            transaction.delete(key)
+            transaction.hset(key, default_device_id, value)
+            transaction.expire(key, lifetime)
+            await transaction.execute()
+            converted += 1
+        elif key_type == b'hash' and await redis_pool.ttl(key) == -1:
+            await redis_pool.expire(key, lifetime)
+            expired += 1
+    return converted, expired
@@ -0,0 +1,143 @@
+from time import time
+
+from jwt.exceptions import InvalidTokenError
+
+from app.bloom import BloomFilter
+
+
+REVOKED_TOKEN_EVENT = 'tokens.revoked'
+
+
+class RevocationList(object):
+    """
+    A process-local replica of the revoked access tokens. Most of the checks
+    are answered by the Bloom filter, so Redis is queried only when the
+    filter matches an identifier, missing in the local exact set.
+    """
+
+    def __init__(self, redis_key, capacity, error_rate=0.001, prune_interval=60):
+        self.redis_key = redis_key
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.prune_interval = prune_interval
+        self.bloom_filter = BloomFilter(capacity, error_rate)
+        self.revoked = {}
+        self.added_while_loading = None
+        self.next_prune_at = time() + prune_interval
+        self.checks = 0
+        self.bloom_hits = 0
+        self.redis_checks = 0
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(
+            config["JWT_REVOCATION_LIST_KEY"],
+            config["JWT_REVOCATION_BLOOM_CAPACITY"],
+            config["JWT_REVOCATION_BLOOM_ERROR_RATE"]
+        )
+
+    def add(self, jti, expires_at):
+        if self.next_prune_at <= time():
+            self.prune()
+        if self.added_while_loading is not None:
+            self.added_while_loading[jti] = expires_at
+        if jti not in self.revoked:
+            self.bloom_filter.add(jti)
+        self.revoked[jti] = expires_at
+
+    def start_loading(self):
+        # The tokens, revoked while the list is being read from Redis, might
+        # be missing in the read entries, so they are kept aside and merged
+        self.added_while_loading = {}
+
+    def replace(self, entries):
+        revoked = dict(entries)
+        revoked.update(self.added_while_loading or {})
+        self.added_while_loading = None
+        self.revoked = revoked
+        self._rebuild_bloom_filter()
+
+    def prune(self):
+        now = time()
+        self.next_prune_at = now + self.prune_interval
+        expired = [jti for jti, expires_at in self.revoked.items() if expires_at <= now]
+        if expired:
+            for jti in expired:
+                del self.revoked[jti]
+            # Items can't be removed from a Bloom filter, so it is built again
+            self._rebuild_bloom_filter()
+
+    def _rebuild_bloom_filter(self):
+        bloom_filter = BloomFilter(max(self.capacity, len(self.revoked)), self.error_rate)
+        for jti in self.revoked:
+            bloom_filter.add(jti)
+        self.bloom_filter = bloom_filter
+
+    async def is_revoked(self, storage, jti):
+        self.checks += 1
+        if jti not in self.bloom_filter:
+            return False
+
+        self.bloom_hits += 1
+        expires_at = self.revoked.get(jti, None)
+        if expires_at is not None:
+            return expires_at > time()
+
+        self.redis_checks += 1
+        score = await storage.execute('zscore', self.redis_key, jti)
+        return score is not None and float(score) > time()
+
+    def get_stats(self):
+        return {
+            "size": len(self.revoked),
+            "checks": self.checks,
+            "bloom_hits": self.bloom_hits,
+            "redis_checks": self.redis_checks,
+        }
+
+
+async def load_revocation_list(app, _data=None):
+    storage = app.redis_storage
+    revocation_list = app.jwt_revocation_list
+    now = int(time())
+    revocation_list.start_loading()
+    try:
+        _, entries = await storage.transaction(
+            ('zremrangebyscore', revocation_list.redis_key, float('-inf'), now),
+            ('zrangebyscore', revocation_list.redis_key, now, float('inf'), True),
+        )
+    except Exception:
+        revocation_list.added_while_loading = None
+        raise
+    revocation_list.replace(
+        (jti.decode('utf-8'), int(expires_at)) for jti, expires_at in entries
+    )
+
+
+async def add_revoked_token(app, data):
+    app.jwt_revocation_list.add(data["jti"], data["exp"])
+
+
+async def revoke_token(app, claims):
+    """
+    Adds the token to the denylist until it expires and notifies all
+    running processes about it.
+    """
+    jti, expires_at = claims["jti"], int(claims["exp"])
+    revocation_list = app.jwt_revocation_list
+    await app.redis_storage.transaction(
+        ('zadd', revocation_list.redis_key, expires_at, jti),
+        ('zremrangebyscore', revocation_list.redis_key, float('-inf'), int(time())),
+    )
+    revocation_list.add(jti, expires_at)
+    await app.broadcaster.publish(app.redis, REVOKED_TOKEN_EVENT, {"jti": jti, "exp": expires_at})
+
+
+async def ensure_token_is_not_revoked(app, claims):
+    jti = claims.get("jti", None)
+    # Tokens, issued before the `jti` claim was introduced, can't be revoked
+    if jti is None:
+        return
+
+    if await app.jwt_revocation_list.is_revoked(app.redis_storage, jti):
+        raise InvalidTokenError('Token has been revoked.')
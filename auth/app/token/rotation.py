@@ -0,0 +1,90 @@
+from datetime import datetime, timedelta
+from secrets import token_hex, token_urlsafe
+
+from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+from cryptography.hazmat.primitives.serialization import Encoding, NoEncryption, PrivateFormat
+
+from app.token.keys import KeySet, SYMMETRIC_ALGORITHMS, encrypt_key_data
+
+
+SIGNING_KEYS_RELOAD_EVENT = 'signing_keys.reload'
+EC_ALGORITHM_CURVES = {
+    'ES256': ec.SECP256R1,
+    'ES384': ec.SECP384R1,
+    'ES512': ec.SECP521R1,
+}
+
+
+def generate_key_data(algorithm):
+    if algorithm in SYMMETRIC_ALGORITHMS:
+        return token_urlsafe(64)
+
+    if algorithm.startswith('RS') or algorithm.startswith('PS'):
+        private_key = rsa.generate_private_key(65537, 2048, default_backend())
+    elif algorithm in EC_ALGORITHM_CURVES:
+        private_key = ec.generate_private_key(EC_ALGORITHM_CURVES[algorithm](), default_backend())
+    elif algorithm == 'EdDSA':
+        private_key = ed25519.Ed25519PrivateKey.generate()
+    else:
+        raise ValueError('Unsupported signing algorithm: {}.'.format(algorithm))
+
+    pem = private_key.private_bytes(Encoding.PEM, PrivateFormat.PKCS8, NoEncryption())
+    return pem.decode('utf-8')
+
+
+async def load_key_set(app):
+    from app.token.documents import JsonWebKey
+    records = await JsonWebKey.collection.find({}).to_list(None)
+    return KeySet.from_config(app.config, records)
+
+
+async def reload_key_set(app, _data=None):
+    app.jwt_key_set = await load_key_set(app)
+    if app.jwt_token_cache is not None:
+        app.jwt_token_cache.clear()
+
+
+async def rotate_signing_key(app, redis, algorithm=None):
+    """
+    Publishes a new signing key and schedules the replacement of the active
+    one. Relying parties cache the JWKS document for `JWKS_MAX_AGE` seconds,
+    so the new key signs tokens only after every cached copy includes it.
+    Tokens signed with the retired key remain valid until they expire.
+    """
+    from app.token.documents import JsonWebKey
+    secret = app.config["JWT_KEYS_ENCRYPTION_KEY"]
+    if not secret:
+        raise ValueError('Rotating signing keys requires the `JWT_KEYS_ENCRYPTION_KEY` setting.')
+
+    key_set = await load_key_set(app)
+    algorithm = algorithm or key_set.active_key.algorithm
+    now = datetime.utcnow()
+    activates_at = now + timedelta(seconds=app.config["JWKS_MAX_AGE"])
+
+    # Keys, that are still waiting for activation, are replaced by the new one as well
+    await JsonWebKey.collection.update_many(
+        {"activates_at": {"$gt": now}, "retired_at": None},
+        {"$set": {"retired_at": activates_at}}
+    )
+    await JsonWebKey.collection.update_one(
+        {"kid": key_set.active_key.kid},
+        {
+            "$set": {"retired_at": activates_at},
+            "$setOnInsert": {"key": None, "algorithm": None, "created_at": now},
+        },
+        upsert=True
+    )
+
+    new_key = {
+        "kid": token_hex(8),
+        "algorithm": algorithm,
+        "key": encrypt_key_data(generate_key_data(algorithm), secret),
+        "created_at": now,
+        "activates_at": activates_at,
+        "retired_at": None,
+    }
+    await JsonWebKey.collection.insert_one(new_key)
+
+    await app.broadcaster.publish(redis, SIGNING_KEYS_RELOAD_EVENT)
+    return new_key["kid"], activates_at
@@ -1,5 +1,5 @@
 from marshmallow import Schema, validate, validates_schema, ValidationError
-from marshmallow.fields import String
+from marshmallow.fields import List, String
 
 from app.users.documents import User
 
@@ -85,3 +85,61 @@ class UserTokenSchema(Schema):
         fields = (
             'access_token',
         )
+
+
+class UserProfileBatchSchema(Schema):
+    MAX_BATCH_SIZE = 1000
+
+    user_ids = List(
+        String(validate=validate.Regexp(r'^[0-9a-f]{24}$', error='Invalid user identifier.')),
+        required=False,
+        allow_none=False,
+        missing=list,
+        description='List of user identifiers.',
+        validate=validate.Length(
+            max=MAX_BATCH_SIZE,
+            error='Field must contain no more than {max} identifiers.'
+        )
+    )
+    access_tokens = List(
+        String(allow_none=False),
+        required=False,
+        allow_none=False,
+        missing=list,
+        description='List of JSON Web Tokens of the users.',
+        validate=validate.Length(
+            max=MAX_BATCH_SIZE,
+            error='Field must contain no more than {max} tokens.'
+        )
+    )
+
+    @validates_schema(skip_on_field_errors=True)
+    def validate_batch_size(self, data):
+        size = len(data['user_ids']) + len(data['access_tokens'])
+        if not size or size > self.MAX_BATCH_SIZE:
+            raise ValidationError(
+                'Specify from 1 to {} user identifiers and tokens in total.'.format(
+                    self.MAX_BATCH_SIZE
+                ),
+                field_names=['user_ids', ]
+            )
+
+    class Meta:
+        fields = (
+            'user_ids',
+            'access_tokens',
+        )
+
+
+class UsernameAvailabilitySchema(Schema):
+    username = String(
+        required=True,
+        allow_none=False,
+        description='Username to check.',
+        validate=validate.Length(min=1, error='Field cannot be blank.')
+    )
+
+    class Meta:
+        fields = (
+            'username',
+        )
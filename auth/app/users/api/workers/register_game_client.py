@@ -2,6 +2,7 @@ import json
 
 from aioamqp import AmqpClosedConnection
 from marshmallow import ValidationError
+from pymongo.errors import DuplicateKeyError
 from sanic_amqp_ext import AmqpWorker
 from sage_utils.constants import VALIDATION_ERROR
 from sage_utils.wrappers import Response
@@ -17,12 +18,14 @@ class RegisterGameClientWorker(AmqpWorker):
 
     def __init__(self, app, *args, **kwargs):
         super(RegisterGameClientWorker, self).__init__(app, *args, **kwargs)
-        from app.groups.documents import Group
+        from app.groups.defaults import get_default_group_ids
         from app.users.documents import User
         from app.users.api.schemas import CreateUserSchema
+        from app.users.usernames import username_exists
         self.user_document = User
-        self.group_document = Group
+        self.get_default_group_ids = get_default_group_ids
         self.schema = CreateUserSchema
+        self.username_exists = username_exists
 
     async def validate_data(self, raw_data):
         try:
@@ -37,28 +40,35 @@ class RegisterGameClientWorker(AmqpWorker):
 
         return result.data
 
-    async def validate_username_for_uniqueness(self, username):
-        users = await self.user_document.collection.count_documents({"username": username})
-        if users:
-            raise ValidationError(
-                "Username must be unique.",
-                field_names=["username", ]
-            )
+    async def create_user(self, data):
+        # Taken usernames are rejected before the costly password hashing, while new ones
+        # usually pass the username filter without a query. The uniqueness is still
+        # guaranteed by the unique index on the username field.
+        if await self.username_exists(self.app, data['username']):
+            raise ValidationError("Username must be unique.", field_names=["username", ])
+
+        user = self.user_document(**data)
+        try:
+            await user.commit()
+        except DuplicateKeyError:
+            raise ValidationError("Username must be unique.", field_names=["username", ])
+        except ValidationError as exc:
+            if 'username' in exc.normalized_messages():
+                raise ValidationError("Username must be unique.", field_names=["username", ])
+            raise
+        return user
 
     async def register_game_client(self, raw_data):
         try:
             data = await self.validate_data(raw_data)
-            await self.validate_username_for_uniqueness(data["username"])
         except ValidationError as exc:
             return Response.from_error(VALIDATION_ERROR, exc.normalized_messages())
 
-        user_groups = await self.group_document.collection \
-            .find({"name": self.DEFAULT_GROUP_NAME}) \
-            .collation({"locale": "en", "strength": 2}) \
-            .to_list(1)
-        data['groups'] = [group['_id'] for group in user_groups]
-        user = self.user_document(**data)
-        await user.commit()
+        data['groups'] = await self.get_default_group_ids(self.app, self.DEFAULT_GROUP_NAME)
+        try:
+            user = await self.create_user(data)
+        except ValidationError as exc:
+            return Response.from_error(VALIDATION_ERROR, exc.normalized_messages())
         serializer = self.schema()
         return Response.with_content(serializer.dump(user).data)
 
@@ -1,14 +1,13 @@
 import json
 
 from aioamqp import AmqpClosedConnection
-from bson.objectid import ObjectId
 from jwt import InvalidTokenError
 from marshmallow import ValidationError
 from sanic_amqp_ext import AmqpWorker
 from sage_utils.constants import VALIDATION_ERROR, NOT_FOUND_ERROR, TOKEN_ERROR
 from sage_utils.wrappers import Response
 
-from app.token.json_web_token import extract_and_decode_token
+from app.token.json_web_token import verify_access_token
 
 
 class UserProfileWorker(AmqpWorker):
@@ -21,15 +20,12 @@ class UserProfileWorker(AmqpWorker):
 
     def __init__(self, app, *args, **kwargs):
         super(UserProfileWorker, self).__init__(app, *args, **kwargs)
-        from app.users.documents import User
-        from app.groups.documents import Group
-        from app.permissions.documents import Permission
-        from app.users.api.schemas import UserProfileSchema, UserTokenSchema
-        self.user_document = User
-        self.group_document = Group
-        self.permission_document = Permission
-        self.schema = UserProfileSchema
+        from app.users.api.schemas import UserTokenSchema
+        from app.users.lookups import load_user_record_by_id
+        from app.users.profiles import serialize_user_profile
         self.token_schema = UserTokenSchema
+        self.load_user_record_by_id = load_user_record_by_id
+        self.serialize_user_profile = serialize_user_profile
 
     def validate_data(self, raw_data):
         try:
@@ -42,53 +38,35 @@ class UserProfileWorker(AmqpWorker):
         if result.errors:
             raise ValidationError(result.errors)
 
-        return extract_and_decode_token(self.app, result.data)
-
-    async def collect_user_permissions(self, user):
-        pipeline = [
-            {'$match': {'_id': {'$in': [obj.pk for obj in user.groups]}}},
-            {'$group': {'_id': None, 'permission_ids': {'$addToSet': '$permissions'}}},
-            {'$project': {
-                'permission_ids': {
-                    '$reduce': {
-                        'input': '$permission_ids',
-                        'initialValue': [],
-                        'in': {'$setUnion': ['$$value', '$$this']}
-                    }
-                }
-            }}
-        ]
-        permission_ids = await self.group_document.collection.aggregate(pipeline).to_list(1)
-        permission_ids = permission_ids[0]['permission_ids'] if permission_ids else []
-
-        permissions = []
-        if permission_ids:
-            pipeline = [
-                {'$match': {'_id': {'$in': permission_ids}}},
-                {'$group': {'_id': None, 'codenames': {'$addToSet': '$codename'}}},
-            ]
-            permissions = await self.permission_document.collection.aggregate(pipeline).to_list(1)
-            permissions = permissions[0]['codenames'] if permissions else []
-
-        return permissions
+        return result.data
+
+    async def load_user_profile(self, user_id):
+        user = await self.load_user_record_by_id(self.app, user_id)
+        if not user:
+            return None
+        return self.serialize_user_profile(self.app, user)
+
+    async def get_cached_user_profile(self, user_id):
+        if self.app.profile_cache is not None:
+            return await self.app.profile_cache.get_or_load(user_id, self.load_user_profile)
+        return await self.load_user_profile(user_id)
 
     async def get_user_profile(self, raw_data):
         try:
-            token = self.validate_data(raw_data)
+            token = await verify_access_token(self.app, self.validate_data(raw_data))
         except ValidationError as exc:
             return Response.from_error(VALIDATION_ERROR, exc.normalized_messages())
         except InvalidTokenError as exc:
             return Response.from_error(TOKEN_ERROR, str(exc))
 
         user_id = token.get('user_id', None)
-        user = await self.user_document.find_one({"_id": ObjectId(user_id)})
-        if not user:
-            return Response.from_error(NOT_FOUND_ERROR, "User was not found.")
+        profile = await self.app.single_flight.do(
+            ('users.retrieve', user_id), self.get_cached_user_profile, user_id
+        )
 
-        serializer = self.schema()
-        serialized_user = serializer.dump(user).data
-        serialized_user['permissions'] = await self.collect_user_permissions(user)
-        return Response.with_content(serialized_user)
+        if profile is None:
+            return Response.from_error(NOT_FOUND_ERROR, "User was not found.")
+        return Response.with_content(profile)
 
     async def process_request(self, channel, body, envelope, properties):
         response = await self.get_user_profile(body)
@@ -0,0 +1,125 @@
+import json
+
+from aioamqp import AmqpClosedConnection
+from bson.objectid import ObjectId
+from jwt import InvalidTokenError
+from marshmallow import ValidationError
+from sanic_amqp_ext import AmqpWorker
+from sage_utils.constants import VALIDATION_ERROR, TOKEN_ERROR
+from sage_utils.wrappers import Response
+
+from app.token.json_web_token import verify_access_token
+
+
+class UserProfileBatchWorker(AmqpWorker):
+    QUEUE_NAME = 'auth.users.retrieve.batch'
+    REQUEST_EXCHANGE_NAME = 'open-matchmaking.auth.users.retrieve.batch.direct'
+    RESPONSE_EXCHANGE_NAME = 'open-matchmaking.responses.direct'
+    CONTENT_TYPE = 'application/json'
+
+    def __init__(self, app, *args, **kwargs):
+        super(UserProfileBatchWorker, self).__init__(app, *args, **kwargs)
+        from app.users.api.schemas import UserProfileBatchSchema
+        from app.users.lookups import PROFILE_PROJECTION, find_user_records_by_ids
+        from app.users.profiles import serialize_user_profile
+        self.projection = PROFILE_PROJECTION
+        self.find_user_records_by_ids = find_user_records_by_ids
+        self.schema = UserProfileBatchSchema
+        self.serialize_user_profile = serialize_user_profile
+
+    def validate_data(self, raw_data):
+        try:
+            data = json.loads(raw_data.strip())
+        except json.decoder.JSONDecodeError:
+            data = {}
+
+        deserializer = self.schema()
+        result = deserializer.load(data)
+        if result.errors:
+            raise ValidationError(result.errors)
+
+        return result.data
+
+    async def get_user_ids(self, data):
+        """
+        Returns the requested user IDs and the errors for invalid tokens by their positions.
+        """
+        user_ids = [ObjectId(user_id) for user_id in data['user_ids']]
+        errors = {}
+        field_name = self.app.config['JWT_ACCESS_TOKEN_FIELD_NAME']
+        for position, access_token in enumerate(data['access_tokens']):
+            try:
+                claims = await verify_access_token(self.app, {field_name: access_token})
+            except InvalidTokenError as exc:
+                error = Response.from_error(TOKEN_ERROR, str(exc)).data[Response.ERROR_FIELD_NAME]
+                errors[str(position)] = error
+                continue
+
+            user_id = claims.get('user_id', None)
+            if not isinstance(user_id, str) or not ObjectId.is_valid(user_id):
+                error = Response.from_error(
+                    VALIDATION_ERROR, "Token doesn't contain a valid user identifier."
+                ).data[Response.ERROR_FIELD_NAME]
+                errors[str(position)] = error
+                continue
+            user_ids.append(ObjectId(user_id))
+        return user_ids, errors
+
+    async def get_user_profiles(self, raw_data):
+        try:
+            data = self.validate_data(raw_data)
+        except ValidationError as exc:
+            return Response.from_error(VALIDATION_ERROR, exc.normalized_messages())
+
+        user_ids, errors = await self.get_user_ids(data)
+        users = {str(user_id): None for user_id in user_ids}
+        if user_ids:
+            records = await self.find_user_records_by_ids(set(user_ids), self.projection)
+            for user in records:
+                users[str(user.pk)] = self.serialize_user_profile(self.app, user)
+
+        return Response.with_content({"users": users, "errors": {"access_tokens": errors}})
+
+    async def process_request(self, channel, body, envelope, properties):
+        response = await self.get_user_profiles(body)
+        response.data[Response.EVENT_FIELD_NAME] = properties.correlation_id
+
+        if properties.reply_to:
+            await channel.publish(
+                json.dumps(response.data),
+                exchange_name=self.RESPONSE_EXCHANGE_NAME,
+                routing_key=properties.reply_to,
+                properties={
+                    'content_type': self.CONTENT_TYPE,
+                    'delivery_mode': 2,
+                    'correlation_id': properties.correlation_id
+                },
+                mandatory=True
+            )
+
+        await channel.basic_client_ack(delivery_tag=envelope.delivery_tag)
+
+    async def consume_callback(self, channel, body, envelope, properties):
+        self.app.loop.create_task(self.process_request(channel, body, envelope, properties))
+
+    async def run(self, *args, **kwargs):
+        try:
+            _transport, protocol = await self.connect()
+        except AmqpClosedConnection as exc:
+            print(exc)
+            return
+
+        channel = await protocol.channel()
+        await channel.queue_declare(
+            queue_name=self.QUEUE_NAME,
+            durable=True,
+            passive=False,
+            auto_delete=False
+        )
+        await channel.queue_bind(
+            queue_name=self.QUEUE_NAME,
+            exchange_name=self.REQUEST_EXCHANGE_NAME,
+            routing_key=self.QUEUE_NAME
+        )
+        await channel.basic_qos(prefetch_count=50, prefetch_size=0, connection_global=False)
+        await channel.basic_consume(self.consume_callback, queue_name=self.QUEUE_NAME)
@@ -0,0 +1,163 @@
+import json
+from asyncio import ensure_future
+from time import time
+
+from sanic.log import logger
+
+
+class UserProfileCache(object):
+    """
+    A read-through cache of serialized user profiles in Redis.
+
+    Entries are fresh for `ttl` seconds. With a non-zero `stale_ttl` an
+    expired entry is still served during this period, while a fresh one
+    is loaded in background (stale-while-revalidate). Every entry stores
+    the generation of the cache, so that incrementing the generation
+    invalidates all entries at once, and the version of the user entry.
+    Incrementing the version invalidates a single entry, including the
+    one that is written by a load, started before the invalidation.
+    """
+
+    def __init__(self, storage, prefix, ttl, stale_ttl=0):
+        self.storage = storage
+        self.prefix = prefix
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.generation_key = '{}:generation'.format(prefix)
+        self._refreshing = set()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.refresh_errors = 0
+        self.total_staleness = 0.0
+        self.max_staleness = 0.0
+
+    @classmethod
+    def from_config(cls, storage, config):
+        return cls(
+            storage,
+            config["USER_PROFILE_CACHE_PREFIX"],
+            config["USER_PROFILE_CACHE_TTL"],
+            config["USER_PROFILE_CACHE_STALE_TTL"]
+        )
+
+    def get_key(self, user_id):
+        return '{}:{}'.format(self.prefix, user_id)
+
+    def get_version_key(self, user_id):
+        return '{}:version:{}'.format(self.prefix, user_id)
+
+    async def set(self, user_id, profile, generation, version):
+        entry = {
+            "profile": profile,
+            "generation": generation,
+            "version": version,
+            "fresh_until": time() + self.ttl,
+        }
+        await self.storage.execute(
+            'set', self.get_key(user_id), json.dumps(entry), 'EX', self.ttl + self.stale_ttl
+        )
+
+    async def load(self, user_id, loader, generation, version):
+        profile = await loader(user_id)
+        if profile is not None:
+            await self.set(user_id, profile, generation, version)
+        return profile
+
+    async def refresh(self, user_id, loader, generation, version):
+        try:
+            await self.load(user_id, loader, generation, version)
+            self.refreshes += 1
+        except Exception:
+            self.refresh_errors += 1
+            logger.exception("Refreshing the cached profile of `%s` failed.", user_id)
+        finally:
+            self._refreshing.discard(user_id)
+
+    def schedule_refresh(self, user_id, loader, generation, version):
+        if user_id in self._refreshing:
+            return
+        self._refreshing.add(user_id)
+        ensure_future(self.refresh(user_id, loader, generation, version))
+
+    async def get_or_load(self, user_id, loader):
+        """
+        Returns the cached profile or the result of `await loader(user_id)`.
+        """
+        user_id = str(user_id)
+        generation, value, version = await self.storage.execute(
+            'mget', self.generation_key, self.get_key(user_id), self.get_version_key(user_id)
+        )
+        generation = int(generation or 0)
+        version = int(version or 0)
+        entry = json.loads(value) if value else None
+
+        if entry is not None and entry["generation"] == generation and \
+                entry.get("version", 0) == version:
+            staleness = time() - entry["fresh_until"]
+            if staleness <= 0:
+                self.hits += 1
+                return entry["profile"]
+
+            if self.stale_ttl:
+                self.stale_hits += 1
+                self.total_staleness += staleness
+                self.max_staleness = max(self.max_staleness, staleness)
+                self.schedule_refresh(user_id, loader, generation, version)
+                return entry["profile"]
+
+        self.misses += 1
+        return await self.load(user_id, loader, generation, version)
+
+    async def invalidate_user(self, user_id):
+        # The version outlives the entries, written by the loads in flight
+        version_key = self.get_version_key(user_id)
+        await self.storage.transaction(
+            ('incr', version_key),
+            ('expire', version_key, self.ttl + self.stale_ttl),
+            ('delete', self.get_key(user_id)),
+        )
+
+    async def invalidate_all(self):
+        await self.storage.execute('incr', self.generation_key)
+
+    def get_stats(self):
+        requests = self.hits + self.stale_hits + self.misses
+        return {
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "hit_ratio": (self.hits + self.stale_hits) / requests if requests else 0.0,
+            "refreshes": self.refreshes,
+            "refresh_errors": self.refresh_errors,
+            "average_staleness": self.total_staleness / self.stale_hits if self.stale_hits else 0.0,
+            "max_staleness": self.max_staleness,
+        }
+
+
+def get_active_profile_cache(app):
+    # The cache is available only in the running server, that has a Redis connection
+    if app.profile_cache is None or getattr(app, 'redis', None) is None:
+        return None
+    return app.profile_cache
+
+
+async def invalidate_user_profile(app, user_id):
+    # Called after the changes are committed, so a Redis failure is only logged
+    # and the cached profile expires with its TTL
+    profile_cache = get_active_profile_cache(app)
+    if profile_cache is not None:
+        try:
+            await profile_cache.invalidate_user(user_id)
+        except Exception:
+            logger.exception("Invalidating the cached profile of `%s` failed.", user_id)
+
+
+async def invalidate_user_profiles(app):
+    profile_cache = get_active_profile_cache(app)
+    if profile_cache is not None:
+        try:
+            await profile_cache.invalidate_all()
+        except Exception:
+            logger.exception("Invalidating the cached profiles failed.")
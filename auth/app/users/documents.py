@@ -3,7 +3,9 @@ from umongo.fields import StringField, ListField, ReferenceField
 
 from app import app
 from app.groups.documents import Group
-from app.users.security import hash_password, verify_password
+from app.users.cache import invalidate_user_profile
+from app.users.permissions import get_effective_permissions
+from app.users.usernames import register_username
 
 
 instance = app.config["LAZY_UMONGO"]
@@ -14,15 +16,39 @@ class User(Document):
     username = StringField(unique=True, allow_none=False, required=True)
     password = StringField(allow_none=False, required=True)
     groups = ListField(ReferenceField(Group))
+    # Codenames of the permissions, granted by the groups. Maintained only
+    # when the `USERS_EFFECTIVE_PERMISSIONS` setting is enabled.
+    effective_permissions = ListField(StringField(), required=False)
 
     class Meta:
         indexes = ['$username', ]
 
-    def set_password(self, password):
-        self.password = hash_password(password)
+    async def set_password(self, password):
+        self.password = await app.crypto_executor.hash_password(password)
 
-    def verify_password(self, password):
-        return self.password and verify_password(password, self.password)
+    async def verify_password(self, password):
+        if not self.password:
+            return False
+        return await app.crypto_executor.verify_password(password, self.password)
+
+    def set_effective_permissions(self):
+        # The index is loaded only by the running server
+        if app.config["USERS_EFFECTIVE_PERMISSIONS"] and app.permission_index.loads:
+            group_ids = [obj.pk for obj in self.groups]
+            self.effective_permissions = get_effective_permissions(app, group_ids)
 
     async def pre_insert(self):
-        self.set_password(self.password)
+        await self.set_password(self.password)
+        self.set_effective_permissions()
+
+    async def post_insert(self, ret):
+        await register_username(app, self.username)
+
+    async def pre_update(self):
+        self.set_effective_permissions()
+
+    async def post_update(self, ret):
+        await invalidate_user_profile(app, self.pk)
+
+    async def post_delete(self, ret):
+        await invalidate_user_profile(app, self.pk)
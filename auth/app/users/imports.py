@@ -0,0 +1,174 @@
+import asyncio
+import csv
+import json
+import time
+from itertools import islice
+
+from marshmallow import ValidationError
+from pymongo import InsertOne
+from pymongo.errors import BulkWriteError
+
+from app.users.security import hash_password, is_password_hash, looks_like_password_hash
+
+
+DUPLICATE_KEY_ERROR_CODE = 11000
+
+
+def read_jsonl_rows(stream):
+    for line_number, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield line_number, json.loads(line)
+        except json.decoder.JSONDecodeError:
+            yield line_number, None
+
+
+def read_csv_rows(stream):
+    reader = csv.DictReader(stream)
+    # The first line is taken by the header
+    for line_number, row in enumerate(reader, start=2):
+        yield line_number, row
+
+
+ROW_READERS = {
+    'jsonl': read_jsonl_rows,
+    'csv': read_csv_rows,
+}
+
+
+def get_file_format(path, file_format=None):
+    file_format = file_format or path.rsplit('.', 1)[-1].lower()
+    if file_format not in ROW_READERS:
+        raise ValueError(
+            "File format must be one of: {}.".format(', '.join(ROW_READERS))
+        )
+    return file_format
+
+
+def read_user_rows(stream, file_format):
+    """
+    Lazily reads the `{"username", "password"}` rows of the file. The
+    password could be either a plain text or a bcrypt hash.
+    """
+    return ROW_READERS[file_format](stream)
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def clean_user_row(row):
+    """
+    Validates the row with the registration schema, so that the imported users
+    could be registered as well, and returns the `(username, password)` pair.
+    """
+    from app.users.api.schemas import CreateUserSchema
+    if not isinstance(row, dict):
+        raise ValidationError('Row must be an object with `username` and `password` fields.')
+
+    password = row.get('password', None)
+    data = {
+        'username': row.get('username', None),
+        'password': password,
+        'confirm_password': password,
+    }
+    result = CreateUserSchema().load(data)
+    if result.errors:
+        raise ValidationError(result.errors)
+
+    # A malformed bcrypt hash would be stored as is and break the logins
+    if looks_like_password_hash(password) and not is_password_hash(password):
+        raise ValidationError('Malformed bcrypt hash.', field_names=['password', ])
+    return result.data['username'], result.data['password']
+
+
+class ImportProgress(object):
+
+    def __init__(self):
+        self.started_at = time.monotonic()
+        self.processed = 0
+        self.inserted = 0
+        self.duplicates = 0
+        self.invalid = 0
+
+    @property
+    def elapsed(self):
+        return time.monotonic() - self.started_at
+
+    @property
+    def throughput(self):
+        elapsed = self.elapsed
+        return self.processed / elapsed if elapsed else 0.0
+
+    def report(self):
+        return "Processed: {}, inserted: {}, duplicates: {}, invalid: {} ({:.1f} users/s).".format(  # NOQA
+            self.processed, self.inserted, self.duplicates, self.invalid, self.throughput
+        )
+
+
+class UserImporter(object):
+    """
+    Inserts users by chunks with unordered bulk writes. Passwords are hashed
+    by the crypto executor, so the work is spread across its processes.
+    """
+
+    def __init__(self, collection, crypto_executor, group_ids, effective_permissions=None):
+        self.collection = collection
+        self.crypto_executor = crypto_executor
+        self.group_ids = list(group_ids)
+        self.effective_permissions = effective_permissions
+        self.progress = ImportProgress()
+
+    async def get_password_hash(self, password):
+        if is_password_hash(password):
+            return password
+        return await self.crypto_executor.run(hash_password, password)
+
+    async def build_documents(self, rows):
+        users = []
+        for line_number, row in rows:
+            try:
+                users.append(clean_user_row(row))
+            except ValidationError as exc:
+                print("Line {} was skipped: {}".format(line_number, exc.normalized_messages()))
+                self.progress.invalid += 1
+
+        # All passwords of the chunk are hashed concurrently
+        password_hashes = await asyncio.gather(*[
+            self.get_password_hash(password) for _username, password in users
+        ])
+        documents = []
+        for (username, _password), password_hash in zip(users, password_hashes):
+            document = {'username': username, 'password': password_hash}
+            if self.group_ids:
+                document['groups'] = self.group_ids
+            if self.effective_permissions:
+                document['effective_permissions'] = self.effective_permissions
+            documents.append(document)
+        return documents
+
+    async def write_documents(self, documents):
+        if not documents:
+            return
+        requests = [InsertOne(document) for document in documents]
+        try:
+            result = await self.collection.bulk_write(requests, ordered=False)
+            self.progress.inserted += result.inserted_count
+        except BulkWriteError as exc:
+            self.progress.inserted += exc.details.get('nInserted', 0)
+            for error in exc.details.get('writeErrors', []):
+                if error.get('code', None) != DUPLICATE_KEY_ERROR_CODE:
+                    raise
+                self.progress.duplicates += 1
+
+    async def import_chunk(self, rows):
+        documents = await self.build_documents(rows)
+        await self.write_documents(documents)
+        self.progress.processed += len(rows)
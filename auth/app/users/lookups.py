@@ -0,0 +1,49 @@
+from bson.objectid import ObjectId
+
+
+# Fields, loaded by the hot paths. The password hash is requested only for the login.
+LOGIN_PROJECTION = {'_id': 1, 'username': 1, 'password': 1, 'groups': 1}
+PROFILE_PROJECTION = {'_id': 1, 'username': 1, 'groups': 1, 'effective_permissions': 1}
+
+
+class UserRecord(object):
+    """
+    A lightweight read-only view of the user document, built without
+    the umongo and marshmallow machinery.
+    """
+    __slots__ = ('pk', 'username', 'password', 'group_ids', 'effective_permissions')
+
+    def __init__(self, pk, username, password=None, group_ids=(), effective_permissions=None):
+        self.pk = pk
+        self.username = username
+        self.password = password
+        self.group_ids = group_ids
+        self.effective_permissions = effective_permissions
+
+    @classmethod
+    def from_document(cls, document):
+        return cls(
+            document['_id'],
+            document.get('username', None),
+            document.get('password', None),
+            document.get('groups', None) or [],
+            document.get('effective_permissions', None)
+        )
+
+
+async def load_user_record_by_id(app, user_id):
+    if not user_id or not ObjectId.is_valid(user_id):
+        return None
+    document = await app.loaders.users_by_id.load(ObjectId(user_id))
+    return UserRecord.from_document(document) if document else None
+
+
+async def load_user_record_by_username(app, username):
+    document = await app.loaders.users_by_username.load(username)
+    return UserRecord.from_document(document) if document else None
+
+
+async def find_user_records_by_ids(user_ids, projection):
+    from app.users.documents import User
+    cursor = User.collection.find({'_id': {'$in': list(user_ids)}}, projection)
+    return [UserRecord.from_document(document) async for document in cursor]
@@ -0,0 +1,34 @@
+from bson.objectid import ObjectId
+from pymongo import UpdateMany
+
+
+def get_effective_permissions(app, group_ids):
+    return app.permission_index.get_codenames(group_ids or [])
+
+
+async def update_effective_permissions(app, group_ids=None):
+    """
+    Recomputes the denormalized permissions of the users in the specified
+    groups (or of all users). Users with the same list of groups share a
+    single `update_many` request.
+    """
+    from app.users.documents import User
+    query = {}
+    if group_ids is not None:
+        query = {'groups': {'$in': [ObjectId(obj_id) for obj_id in group_ids]}}
+
+    pipeline = [
+        {'$match': query},
+        {'$group': {'_id': '$groups'}},
+    ]
+    requests = []
+    async for document in User.collection.aggregate(pipeline):
+        groups = document['_id']
+        requests.append(UpdateMany(
+            {'groups': groups},
+            {'$set': {'effective_permissions': get_effective_permissions(app, groups)}}
+        ))
+
+    if requests:
+        await User.collection.bulk_write(requests, ordered=False)
+    return len(requests)
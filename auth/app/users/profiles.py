@@ -0,0 +1,13 @@
+def serialize_user_profile(app, user):
+    """
+    Serializes the `UserRecord`, loaded with the `PROFILE_PROJECTION`.
+    """
+    if app.config["USERS_EFFECTIVE_PERMISSIONS"] and user.effective_permissions:
+        permissions = list(user.effective_permissions)
+    else:
+        permissions = app.permission_index.get_codenames(user.group_ids)
+    return {
+        "id": str(user.pk),
+        "username": user.username,
+        "permissions": permissions,
+    }
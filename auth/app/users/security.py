@@ -1,12 +1,148 @@
+import asyncio
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
 from passlib.context import CryptContext
+from passlib.hash import bcrypt
 
 
 pwd_context = CryptContext(schemes=["bcrypt", ])
 
+EXECUTOR_CLASSES = {
+    'thread': ThreadPoolExecutor,
+    'process': ProcessPoolExecutor,
+}
+
 
 def hash_password(password):
     return pwd_context.hash(password)
 
 
 def verify_password(password, database_hash):
-    return pwd_context.verify(password, database_hash)
+    try:
+        return pwd_context.verify(password, database_hash)
+    except ValueError:
+        # A malformed hash never matches
+        return False
+
+
+def looks_like_password_hash(value):
+    # Checks only the prefix of the value
+    return pwd_context.identify(value) is not None
+
+
+def is_password_hash(value):
+    try:
+        bcrypt.from_string(value)
+    except (ValueError, TypeError):
+        return False
+    return True
+
+
+def _timed_call(func, submitted_at, *args):
+    # Returns how long the call has been waiting in the executor queue together
+    # with the result, so that the wait time is measured on the worker side.
+    return time.monotonic() - submitted_at, func(*args)
+
+
+class CryptoExecutor(object):
+    """
+    Runs CPU-bound password hashing and verification out of the event loop.
+
+    The number of calls handed over to the pool is limited by the sum of
+    workers and the queue size; callers beyond that limit are suspended
+    until a slot is released, without blocking the event loop.
+    """
+
+    def __init__(self, executor_type='thread', max_workers=4, max_queue_size=100):
+        if executor_type not in EXECUTOR_CLASSES:
+            raise ValueError(
+                "Executor type must be one of: {}.".format(', '.join(EXECUTOR_CLASSES))
+            )
+
+        self.executor_type = executor_type
+        self.max_workers = max_workers
+        self.max_queue_size = max_queue_size
+        self._executor = None
+        self._semaphore = None
+        self._loop = None
+
+        self.waiting = 0
+        self.in_flight = 0
+        self.completed = 0
+        self.total_wait_time = 0.0
+        self.max_wait_time = 0.0
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(
+            executor_type=config["CRYPTO_EXECUTOR_TYPE"],
+            max_workers=config["CRYPTO_EXECUTOR_WORKERS"],
+            max_queue_size=config["CRYPTO_EXECUTOR_QUEUE_SIZE"],
+        )
+
+    def get_executor(self):
+        # The pool is created lazily, so that each forked server process
+        # gets its own workers.
+        if self._executor is None:
+            executor_class = EXECUTOR_CLASSES[self.executor_type]
+            self._executor = executor_class(max_workers=self.max_workers)
+        return self._executor
+
+    def get_semaphore(self, loop):
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_workers + self.max_queue_size)
+            self._loop = loop
+        return self._semaphore
+
+    async def run(self, func, *args):
+        loop = asyncio.get_event_loop()
+        submitted_at = time.monotonic()
+
+        semaphore = self.get_semaphore(loop)
+        self.waiting += 1
+        try:
+            await semaphore.acquire()
+        finally:
+            self.waiting -= 1
+
+        self.in_flight += 1
+        try:
+            wait_time, result = await loop.run_in_executor(
+                self.get_executor(), _timed_call, func, submitted_at, *args
+            )
+        finally:
+            self.in_flight -= 1
+            semaphore.release()
+
+        self.completed += 1
+        self.total_wait_time += wait_time
+        self.max_wait_time = max(self.max_wait_time, wait_time)
+        return result
+
+    async def hash_password(self, password):
+        return await self.run(hash_password, password)
+
+    async def verify_password(self, password, database_hash):
+        return await self.run(verify_password, password, database_hash)
+
+    def shutdown(self, wait=True):
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+        self._executor = None
+        self._semaphore = None
+        self._loop = None
+
+    def get_stats(self):
+        queue_depth = self.waiting + max(self.in_flight - self.max_workers, 0)
+        average_wait_time = self.total_wait_time / self.completed if self.completed else 0.0
+        return {
+            "executor_type": self.executor_type,
+            "max_workers": self.max_workers,
+            "max_queue_size": self.max_queue_size,
+            "queue_depth": queue_depth,
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "average_wait_time": average_wait_time,
+            "max_wait_time": self.max_wait_time,
+        }
@@ -0,0 +1,156 @@
+from datetime import datetime
+from time import time
+
+from bson.objectid import ObjectId
+from sanic.log import logger
+
+from app.bloom import BloomFilter
+
+
+USERNAME_ADDED_EVENT = 'users.usernames.added'
+USERNAME_FILTER_RELOAD_EVENT = 'users.usernames.reload'
+# ObjectIds are generated by the clients, so the incremental sync reads again
+# the users, inserted a bit earlier than the previous sync, to tolerate clock skew
+SYNC_OVERLAP = 60
+
+
+class UsernameFilter(object):
+    """
+    A process-local Bloom filter of all registered usernames. A username,
+    missing in the filter, definitely doesn't exist, so the database is
+    queried only for usernames that might exist.
+
+    Until the filter is loaded every username is reported as possibly
+    existing, so the checks fall back to the database.
+    """
+
+    def __init__(self, capacity, error_rate=0.001):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.bloom_filter = BloomFilter(capacity, error_rate)
+        self.added_while_loading = None
+        self.loaded = False
+        self.synced_at = None
+        self.loads = 0
+        self.syncs = 0
+        self.checks = 0
+        self.rejected = 0
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(
+            config["USERS_USERNAME_FILTER_CAPACITY"],
+            config["USERS_USERNAME_FILTER_ERROR_RATE"]
+        )
+
+    def create_bloom_filter(self, expected_count=0):
+        # Leaves room for the users, registered until the next reload. The
+        # usernames, added while the new filter is being filled, are kept
+        # aside and copied into it on replacing.
+        self.added_while_loading = []
+        return BloomFilter(max(self.capacity, expected_count * 2), self.error_rate)
+
+    def replace(self, bloom_filter):
+        for username in self.added_while_loading or []:
+            bloom_filter.add(username)
+        self.added_while_loading = None
+        self.bloom_filter = bloom_filter
+        self.loaded = True
+        self.loads += 1
+
+    def add(self, username):
+        if self.added_while_loading is not None:
+            self.added_while_loading.append(username)
+        if username not in self.bloom_filter:
+            self.bloom_filter.add(username)
+
+    def might_exist(self, username):
+        if not self.loaded:
+            return True
+        self.checks += 1
+        if username in self.bloom_filter:
+            return True
+        self.rejected += 1
+        return False
+
+    def get_stats(self):
+        return {
+            "loaded": self.loaded,
+            "usernames": len(self.bloom_filter),
+            "capacity": self.bloom_filter.capacity,
+            "loads": self.loads,
+            "syncs": self.syncs,
+            "checks": self.checks,
+            "rejected": self.rejected,
+        }
+
+
+async def load_username_filter(app, _data=None):
+    if not app.config["USERS_USERNAME_FILTER"]:
+        return
+
+    from app.users.documents import User
+    started_at = time()
+    expected_count = await User.collection.estimated_document_count()
+    cursor = User.collection.find({}, {'_id': 0, 'username': 1}) \
+        .batch_size(app.config["USERS_USERNAME_FILTER_BATCH_SIZE"])
+    bloom_filter = app.username_filter.create_bloom_filter(expected_count)
+    try:
+        async for document in cursor:
+            bloom_filter.add(document['username'])
+    except Exception:
+        app.username_filter.added_while_loading = None
+        raise
+    app.username_filter.replace(bloom_filter)
+    app.username_filter.synced_at = started_at
+
+
+async def sync_username_filter(app, _data=None):
+    """
+    Adds the usernames of the users, inserted since the previous load or sync,
+    so that a missed broadcast is repaired without scanning all users.
+    """
+    username_filter = app.username_filter
+    if not app.config["USERS_USERNAME_FILTER"] or username_filter.synced_at is None:
+        return
+
+    from app.users.documents import User
+    started_at = time()
+    since = datetime.utcfromtimestamp(username_filter.synced_at - SYNC_OVERLAP)
+    cursor = User.collection.find(
+        {'_id': {'$gte': ObjectId.from_datetime(since)}}, {'_id': 0, 'username': 1}
+    ).batch_size(app.config["USERS_USERNAME_FILTER_BATCH_SIZE"])
+    async for document in cursor:
+        username_filter.add(document['username'])
+    username_filter.synced_at = started_at
+    username_filter.syncs += 1
+
+
+async def add_username(app, data):
+    username = (data or {}).get('username', None)
+    if username:
+        app.username_filter.add(username)
+
+
+async def register_username(app, username):
+    app.username_filter.add(username)
+    # Other processes might have loaded their filters already, even when this
+    # one is still loading. Commands have no Redis connection and publish a
+    # reload event instead.
+    if getattr(app, 'redis', None) is None:
+        return
+
+    # The user is already stored, so a failed broadcast mustn't fail the request.
+    # Other processes catch up on the next sync of their filters.
+    try:
+        await app.broadcaster.publish(app.redis, USERNAME_ADDED_EVENT, {"username": username})
+    except Exception:
+        logger.exception("Broadcasting the registered `%s` username failed.", username)
+
+
+async def username_exists(app, username):
+    if not app.username_filter.might_exist(username):
+        return False
+    from app.users.documents import User
+    document = await User.collection.find_one({'username': username}, {'_id': 1})
+    return document is not None
@@ -0,0 +1,53 @@
+"""
+Compares the union of permission sets, stored as codename lists, with
+the bitwise OR of the bitsets at 10k registered permissions.
+
+Usage:
+    APP_CONFIG_PATH=./config.py python -m benchmarks.permission_bitset
+"""
+from random import Random
+from timeit import timeit
+
+from app.permissions.bitset import PermissionSet
+
+
+PERMISSIONS_COUNT = 10000
+GROUPS_COUNT = 5
+PERMISSIONS_PER_GROUP = 2000
+ITERATIONS = 1000
+
+
+def generate_groups():
+    random = Random(42)
+    codenames = ['microservice-{}.resource.retrieve'.format(i) for i in range(PERMISSIONS_COUNT)]
+    groups = [random.sample(range(PERMISSIONS_COUNT), PERMISSIONS_PER_GROUP) for _ in range(GROUPS_COUNT)]  # NOQA
+    codename_groups = [[codenames[index] for index in group] for group in groups]
+    bitset_groups = [PermissionSet.from_indexes(group) for group in groups]
+    return codename_groups, bitset_groups
+
+
+def union_codenames(groups):
+    result = set()
+    for group in groups:
+        result.update(group)
+    return result
+
+
+def union_bitsets(groups):
+    result = PermissionSet()
+    for group in groups:
+        result = result | group
+    return result
+
+
+if __name__ == '__main__':
+    codename_groups, bitset_groups = generate_groups()
+    for name, func, groups in [("codenames", union_codenames, codename_groups),
+                               ("bitsets", union_bitsets, bitset_groups)]:
+        elapsed = timeit(lambda: func(groups), number=ITERATIONS)
+        print("{:<10} {:>10.2f} us per union".format(name, elapsed / ITERATIONS * 10 ** 6))
+
+    encoded = union_bitsets(bitset_groups).to_base64()
+    print("Encoded claim: {} characters for {} permissions".format(
+        len(encoded), len(union_codenames(codename_groups))
+    ))
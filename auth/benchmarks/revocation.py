@@ -0,0 +1,40 @@
+"""
+Measures the per-verify cost, added by the revocation check, when the
+token isn't revoked (the Bloom filter answers without a Redis round trip).
+
+Usage:
+    APP_CONFIG_PATH=./config.py python -m benchmarks.revocation
+"""
+from asyncio import get_event_loop
+from time import perf_counter, time
+
+from app import app
+from app.token.json_web_token import token_id_generator
+from app.token.revocation import ensure_token_is_not_revoked
+
+
+ITERATIONS = 100000
+REVOKED_TOKENS = 10000
+
+
+async def measure():
+    revocation_list = app.jwt_revocation_list
+    expires_at = int(time()) + app.config["JWT_LIFETIME"]
+    revocation_list.replace(
+        (token_id_generator.generate(), expires_at) for _ in range(REVOKED_TOKENS)
+    )
+
+    claims = [{"jti": token_id_generator.generate()} for _ in range(ITERATIONS)]
+    started_at = perf_counter()
+    for item in claims:
+        await ensure_token_is_not_revoked(app, item)
+    elapsed = perf_counter() - started_at
+
+    stats = revocation_list.get_stats()
+    print("Revoked tokens in the list: {}".format(REVOKED_TOKENS))
+    print("Average cost per verify: {:.2f} us".format(elapsed / ITERATIONS * 10 ** 6))
+    print("Redis round trips: {} of {} checks".format(stats["redis_checks"], stats["checks"]))
+
+
+if __name__ == '__main__':
+    get_event_loop().run_until_complete(measure())
@@ -0,0 +1,53 @@
+"""
+Compares the tokens/sec of the token pair minting before and after
+introducing the prepared signing keys and the refresh token pool.
+
+Redis round trips are excluded, so that only the CPU cost is measured.
+
+Usage:
+    APP_CONFIG_PATH=./config.py python -m benchmarks.token_minting
+"""
+from datetime import datetime, timedelta
+from timeit import timeit
+
+from jwt import encode
+from passlib.pwd import genword
+
+from app import app
+from app.token.json_web_token import build_payload, generate_access_token, \
+    generate_refresh_token
+
+
+ITERATIONS = 20000
+
+
+def generate_token_pair_before():
+    # The implementation, that was used before the prepared signing keys
+    iat = datetime.now()
+    payload = {'iat': iat, 'exp': iat + timedelta(seconds=app.config.JWT_LIFETIME)}
+    payload.update({"user_id": "5c3b3a7a1f4ea2000c2ea3b0"})
+    access_token = encode(
+        payload,
+        app.config["JWT_SECRET_KEY"],
+        algorithm=app.config["JWT_ALGORITHM"]
+    ).decode('utf-8')
+    refresh_token = genword(entropy=48, length=32, charset="hex")
+    return access_token, refresh_token
+
+
+def generate_token_pair_after():
+    payload = build_payload(app, extra_data={"user_id": "5c3b3a7a1f4ea2000c2ea3b0"})
+    access_token = generate_access_token(payload, app.jwt_key_set.active_key)
+    refresh_token = generate_refresh_token()
+    return access_token, refresh_token
+
+
+def report(name, func):
+    elapsed = timeit(func, number=ITERATIONS)
+    print("{:<10} {:>12.0f} token pairs/sec".format(name, ITERATIONS / elapsed))
+
+
+if __name__ == '__main__':
+    print("Algorithm: {}".format(app.jwt_key_set.active_key.algorithm))
+    report("before", generate_token_pair_before)
+    report("after", generate_token_pair_after)
@@ -0,0 +1,67 @@
+"""
+Compares the per-request cost of building a user profile from a MongoDB
+document via the umongo `User` document and via the projected `UserRecord`.
+
+The same raw document is reused, so only the CPU time and allocations on
+the application side are measured.
+
+Usage:
+    APP_CONFIG_PATH=./config.py python -m benchmarks.user_lookup
+"""
+import tracemalloc
+from timeit import timeit
+
+from bson.objectid import ObjectId
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from app import app
+from app.users.lookups import PROFILE_PROJECTION, UserRecord
+from app.users.profiles import serialize_user_profile
+
+
+ITERATIONS = 10000
+DOCUMENT = {
+    '_id': ObjectId(),
+    'username': 'player',
+    'password': '$2b$12$' + 'x' * 53,
+    'groups': [ObjectId() for _ in range(5)],
+}
+PROJECTED_DOCUMENT = {key: value for key, value in DOCUMENT.items() if key in PROFILE_PROJECTION}
+
+
+def umongo_path():
+    from app.users.api.schemas import UserProfileSchema
+    from app.users.documents import User
+    user = User.build_from_mongo(DOCUMENT)
+    profile = UserProfileSchema().dump(user).data
+    profile['permissions'] = app.permission_index.get_codenames([obj.pk for obj in user.groups])
+    return profile
+
+
+def record_path():
+    return serialize_user_profile(app, UserRecord.from_document(PROJECTED_DOCUMENT))
+
+
+def measure_allocations(func):
+    # Peak of the memory, allocated while handling a single request
+    func()
+    tracemalloc.start()
+    current, _ = tracemalloc.get_traced_memory()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak - current
+
+
+def report(name, func):
+    elapsed = timeit(func, number=ITERATIONS)
+    print("{:<8} {:>8.1f} us/request {:>8} bytes allocated/request".format(
+        name, elapsed / ITERATIONS * 10 ** 6, measure_allocations(func)
+    ))
+
+
+if __name__ == '__main__':
+    # The client doesn't connect until the first query
+    app.config["LAZY_UMONGO"].init(AsyncIOMotorClient()['benchmark'])
+    report("umongo", umongo_path)
+    report("record", record_path)
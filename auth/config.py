@@ -14,6 +14,13 @@ def to_int(value):
         return None
 
 
+def to_float(value):
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return None
+
+
 APP_HOST = os.environ.get('APP_HOST', "127.0.0.1")
 APP_PORT = to_int(os.environ.get('APP_HOST', "80"))
 APP_DEBUG = to_bool(os.environ.get('APP_DEBUG', False))
@@ -48,6 +55,10 @@ MONGODB_URI = 'mongodb://{}:{}@{}:{}/{}'.format(
     MONGODB_DATABASE
 )
 LAZY_UMONGO = MotorAsyncIOInstance()
+# Lookups of documents by a key, done by concurrently processed messages within this window
+# (in milliseconds; 0 means one iteration of the event loop), are sent as a single query
+MONGODB_BATCH_WINDOW = to_int(os.environ.get("MONGODB_BATCH_WINDOW", 0))
+MONGODB_BATCH_MAX_SIZE = to_int(os.environ.get("MONGODB_BATCH_MAX_SIZE", 1000))
 
 # AMQP settings
 AMQP_USERNAME = os.environ.get("AMQP_USERNAME", "user")
@@ -58,11 +69,76 @@ AMQP_VIRTUAL_HOST = os.environ.get("AMQP_VIRTUAL_HOST", "vhost")
 AMQP_USING_SSL = to_bool(os.environ.get("AMQP_USING_SSL", False))
 
 # Settings for setting up JWT
-JWT_ALGORITHM = 'HS256'
+# For HS256/HS384/HS512 algorithms tokens are signed with the `JWT_SECRET_KEY`. For
+# RS*/PS*/ES*/EdDSA algorithms the private keys are loaded from the `*.pem` files
+# in the `JWT_KEYS_DIRECTORY`, where the file name is used as the key identifier.
+JWT_ALGORITHM = os.environ.get('APP_JWT_ALGORITHM', 'HS256')
 JWT_LIFETIME = 60 * 30
 JWT_SECRET_KEY = os.environ.get('APP_JWT_SECRET_KEY', 'some-secret-key')
+JWT_KEYS_DIRECTORY = os.environ.get('APP_JWT_KEYS_DIRECTORY', None)
+JWT_KEY_ID = os.environ.get('APP_JWT_KEY_ID', None)
+JWKS_MAX_AGE = to_int(os.environ.get('APP_JWKS_MAX_AGE', 60 * 5))
+# Rotated signing keys are stored in MongoDB, encrypted with this secret
+JWT_KEYS_ENCRYPTION_KEY = os.environ.get('APP_JWT_KEYS_ENCRYPTION_KEY', None)
+# The maximum amount of verified tokens cached per process. Set to 0 to disable caching.
+JWT_VERIFY_CACHE_SIZE = to_int(os.environ.get('APP_JWT_VERIFY_CACHE_SIZE', 10000))
 JWT_ACCESS_TOKEN_FIELD_NAME = 'access_token'
 JWT_REFRESH_TOKEN_FIELD_NAME = 'refresh_token'
+# Embed IDs of the user groups and the resolved permission codenames into access tokens,
+# so that other microservices can authorize requests with the verified claims only
+JWT_EMBED_PERMISSIONS = to_bool(os.environ.get('APP_JWT_EMBED_PERMISSIONS', False))
+# `codenames` - a list of permission codenames
+# `bitset` - a base64 encoded bitset of the permission indexes (see `Permission.index`)
+JWT_PERMISSIONS_FORMAT = os.environ.get('APP_JWT_PERMISSIONS_FORMAT', 'codenames')
+JWT_REFRESH_TOKEN_LIFETIME = to_int(os.environ.get('APP_JWT_REFRESH_TOKEN_LIFETIME', 60 * 60 * 24 * 30))  # NOQA
+# Revoked access tokens are kept in the Redis sorted set until they expire. Each process
+# holds a Bloom filter of the revoked tokens, sized for the expected amount of them.
+JWT_REVOCATION_LIST_KEY = os.environ.get('APP_JWT_REVOCATION_LIST_KEY', 'auth.revoked_tokens')
+JWT_REVOCATION_BLOOM_CAPACITY = to_int(os.environ.get('APP_JWT_REVOCATION_BLOOM_CAPACITY', 100000))  # NOQA
+JWT_REVOCATION_BLOOM_ERROR_RATE = to_float(os.environ.get('APP_JWT_REVOCATION_BLOOM_ERROR_RATE', 0.001))  # NOQA
+# Every process reads the whole revocation list again each `JWT_REVOCATION_RESYNC_INTERVAL`
+# seconds, in case a broadcast was missed (set to 0 to disable)
+JWT_REVOCATION_RESYNC_INTERVAL = to_int(os.environ.get('APP_JWT_REVOCATION_RESYNC_INTERVAL', 60))  # NOQA
+
+# Settings for the executor that runs password hashing out of the event loop
+# `thread` or `process`
+CRYPTO_EXECUTOR_TYPE = os.environ.get('APP_CRYPTO_EXECUTOR_TYPE', 'thread')
+CRYPTO_EXECUTOR_WORKERS = to_int(os.environ.get('APP_CRYPTO_EXECUTOR_WORKERS', 4))
+CRYPTO_EXECUTOR_QUEUE_SIZE = to_int(os.environ.get('APP_CRYPTO_EXECUTOR_QUEUE_SIZE', 100))
+
+# The Redis pub/sub channel, that is used for notifying all running processes
+# about changes of the shared state (e.g. rotated signing keys)
+BROADCAST_CHANNEL_NAME = os.environ.get('APP_BROADCAST_CHANNEL_NAME', 'auth.broadcast')
+
+# Store the resolved permission codenames in the user documents, so that profiles are
+# served by a single query. Run `python manage.py rebuild_effective_permissions` after
+# enabling it.
+USERS_EFFECTIVE_PERMISSIONS = to_bool(os.environ.get('APP_USERS_EFFECTIVE_PERMISSIONS', False))  # NOQA
+
+# Serialized user profiles are cached in Redis for `USER_PROFILE_CACHE_TTL` seconds (set
+# to 0 to disable caching). During the next `USER_PROFILE_CACHE_STALE_TTL` seconds an
+# outdated profile is still returned, while a fresh one is loaded in background.
+USER_PROFILE_CACHE_PREFIX = os.environ.get('APP_USER_PROFILE_CACHE_PREFIX', 'auth.profiles')
+USER_PROFILE_CACHE_TTL = to_int(os.environ.get('APP_USER_PROFILE_CACHE_TTL', 60))
+USER_PROFILE_CACHE_STALE_TTL = to_int(os.environ.get('APP_USER_PROFILE_CACHE_STALE_TTL', 300))
+
+# Settings for the `python manage.py import_users` command. Passwords are hashed by a pool
+# of `USERS_IMPORT_WORKERS` processes and users are inserted by `USERS_IMPORT_CHUNK_SIZE`.
+USERS_IMPORT_CHUNK_SIZE = to_int(os.environ.get('APP_USERS_IMPORT_CHUNK_SIZE', 1000))
+USERS_IMPORT_WORKERS = to_int(os.environ.get('APP_USERS_IMPORT_WORKERS', os.cpu_count() or 4))
+
+# A Bloom filter of all usernames lets the logins for unknown usernames and the availability
+# checks skip MongoDB. It's loaded on start by `USERS_USERNAME_FILTER_BATCH_SIZE` documents.
+USERS_USERNAME_FILTER = to_bool(os.environ.get('APP_USERS_USERNAME_FILTER', True))
+USERS_USERNAME_FILTER_CAPACITY = to_int(os.environ.get('APP_USERS_USERNAME_FILTER_CAPACITY', 1000000))  # NOQA
+USERS_USERNAME_FILTER_ERROR_RATE = to_float(os.environ.get('APP_USERS_USERNAME_FILTER_ERROR_RATE', 0.001))  # NOQA
+USERS_USERNAME_FILTER_BATCH_SIZE = to_int(os.environ.get('APP_USERS_USERNAME_FILTER_BATCH_SIZE', 10000))  # NOQA
+# Every `USERS_USERNAME_FILTER_SYNC_INTERVAL` seconds the usernames of recently inserted users
+# are added to the filter, so that a missed broadcast can't lock out a registered user.
+USERS_USERNAME_FILTER_SYNC_INTERVAL = to_int(os.environ.get('APP_USERS_USERNAME_FILTER_SYNC_INTERVAL', 60))  # NOQA
+# Optionally the filter is built again each `USERS_USERNAME_FILTER_RELOAD_INTERVAL` seconds.
+# Every process scans the whole users collection on each reload, so it's disabled by default.
+USERS_USERNAME_FILTER_RELOAD_INTERVAL = to_int(os.environ.get('APP_USERS_USERNAME_FILTER_RELOAD_INTERVAL', 0))  # NOQA
 
 # Settings for tests
 TEST_MONGODB_USERNAME = os.environ.get("TEST_MONGODB_USERNAME", "root")
@@ -1,7 +1,11 @@
 from sanic_script import Manager
 
 from app import app
+from app.commands.import_users import ImportUsersCommand
+from app.commands.migrate_refresh_tokens import MigrateRefreshTokensCommand
 from app.commands.prepare_mongodb import PrepareMongoDbCommand
+from app.commands.rebuild_effective_permissions import RebuildEffectivePermissionsCommand
+from app.commands.rotate_signing_key import RotateSigningKeyCommand
 from app.commands.run_tests import RunTestsCommand
 from app.commands.run_server import RunServerCommand
 
@@ -10,6 +14,10 @@ manager = Manager(app)
 manager.add_command('run', RunServerCommand)
 manager.add_command('prepare_mongodb', PrepareMongoDbCommand)
 manager.add_command('test', RunTestsCommand)
+manager.add_command('rotate_signing_key', RotateSigningKeyCommand)
+manager.add_command('migrate_refresh_tokens', MigrateRefreshTokensCommand)
+manager.add_command('rebuild_effective_permissions', RebuildEffectivePermissionsCommand)
+manager.add_command('import_users', ImportUsersCommand)
 
 
 if __name__ == '__main__':
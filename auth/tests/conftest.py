@@ -30,6 +30,7 @@ def app_factory():
         "REDIS_ENCODING": sanic_app.config["TEST_REDIS_ENCODING"],
         "REDIS_MIN_SIZE_POOL": sanic_app.config["TEST_REDIS_MIN_SIZE_POOL"],
         "REDIS_MAX_SIZE_POOL": sanic_app.config["TEST_REDIS_MAX_SIZE_POOL"],
+        "JWT_KEYS_ENCRYPTION_KEY": "test-keys-encryption-key",
     })
     yield sanic_app
 
@@ -0,0 +1,19 @@
+from app.bloom import BloomFilter
+
+
+def test_bloom_filter_contains_added_items():
+    bloom_filter = BloomFilter(capacity=1000, error_rate=0.01)
+    for index in range(1000):
+        bloom_filter.add('item-{}'.format(index))
+
+    assert len(bloom_filter) == 1000
+    assert all('item-{}'.format(index) in bloom_filter for index in range(1000))
+
+
+def test_bloom_filter_keeps_false_positive_rate_close_to_error_rate():
+    bloom_filter = BloomFilter(capacity=1000, error_rate=0.01)
+    for index in range(1000):
+        bloom_filter.add('item-{}'.format(index))
+
+    false_positives = sum('missing-{}'.format(index) in bloom_filter for index in range(10000))
+    assert false_positives < 10000 * 0.02
@@ -0,0 +1,99 @@
+import asyncio
+
+from app.broadcast import Broadcaster
+
+
+class FakeChannel(object):
+
+    def __init__(self, messages, is_closed_when_empty=True):
+        self.messages = list(messages)
+        self.is_closed_when_empty = is_closed_when_empty
+
+    async def wait_message(self):
+        await asyncio.sleep(0)
+        while not self.messages and not self.is_closed_when_empty:
+            await asyncio.sleep(0.01)
+        return bool(self.messages)
+
+    async def get_json(self):
+        return self.messages.pop(0)
+
+
+class FakeRedis(object):
+    closed = True
+
+    def __init__(self, channels):
+        self.channels = list(channels)
+        self.subscriptions = 0
+
+    async def subscribe(self, channel_name):
+        self.subscriptions += 1
+        return [self.channels.pop(0), ]
+
+
+class FakeApp(object):
+
+    def __init__(self, redis):
+        self.redis = redis
+
+
+def test_broadcaster_resubscribes_and_resyncs_after_losing_the_subscription():
+    events = []
+    resynced = asyncio.Event()
+
+    async def handle_event(app, data):
+        events.append(data)
+
+    async def resync(app):
+        events.append('resync')
+        resynced.set()
+
+    broadcaster = Broadcaster('auth.broadcast', reconnect_interval=0)
+    broadcaster.register_handler('event', handle_event)
+    broadcaster.register_resync_handler(resync)
+    app = FakeApp(FakeRedis([
+        FakeChannel([{"event": "event", "data": 1}]),
+        FakeChannel([{"event": "event", "data": 2}], is_closed_when_empty=False),
+    ]))
+
+    async def run():
+        await broadcaster.start(app, asyncio.get_event_loop())
+        await asyncio.wait_for(resynced.wait(), timeout=1)
+        await asyncio.sleep(0.01)
+        await broadcaster.stop(app)
+        await asyncio.sleep(0)
+
+    loop = asyncio.new_event_loop()
+    try:
+        loop.run_until_complete(run())
+    finally:
+        loop.close()
+
+    assert events == [1, 'resync', 2]
+    assert app.redis.subscriptions == 2
+    assert broadcaster.reconnects == 1
+
+
+def test_broadcaster_resyncs_periodically():
+    resyncs = []
+
+    async def resync(app):
+        resyncs.append(app)
+
+    broadcaster = Broadcaster('auth.broadcast')
+    broadcaster.register_resync_handler(resync, interval=0.01)
+    app = FakeApp(FakeRedis([FakeChannel([], is_closed_when_empty=False), ]))
+
+    async def run():
+        await broadcaster.start(app, asyncio.get_event_loop())
+        await asyncio.sleep(0.05)
+        await broadcaster.stop(app)
+        await asyncio.sleep(0)
+
+    loop = asyncio.new_event_loop()
+    try:
+        loop.run_until_complete(run())
+    finally:
+        loop.close()
+
+    assert len(resyncs) >= 2
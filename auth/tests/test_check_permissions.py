@@ -0,0 +1,113 @@
+from sage_utils.amqp.clients import RpcAmqpClient
+from sage_utils.constants import TOKEN_ERROR
+from sage_utils.wrappers import Response
+
+from app.groups.documents import Group
+from app.permissions.api.workers.check_permissions import CheckPermissionsWorker
+from app.permissions.api.workers.check_permissions_batch import CheckPermissionsBatchWorker
+from app.permissions.documents import Permission
+from app.permissions.index import load_permission_index
+from app.token.api.workers.generate_token import GenerateTokenWorker
+from app.users.documents import User
+
+
+REQUEST_TOKEN_QUEUE = GenerateTokenWorker.QUEUE_NAME
+REQUEST_TOKEN_EXCHANGE = GenerateTokenWorker.REQUEST_EXCHANGE_NAME
+RESPONSE_TOKEN_EXCHANGE = GenerateTokenWorker.RESPONSE_EXCHANGE_NAME
+
+REQUEST_QUEUE = CheckPermissionsWorker.QUEUE_NAME
+REQUEST_EXCHANGE = CheckPermissionsWorker.REQUEST_EXCHANGE_NAME
+RESPONSE_EXCHANGE = CheckPermissionsWorker.RESPONSE_EXCHANGE_NAME
+
+REQUEST_BATCH_QUEUE = CheckPermissionsBatchWorker.QUEUE_NAME
+REQUEST_BATCH_EXCHANGE = CheckPermissionsBatchWorker.REQUEST_EXCHANGE_NAME
+RESPONSE_BATCH_EXCHANGE = CheckPermissionsBatchWorker.RESPONSE_EXCHANGE_NAME
+
+
+async def create_user_with_permissions():
+    await Group.collection.delete_many({})
+    await Permission.collection.delete_many({})
+    await User.collection.delete_many({})
+    retrieve = Permission(**{"codename": "auth.resource.retrieve", "index": 0})
+    await retrieve.commit()
+    update = Permission(**{"codename": "auth.resource.update", "index": 1})
+    await update.commit()
+    group = Group(**{"name": "Game client", "permissions": [retrieve.id]})
+    await group.commit()
+    user = User(**{"username": "user", "password": "123456", "groups": [group.id]})
+    await user.commit()
+    return user
+
+
+async def get_access_token(app):
+    client = RpcAmqpClient(
+        app,
+        routing_key=REQUEST_TOKEN_QUEUE,
+        request_exchange=REQUEST_TOKEN_EXCHANGE,
+        response_queue='',
+        response_exchange=RESPONSE_TOKEN_EXCHANGE
+    )
+    response = await client.send(payload={"username": "user", "password": "123456"})
+    return response[Response.CONTENT_FIELD_NAME]['access_token']
+
+
+async def test_check_permissions_returns_granted_permissions(sanic_server):
+    await create_user_with_permissions()
+    await load_permission_index(sanic_server.app)
+    access_token = await get_access_token(sanic_server.app)
+
+    client = RpcAmqpClient(
+        sanic_server.app,
+        routing_key=REQUEST_QUEUE,
+        request_exchange=REQUEST_EXCHANGE,
+        response_queue='',
+        response_exchange=RESPONSE_EXCHANGE
+    )
+    response = await client.send(payload={
+        "access_token": access_token,
+        "permissions": ["auth.resource.retrieve", "auth.resource.update"]
+    })
+
+    assert Response.EVENT_FIELD_NAME in response.keys()
+    assert Response.CONTENT_FIELD_NAME in response.keys()
+    assert response[Response.CONTENT_FIELD_NAME] == {
+        "is_allowed": False,
+        "permissions": {
+            "auth.resource.retrieve": True,
+            "auth.resource.update": False,
+        }
+    }
+
+    await User.collection.delete_many({})
+    await Group.collection.delete_many({})
+    await Permission.collection.delete_many({})
+
+
+async def test_check_permissions_batch_returns_result_per_check(sanic_server):
+    await create_user_with_permissions()
+    await load_permission_index(sanic_server.app)
+    access_token = await get_access_token(sanic_server.app)
+
+    client = RpcAmqpClient(
+        sanic_server.app,
+        routing_key=REQUEST_BATCH_QUEUE,
+        request_exchange=REQUEST_BATCH_EXCHANGE,
+        response_queue='',
+        response_exchange=RESPONSE_BATCH_EXCHANGE
+    )
+    response = await client.send(payload={
+        "checks": [
+            {"access_token": access_token, "permissions": ["auth.resource.retrieve"]},
+            {"access_token": access_token[:-1], "permissions": ["auth.resource.retrieve"]},
+        ]
+    })
+
+    assert Response.CONTENT_FIELD_NAME in response.keys()
+    first, second = response[Response.CONTENT_FIELD_NAME]["results"]
+    assert first == {"is_allowed": True, "permissions": {"auth.resource.retrieve": True}}
+    assert second["is_allowed"] is False
+    assert second[Response.ERROR_FIELD_NAME][Response.ERROR_TYPE_FIELD_NAME] == TOKEN_ERROR
+
+    await User.collection.delete_many({})
+    await Group.collection.delete_many({})
+    await Permission.collection.delete_many({})
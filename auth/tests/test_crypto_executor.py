@@ -0,0 +1,75 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.users.security import CryptoExecutor
+
+
+def run_in_new_loop(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+def check_hash_and_verify(executor_type):
+    executor = CryptoExecutor(executor_type, max_workers=2, max_queue_size=2)
+
+    async def run():
+        password_hash = await executor.hash_password('123456')
+        return await asyncio.gather(
+            executor.verify_password('123456', password_hash),
+            executor.verify_password('654321', password_hash),
+        )
+
+    try:
+        results = run_in_new_loop(run())
+    finally:
+        executor.shutdown()
+
+    assert results == [True, False]
+    stats = executor.get_stats()
+    assert stats['executor_type'] == executor_type
+    assert stats['completed'] == 3
+    assert stats['in_flight'] == 0
+    assert stats['queue_depth'] == 0
+
+
+def test_crypto_executor_hashes_and_verifies_passwords_in_threads():
+    check_hash_and_verify('thread')
+
+
+def test_crypto_executor_hashes_and_verifies_passwords_in_processes():
+    check_hash_and_verify('process')
+
+
+def test_crypto_executor_limits_calls_handed_over_to_the_pool():
+    executor = CryptoExecutor('thread', max_workers=1, max_queue_size=1)
+    release = threading.Event()
+
+    async def run():
+        tasks = [asyncio.ensure_future(executor.run(release.wait, 5)) for _ in range(4)]
+        await asyncio.sleep(0.05)
+        stats = executor.get_stats()
+        release.set()
+        results = await asyncio.gather(*tasks)
+        return stats, results
+
+    try:
+        stats, results = run_in_new_loop(run())
+    finally:
+        executor.shutdown()
+
+    # Only the workers and the queue slots are handed over to the pool,
+    # the rest of callers are suspended on the semaphore
+    assert stats['in_flight'] == 2
+    assert stats['queue_depth'] == 3
+    assert results == [True] * 4
+    assert executor.get_stats()['completed'] == 4
+
+
+def test_crypto_executor_rejects_unknown_executor_types():
+    with pytest.raises(ValueError):
+        CryptoExecutor('unknown')
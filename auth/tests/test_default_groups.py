@@ -0,0 +1,34 @@
+from bson.objectid import ObjectId
+
+from app.groups.defaults import DefaultGroups
+
+
+def test_default_groups_ignore_the_case_of_names():
+    group_id = ObjectId()
+    default_groups = DefaultGroups(["Game client", ])
+    default_groups.replace([{'_id': group_id, 'name': 'game Client'}, ])
+
+    assert default_groups.get("Game client") == [group_id, ]
+    assert default_groups.get("GAME CLIENT") == [group_id, ]
+    assert default_groups.get("Unknown") == []
+
+
+def test_default_groups_replace_the_previous_state():
+    first_group_id, second_group_id = ObjectId(), ObjectId()
+    default_groups = DefaultGroups(["Game client", ])
+    default_groups.replace([{'_id': first_group_id, 'name': 'Game client'}, ])
+    default_groups.replace([{'_id': second_group_id, 'name': 'Game client'}, ])
+
+    assert default_groups.get("Game client") == [second_group_id, ]
+    assert default_groups.get_stats() == {"groups": 1, "loads": 2, "misses": 0}
+
+
+def test_default_groups_use_a_single_group_per_name():
+    first_group_id, second_group_id = ObjectId(), ObjectId()
+    default_groups = DefaultGroups(["Game client", ])
+    default_groups.replace([
+        {'_id': first_group_id, 'name': 'Game client'},
+        {'_id': second_group_id, 'name': 'game client'},
+    ])
+
+    assert default_groups.get("Game client") == [first_group_id, ]
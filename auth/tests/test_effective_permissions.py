@@ -0,0 +1,37 @@
+from app.groups.documents import Group
+from app.permissions.documents import Permission
+from app.permissions.index import load_permission_index
+from app.users.documents import User
+from app.users.permissions import update_effective_permissions
+
+
+async def test_update_effective_permissions_stores_codenames_of_groups(sanic_server):
+    await Group.collection.delete_many({})
+    await Permission.collection.delete_many({})
+    await User.collection.delete_many({})
+    retrieve = Permission(**{"codename": "auth.resource.retrieve", "index": 0})
+    await retrieve.commit()
+    update = Permission(**{"codename": "auth.resource.update", "index": 1})
+    await update.commit()
+    group = Group(**{"name": "Game client", "permissions": [retrieve.id, update.id]})
+    await group.commit()
+    user = User(**{"username": "user", "password": "123456", "groups": [group.id]})
+    await user.commit()
+    another_user = User(**{"username": "another_user", "password": "123456"})
+    await another_user.commit()
+
+    await load_permission_index(sanic_server.app)
+    updates = await update_effective_permissions(sanic_server.app)
+    assert updates == 2
+
+    document = await User.collection.find_one({"_id": user.id})
+    assert document["effective_permissions"] == [
+        "auth.resource.retrieve",
+        "auth.resource.update"
+    ]
+    document = await User.collection.find_one({"_id": another_user.id})
+    assert document["effective_permissions"] == []
+
+    await User.collection.delete_many({})
+    await Group.collection.delete_many({})
+    await Permission.collection.delete_many({})
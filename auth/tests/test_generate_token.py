@@ -2,7 +2,11 @@ from sage_utils.amqp.clients import RpcAmqpClient
 from sage_utils.constants import NOT_FOUND_ERROR, VALIDATION_ERROR
 from sage_utils.wrappers import Response
 
+from app.groups.documents import Group
+from app.permissions.documents import Permission
 from app.token.api.workers.generate_token import GenerateTokenWorker
+from app.token.json_web_token import extract_and_decode_token
+from app.token.redis import get_redis_key_by_user, get_refresh_token_from_redis
 from app.users.documents import User
 
 
@@ -40,6 +44,45 @@ async def test_generate_token_returns_a_new_token_pair(sanic_server):
     await User.collection.delete_many({})
 
 
+async def test_generate_token_keeps_refresh_tokens_per_device_with_ttl(sanic_server):
+    await User.collection.delete_many({})
+    user = User(**{"username": "user", "password": "123456"})
+    await user.commit()
+
+    refresh_tokens = {}
+    for device_id in ["desktop", "mobile"]:
+        payload = {
+            "username": "user",
+            "password": "123456",
+            "device_id": device_id
+        }
+        client = RpcAmqpClient(
+            sanic_server.app,
+            routing_key=REQUEST_QUEUE,
+            request_exchange=REQUEST_EXCHANGE,
+            response_queue='',
+            response_exchange=RESPONSE_EXCHANGE
+        )
+        response = await client.send(payload=payload)
+
+        assert Response.CONTENT_FIELD_NAME in response.keys()
+        content = response[Response.CONTENT_FIELD_NAME]
+        refresh_tokens[device_id] = content['refresh_token']
+
+    redis = sanic_server.app.redis
+    key = get_redis_key_by_user(sanic_server.app, user.username)
+    for device_id, refresh_token in refresh_tokens.items():
+        assert await get_refresh_token_from_redis(
+            sanic_server.app.redis_storage, key, device_id
+        ) == refresh_token
+
+    ttl = await redis.ttl(key)
+    assert 0 < ttl <= sanic_server.app.config['JWT_REFRESH_TOKEN_LIFETIME']
+
+    await redis.delete(key)
+    await User.collection.delete_many({})
+
+
 async def test_generate_token_returns_error_for_an_invalid_username(sanic_server):
     await User.collection.delete_many({})
     await User(**{"username": "user", "password": "123456"}).commit()
@@ -133,3 +176,42 @@ async def test_generate_token_returns_validation_error_for_empty_body(sanic_serv
     assert len(error[Response.ERROR_DETAILS_FIELD_NAME]['password']) == 1
     assert error[Response.ERROR_DETAILS_FIELD_NAME]['password'][0] == 'Missing data for ' \
                                                                       'required field.'
+
+
+async def test_generate_token_embeds_permissions_into_access_token(sanic_server):
+    await Group.collection.delete_many({})
+    await Permission.collection.delete_many({})
+    await User.collection.delete_many({})
+    permission = Permission(**{"codename": "auth.resource.retrieve", "description": "get data"})
+    await permission.commit()
+    group = Group(**{"name": "Game client", "permissions": [permission.id]})
+    await group.commit()
+    user = User(**{"username": "user", "password": "123456", "groups": [group.id]})
+    await user.commit()
+
+    sanic_server.app.config['JWT_EMBED_PERMISSIONS'] = True
+    payload = {
+        "username": "user",
+        "password": "123456"
+    }
+    client = RpcAmqpClient(
+        sanic_server.app,
+        routing_key=REQUEST_QUEUE,
+        request_exchange=REQUEST_EXCHANGE,
+        response_queue='',
+        response_exchange=RESPONSE_EXCHANGE
+    )
+    response = await client.send(payload=payload)
+    sanic_server.app.config['JWT_EMBED_PERMISSIONS'] = False
+
+    assert Response.CONTENT_FIELD_NAME in response.keys()
+    content = response[Response.CONTENT_FIELD_NAME]
+    claims = extract_and_decode_token(sanic_server.app, content)
+
+    assert claims['user_id'] == str(user.id)
+    assert claims['groups'] == [str(group.id), ]
+    assert claims['permissions'] == ["auth.resource.retrieve", ]
+
+    await User.collection.delete_many({})
+    await Group.collection.delete_many({})
+    await Permission.collection.delete_many({})
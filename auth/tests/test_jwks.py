@@ -0,0 +1,97 @@
+from time import time
+
+import pytest
+from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.primitives.asymmetric import ec, rsa
+from cryptography.hazmat.primitives.serialization import Encoding, NoEncryption, \
+    PrivateFormat
+from jwt import decode
+
+from app.token.documents import JsonWebKey
+from app.token.json_web_token import decode_token, generate_access_token
+from app.token.keys import KeySet, SigningKey, int_to_base64url
+from app.token.rotation import reload_key_set
+
+from conftest import sanic_server  # NOQA
+
+
+@pytest.fixture
+def rsa_private_key(tmpdir):
+    private_key = rsa.generate_private_key(65537, 2048, default_backend())
+    pem = private_key.private_bytes(Encoding.PEM, PrivateFormat.PKCS8, NoEncryption())
+    tmpdir.join('rs256-key.pem').write_binary(pem)
+    return private_key
+
+
+@pytest.fixture
+def rs256_server(loop, sanic_server, rsa_private_key, tmpdir):
+    app = sanic_server.app
+    loop.run_until_complete(JsonWebKey.collection.delete_many({}))
+
+    previous_config = {
+        key: app.config[key] for key in ("JWT_ALGORITHM", "JWT_KEYS_DIRECTORY", "JWT_KEY_ID")
+    }
+    app.config.update({
+        "JWT_ALGORITHM": "RS256",
+        "JWT_KEYS_DIRECTORY": str(tmpdir),
+        "JWT_KEY_ID": None,
+    })
+    loop.run_until_complete(reload_key_set(app))
+    yield sanic_server
+
+    app.config.update(previous_config)
+    loop.run_until_complete(reload_key_set(app))
+
+
+async def test_jwks_returns_public_keys_with_caching_headers(rs256_server, rsa_private_key):
+    url = rs256_server.app.url_for('jwks')
+    response = await rs256_server.get(url)
+    response_body = await response.json()
+    assert response.status == 200
+
+    public_numbers = rsa_private_key.public_key().public_numbers()
+    assert response_body == {'keys': [
+        {
+            'kid': 'rs256-key',
+            'kty': 'RSA',
+            'alg': 'RS256',
+            'use': 'sig',
+            'n': int_to_base64url(public_numbers.n),
+            'e': int_to_base64url(public_numbers.e),
+        },
+    ]}
+    for private_field in ('d', 'p', 'q', 'dp', 'dq', 'qi', 'k'):
+        assert private_field not in response_body['keys'][0].keys()
+
+    assert 'ETag' in response.headers.keys()
+    assert response.headers['Cache-Control'] == 'public, max-age={}'.format(
+        rs256_server.app.config['JWKS_MAX_AGE']
+    )
+
+
+async def test_jwks_returns_not_modified_for_a_matched_etag(sanic_server):
+    url = sanic_server.app.url_for('jwks')
+    response = await sanic_server.get(url)
+    assert response.status == 200
+    etag = response.headers['ETag']
+
+    response = await sanic_server.get(url, headers={'If-None-Match': etag})
+    assert response.status == 304
+    assert response.headers['ETag'] == etag
+
+
+def test_asymmetric_key_set_signs_and_verifies_tokens():
+    private_key = ec.generate_private_key(ec.SECP256R1(), default_backend())
+    signing_key = SigningKey('es256-key', 'ES256', private_key)
+    key_set = KeySet([signing_key, ], 'es256-key')
+
+    payload = {'user_id': 'user', 'exp': int(time()) + 60}
+    token = generate_access_token(payload, signing_key)
+    assert decode_token(token, key_set)['user_id'] == 'user'
+
+    jwks = key_set.to_jwks()
+    assert len(jwks['keys']) == 1
+    assert jwks['keys'][0]['kid'] == 'es256-key'
+    assert jwks['keys'][0]['alg'] == 'ES256'
+    assert jwks['keys'][0]['kty'] == 'EC'
+    assert decode(token, signing_key.verifying_key, algorithms=['ES256', ])['user_id'] == 'user'
@@ -0,0 +1,48 @@
+import asyncio
+
+from app.loaders import BatchLoader
+
+
+def test_batch_loader_combines_concurrent_loads_into_one_batch():
+    batches = []
+
+    async def batch_load(keys):
+        batches.append(keys)
+        return {key: key * 2 for key in keys if key != 3}
+
+    loader = BatchLoader(batch_load)
+
+    async def run():
+        return await asyncio.gather(*[loader.load(key) for key in [1, 2, 2, 3]])
+
+    loop = asyncio.new_event_loop()
+    try:
+        results = loop.run_until_complete(run())
+    finally:
+        loop.close()
+
+    assert results == [2, 4, 4, None]
+    assert batches == [[1, 2, 3], ]
+    assert loader.get_stats() == {"loads": 4, "batches": 1, "average_batch_size": 4.0}
+
+
+def test_batch_loader_splits_batches_by_max_size():
+    batches = []
+
+    async def batch_load(keys):
+        batches.append(keys)
+        return {key: key for key in keys}
+
+    loader = BatchLoader(batch_load, max_batch_size=2)
+
+    async def run():
+        return await asyncio.gather(*[loader.load(key) for key in range(5)])
+
+    loop = asyncio.new_event_loop()
+    try:
+        results = loop.run_until_complete(run())
+    finally:
+        loop.close()
+
+    assert results == [0, 1, 2, 3, 4]
+    assert batches == [[0, 1], [2, 3], [4, ]]
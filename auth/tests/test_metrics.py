@@ -0,0 +1,15 @@
+from conftest import sanic_server  # NOQA
+
+
+async def test_metrics_returns_crypto_executor_stats(sanic_server):
+    url = sanic_server.app.url_for('metrics')
+    response = await sanic_server.get(url)
+    response_body = await response.json()
+    assert response.status == 200
+
+    assert 'crypto_executor' in response_body.keys()
+    stats = response_body['crypto_executor']
+    assert stats['executor_type'] == sanic_server.app.config['CRYPTO_EXECUTOR_TYPE']
+    assert stats['max_workers'] == sanic_server.app.config['CRYPTO_EXECUTOR_WORKERS']
+    assert stats['queue_depth'] == 0
+    assert stats['in_flight'] == 0
@@ -0,0 +1,53 @@
+from bson.objectid import ObjectId
+
+from app.permissions.index import PermissionIndex
+
+
+def test_permission_index_checks_permissions_of_groups():
+    retrieve_id, update_id, delete_id = ObjectId(), ObjectId(), ObjectId()
+    first_group_id, second_group_id = ObjectId(), ObjectId()
+    permissions = [
+        {'_id': retrieve_id, 'codename': 'auth.resource.retrieve', 'index': 0},
+        {'_id': update_id, 'codename': 'auth.resource.update', 'index': 1},
+        {'_id': delete_id, 'codename': 'auth.resource.delete', 'index': 2},
+    ]
+    groups = [
+        {'_id': first_group_id, 'permissions': [retrieve_id, ]},
+        {'_id': second_group_id, 'permissions': [update_id, ]},
+    ]
+    index = PermissionIndex()
+    index.replace(permissions, groups)
+
+    result = index.check_permissions(
+        [str(first_group_id), str(second_group_id)],
+        ['auth.resource.retrieve', 'auth.resource.update', 'auth.resource.delete', 'unknown']
+    )
+    assert result == {
+        'auth.resource.retrieve': True,
+        'auth.resource.update': True,
+        'auth.resource.delete': False,
+        'unknown': False,
+    }
+    assert index.check_permissions([], ['auth.resource.retrieve']) == {
+        'auth.resource.retrieve': False
+    }
+    assert index.get_stats() == {"permissions": 3, "groups": 2, "loads": 1, "updates": 0}
+
+
+def test_permission_index_applies_incremental_updates():
+    retrieve_id, update_id, group_id = ObjectId(), ObjectId(), ObjectId()
+    index = PermissionIndex()
+    index.replace(
+        [{'_id': retrieve_id, 'codename': 'auth.resource.retrieve', 'index': 0}, ],
+        [{'_id': group_id, 'permissions': [retrieve_id, ]}, ]
+    )
+    assert index.get_codenames([group_id]) == ['auth.resource.retrieve', ]
+
+    index.update_permissions([{'_id': update_id, 'codename': 'auth.resource.update', 'index': 1}])
+    index.update_groups([{'_id': group_id, 'permissions': [retrieve_id, update_id]}])
+    assert index.get_codenames([group_id]) == ['auth.resource.retrieve', 'auth.resource.update']
+    assert index.get_group_ids_with_permissions([update_id]) == [str(group_id), ]
+
+    index.update_groups([{'_id': group_id, 'permissions': [update_id, ]}])
+    assert index.get_codenames([group_id]) == ['auth.resource.update', ]
+    assert index.get_group_ids_with_permissions([retrieve_id]) == []
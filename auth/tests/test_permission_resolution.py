@@ -0,0 +1,36 @@
+from app.groups.documents import Group
+from app.permissions.documents import Permission
+from app.permissions.resolution import collect_user_permissions, \
+    explain_user_permissions, get_used_indexes
+from app.users.documents import User
+
+
+async def test_collect_user_permissions_uses_indexes(sanic_server):
+    await Group.collection.delete_many({})
+    await Permission.collection.delete_many({})
+    await User.collection.delete_many({})
+    retrieve = Permission(**{"codename": "auth.resource.retrieve", "index": 0})
+    await retrieve.commit()
+    update = Permission(**{"codename": "auth.resource.update", "index": 1})
+    await update.commit()
+    first_group = Group(**{"name": "Game client", "permissions": [retrieve.id, update.id]})
+    await first_group.commit()
+    second_group = Group(**{"name": "Moderator", "permissions": [update.id]})
+    await second_group.commit()
+    user = User(**{
+        "username": "user",
+        "password": "123456",
+        "groups": [first_group.id, second_group.id]
+    })
+    await user.commit()
+
+    permissions = await collect_user_permissions(user)
+    assert permissions == ["auth.resource.retrieve", "auth.resource.update"]
+
+    plan = await explain_user_permissions(user.pk)
+    assert '_id_' in get_used_indexes(plan)
+    assert 'COLLSCAN' not in str(plan)
+
+    await User.collection.delete_many({})
+    await Group.collection.delete_many({})
+    await Permission.collection.delete_many({})
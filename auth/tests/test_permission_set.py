@@ -0,0 +1,23 @@
+from app.permissions.bitset import PermissionSet
+
+
+def test_permission_set_supports_membership_and_union():
+    first = PermissionSet.from_indexes([0, 5, 70])
+    second = PermissionSet.from_indexes([5, 1000])
+
+    assert 5 in first
+    assert 6 not in first
+    assert list(first | second) == [0, 5, 70, 1000]
+    assert list(first & second) == [5, ]
+    assert len(first | second) == 4
+    assert (first | second).issuperset(first)
+    assert not first.issuperset(second)
+
+
+def test_permission_set_is_encoded_to_base64():
+    permission_set = PermissionSet.from_indexes([1, 2, 3, 500])
+    encoded = permission_set.to_base64()
+
+    assert '=' not in encoded
+    assert PermissionSet.from_base64(encoded) == permission_set
+    assert PermissionSet.from_base64(PermissionSet().to_base64()) == PermissionSet()
@@ -62,7 +62,53 @@ async def test_refresh_token_returns_new_access_token(sanic_server):
     content = response[Response.CONTENT_FIELD_NAME]
 
     assert 'access_token' in content.keys()
-    assert 'refresh_token' not in content.keys()
+    assert 'refresh_token' in content.keys()
+    assert content['refresh_token'] != tokens['refresh_token']
+
+    await User.collection.delete_one({'id': user.id})
+
+
+async def test_refresh_token_rejects_already_rotated_refresh_token(sanic_server):
+    await User.collection.delete_many({})
+    user = User(**{"username": "user", "password": "123456"})
+    await user.commit()
+
+    payload = {
+        "username": "user",
+        "password": "123456"
+    }
+    client = RpcAmqpClient(
+        sanic_server.app,
+        routing_key=REQUEST_TOKEN_QUEUE,
+        request_exchange=REQUEST_TOKEN_EXCHANGE,
+        response_queue='',
+        response_exchange=RESPONSE_TOKEN_EXCHANGE
+    )
+    response = await client.send(payload=payload)
+    tokens = response[Response.CONTENT_FIELD_NAME]
+
+    refresh_payload = {
+        sanic_server.app.config['JWT_ACCESS_TOKEN_FIELD_NAME']: tokens['access_token'],
+        sanic_server.app.config['JWT_REFRESH_TOKEN_FIELD_NAME']: tokens['refresh_token'],
+    }
+    client = RpcAmqpClient(
+        sanic_server.app,
+        routing_key=REQUEST_QUEUE,
+        request_exchange=REQUEST_EXCHANGE,
+        response_queue='',
+        response_exchange=RESPONSE_EXCHANGE
+    )
+    response = await client.send(payload=refresh_payload)
+    assert Response.CONTENT_FIELD_NAME in response.keys()
+
+    response = await client.send(payload=refresh_payload)
+
+    assert Response.ERROR_FIELD_NAME in response.keys()
+    assert Response.CONTENT_FIELD_NAME not in response.keys()
+    errors = response[Response.ERROR_FIELD_NAME]
+
+    assert errors[Response.ERROR_TYPE_FIELD_NAME] == TOKEN_ERROR
+    assert errors[Response.ERROR_DETAILS_FIELD_NAME] == "Specified an invalid `refresh_token`."
 
     await User.collection.delete_one({'id': user.id})
 
@@ -44,6 +44,7 @@ async def test_users_post_successfully_creates_a_new_user(sanic_server):
 
 async def test_users_post_returns_validation_error_for_non_unique_username(sanic_server):
     await User.collection.delete_many({})
+    await User.ensure_indexes()
     await User(**{"username": "new_user", "password": "123456"}).commit()
 
     payload = {
@@ -147,6 +147,39 @@ async def test_register_microservice_creates_new_microservice_with_permissions(s
     await Microservice.collection.delete_many({})
 
 
+async def test_register_microservice_ignores_permission_indexes(sanic_server):
+    await Permission.collection.delete_many({})
+    await Microservice.collection.delete_many({})
+
+    create_data = {
+        'name': 'auth',
+        'version': '1.0.0',
+        'permissions': [
+            {'codename': 'auth.test.permissions-one', 'index': 999},
+            {'codename': 'auth.test.permissions-two', 'index': None},
+        ]
+    }
+    client = AmqpTestClient(
+        sanic_server.server.app,
+        routing_key=REQUEST_QUEUE,
+        request_exchange=REQUEST_EXCHANGE,
+        response_queue='',
+        response_exchange=RESPONSE_EXCHANGE
+    )
+    response = await client.send(payload=create_data)
+
+    assert response[Response.CONTENT_FIELD_NAME] == "OK"
+    permissions = await Permission.collection.find({}).to_list(None)
+    indexes = [permission['index'] for permission in permissions]
+    assert len(indexes) == 2
+    assert None not in indexes
+    assert 999 not in indexes
+    assert len(set(indexes)) == 2
+
+    await Permission.collection.delete_many({})
+    await Microservice.collection.delete_many({})
+
+
 async def test_register_microservice_returns_validation_error_for_invalid_permissions(sanic_server):  # NOQA
     create_data = {
         'name': 'auth',
@@ -0,0 +1,27 @@
+from time import time
+
+from app.token.revocation import RevocationList
+
+
+def test_revocation_list_keeps_tokens_revoked_while_loading():
+    expires_at = int(time()) + 60
+    revocation_list = RevocationList('auth.revoked_tokens', capacity=100)
+    revocation_list.start_loading()
+    revocation_list.add('revoked-while-loading', expires_at)
+    revocation_list.replace([('loaded', expires_at), ])
+
+    assert revocation_list.revoked == {
+        'loaded': expires_at,
+        'revoked-while-loading': expires_at,
+    }
+    assert 'revoked-while-loading' in revocation_list.bloom_filter
+    assert revocation_list.added_while_loading is None
+
+
+def test_revocation_list_replaces_entries_outside_of_loading():
+    expires_at = int(time()) + 60
+    revocation_list = RevocationList('auth.revoked_tokens', capacity=100)
+    revocation_list.add('outdated', expires_at)
+    revocation_list.replace([('loaded', expires_at), ])
+
+    assert revocation_list.revoked == {'loaded': expires_at}
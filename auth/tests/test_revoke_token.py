@@ -0,0 +1,76 @@
+from sage_utils.amqp.clients import RpcAmqpClient
+from sage_utils.constants import TOKEN_ERROR
+from sage_utils.wrappers import Response
+
+from app.token.api.workers.generate_token import GenerateTokenWorker
+from app.token.api.workers.revoke_token import RevokeTokenWorker
+from app.token.api.workers.verify_token import VerifyTokenWorker
+from app.users.documents import User
+
+
+REQUEST_TOKEN_QUEUE = GenerateTokenWorker.QUEUE_NAME
+REQUEST_TOKEN_EXCHANGE = GenerateTokenWorker.REQUEST_EXCHANGE_NAME
+RESPONSE_TOKEN_EXCHANGE = GenerateTokenWorker.RESPONSE_EXCHANGE_NAME
+
+REQUEST_VERIFY_QUEUE = VerifyTokenWorker.QUEUE_NAME
+REQUEST_VERIFY_EXCHANGE = VerifyTokenWorker.REQUEST_EXCHANGE_NAME
+RESPONSE_VERIFY_EXCHANGE = VerifyTokenWorker.RESPONSE_EXCHANGE_NAME
+
+REQUEST_QUEUE = RevokeTokenWorker.QUEUE_NAME
+REQUEST_EXCHANGE = RevokeTokenWorker.REQUEST_EXCHANGE_NAME
+RESPONSE_EXCHANGE = RevokeTokenWorker.RESPONSE_EXCHANGE_NAME
+
+
+async def test_revoke_token_makes_access_token_invalid(sanic_server):
+    await User.collection.delete_many({})
+    user = User(**{"username": "user", "password": "123456"})
+    await user.commit()
+
+    payload = {
+        "username": "user",
+        "password": "123456"
+    }
+    client = RpcAmqpClient(
+        sanic_server.app,
+        routing_key=REQUEST_TOKEN_QUEUE,
+        request_exchange=REQUEST_TOKEN_EXCHANGE,
+        response_queue='',
+        response_exchange=RESPONSE_TOKEN_EXCHANGE
+    )
+    response = await client.send(payload=payload)
+    tokens = response[Response.CONTENT_FIELD_NAME]
+
+    token_payload = {
+        sanic_server.app.config['JWT_ACCESS_TOKEN_FIELD_NAME']: tokens['access_token']
+    }
+    client = RpcAmqpClient(
+        sanic_server.app,
+        routing_key=REQUEST_QUEUE,
+        request_exchange=REQUEST_EXCHANGE,
+        response_queue='',
+        response_exchange=RESPONSE_EXCHANGE
+    )
+    response = await client.send(payload=token_payload)
+
+    assert Response.EVENT_FIELD_NAME in response.keys()
+    assert Response.CONTENT_FIELD_NAME in response.keys()
+    assert response[Response.CONTENT_FIELD_NAME] == {"is_revoked": True}
+
+    client = RpcAmqpClient(
+        sanic_server.app,
+        routing_key=REQUEST_VERIFY_QUEUE,
+        request_exchange=REQUEST_VERIFY_EXCHANGE,
+        response_queue='',
+        response_exchange=RESPONSE_VERIFY_EXCHANGE
+    )
+    response = await client.send(payload=token_payload)
+
+    assert Response.ERROR_FIELD_NAME in response.keys()
+    assert Response.CONTENT_FIELD_NAME not in response.keys()
+    errors = response[Response.ERROR_FIELD_NAME]
+
+    assert errors[Response.ERROR_TYPE_FIELD_NAME] == TOKEN_ERROR
+    assert errors[Response.ERROR_DETAILS_FIELD_NAME] == 'Token has been revoked.'
+
+    await sanic_server.app.redis.delete(sanic_server.app.config['JWT_REVOCATION_LIST_KEY'])
+    await User.collection.delete_one({'id': user.id})
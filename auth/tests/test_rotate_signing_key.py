@@ -0,0 +1,126 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from jwt import get_unverified_header
+from jwt.exceptions import InvalidTokenError
+
+from app.token.documents import JsonWebKey
+from app.token.json_web_token import build_payload, decode_token, generate_access_token
+from app.token.keys import KeySet, decrypt_key_data, encrypt_key_data
+from app.token.rotation import generate_key_data, reload_key_set, rotate_signing_key
+
+
+async def test_rotate_signing_key_publishes_the_new_key_before_activating_it(sanic_server):
+    app = sanic_server.app
+    await JsonWebKey.collection.delete_many({})
+    await reload_key_set(app)
+
+    payload = build_payload(app, extra_data={"user_id": "user"})
+    old_kid = app.jwt_key_set.active_key.kid
+    old_token = generate_access_token(payload, app.jwt_key_set.active_key)
+
+    kid, activates_at = await rotate_signing_key(app, app.redis, 'ES256')
+    await asyncio.sleep(0.5)
+
+    assert activates_at - datetime.utcnow() > timedelta(seconds=app.config["JWKS_MAX_AGE"] - 5)
+    assert app.jwt_key_set.active_key.kid == old_kid
+    assert kid in [key['kid'] for key in app.jwt_key_set.to_jwks()['keys']]
+
+    record = await JsonWebKey.collection.find_one({"kid": kid})
+    assert 'PRIVATE KEY' not in record['key']
+
+    # Simulates the end of the JWKS caching period
+    now = datetime.utcnow()
+    await JsonWebKey.collection.update_one({"kid": old_kid}, {"$set": {"retired_at": now}})
+    await JsonWebKey.collection.update_one({"kid": kid}, {"$set": {"activates_at": now}})
+    await reload_key_set(app)
+
+    assert app.jwt_key_set.active_key.kid == kid
+    assert app.jwt_key_set.active_key.algorithm == 'ES256'
+
+    new_token = generate_access_token(payload, app.jwt_key_set.active_key)
+    assert get_unverified_header(new_token)['kid'] == kid
+    assert decode_token(new_token, app.jwt_key_set)['user_id'] == 'user'
+    assert decode_token(old_token, app.jwt_key_set)['user_id'] == 'user'
+
+    await JsonWebKey.collection.delete_many({})
+    await reload_key_set(app)
+
+
+def test_key_set_drops_retired_keys_after_the_token_lifetime(app_factory):
+    config = app_factory.config
+    secret = config["JWT_KEYS_ENCRYPTION_KEY"]
+    now = datetime.utcnow()
+    records = [
+        {
+            "kid": "retired-key",
+            "algorithm": "HS256",
+            "key": encrypt_key_data(generate_key_data("HS256"), secret),
+            "created_at": now - timedelta(days=2),
+            "retired_at": now - timedelta(days=1),
+        },
+        {
+            "kid": "active-key",
+            "algorithm": "HS256",
+            "key": encrypt_key_data(generate_key_data("HS256"), secret),
+            "created_at": now - timedelta(days=1),
+            "retired_at": None,
+        },
+    ]
+    key_set = KeySet.from_config(config, records)
+
+    assert key_set.active_key.kid == "active-key"
+    assert "retired-key" not in key_set.keys.keys()
+
+    records[0]["retired_at"] = now
+    key_set = KeySet.from_config(config, records)
+    retired_key = key_set.keys["retired-key"]
+    token = generate_access_token({"user_id": "user"}, retired_key)
+    assert decode_token(token, key_set)["user_id"] == "user"
+
+    retired_key.expires_at = 0
+    with pytest.raises(InvalidTokenError):
+        decode_token(token, key_set)
+
+
+def test_key_set_promotes_the_pending_key_at_the_activation_time(app_factory):
+    config = app_factory.config
+    secret = config["JWT_KEYS_ENCRYPTION_KEY"]
+    now = datetime.utcnow()
+    activates_at = now + timedelta(seconds=config["JWKS_MAX_AGE"])
+    records = [
+        {
+            "kid": "active-key",
+            "algorithm": "ES256",
+            "key": encrypt_key_data(generate_key_data("ES256"), secret),
+            "created_at": now - timedelta(days=1),
+            "retired_at": activates_at,
+        },
+        {
+            "kid": "next-key",
+            "algorithm": "ES256",
+            "key": encrypt_key_data(generate_key_data("ES256"), secret),
+            "created_at": now,
+            "activates_at": activates_at,
+            "retired_at": None,
+        },
+    ]
+    key_set = KeySet.from_config(config, records)
+
+    assert key_set.active_key.kid == "active-key"
+    assert "next-key" in [key['kid'] for key in key_set.to_jwks()['keys']]
+
+    key_set.pending_keys = [(0, "next-key"), ]
+    assert key_set.active_key.kid == "next-key"
+    assert key_set.pending_keys == []
+
+
+def test_stored_key_data_is_encrypted():
+    key_data = generate_key_data("EdDSA")
+    encrypted_data = encrypt_key_data(key_data, "secret")
+
+    assert "PRIVATE KEY" not in encrypted_data
+    assert decrypt_key_data(encrypted_data, "secret") == key_data
+    with pytest.raises(ValueError):
+        decrypt_key_data(encrypted_data, "another-secret")
@@ -0,0 +1,82 @@
+import asyncio
+
+from app.singleflight import SingleFlight
+
+
+def test_single_flight_coalesces_concurrent_calls():
+    single_flight = SingleFlight()
+    calls = []
+
+    async def load(user_id):
+        calls.append(user_id)
+        await asyncio.sleep(0.01)
+        return {"id": user_id}
+
+    async def run():
+        return await asyncio.gather(
+            *[single_flight.do(('users.retrieve', 'user'), load, 'user') for _ in range(10)],
+            single_flight.do(('users.retrieve', 'another'), load, 'another')
+        )
+
+    loop = asyncio.new_event_loop()
+    try:
+        results = loop.run_until_complete(run())
+    finally:
+        loop.close()
+
+    assert results == [{"id": 'user'}] * 10 + [{"id": 'another'}]
+    assert calls == ['user', 'another']
+    assert single_flight.get_stats() == {"calls": 2, "coalesced": 9, "in_flight": 0}
+
+
+def test_single_flight_propagates_exceptions_to_all_callers():
+    single_flight = SingleFlight()
+
+    async def load():
+        await asyncio.sleep(0.01)
+        raise ValueError('Lookup failed.')
+
+    async def run():
+        return await asyncio.gather(
+            *[single_flight.do('key', load) for _ in range(3)],
+            return_exceptions=True
+        )
+
+    loop = asyncio.new_event_loop()
+    try:
+        results = loop.run_until_complete(run())
+    finally:
+        loop.close()
+
+    assert all(isinstance(result, ValueError) for result in results)
+    assert single_flight.get_stats() == {"calls": 1, "coalesced": 2, "in_flight": 0}
+
+
+def test_single_flight_keeps_serving_callers_when_a_follower_is_cancelled():
+    single_flight = SingleFlight()
+
+    async def load():
+        await asyncio.sleep(0.02)
+        return 'result'
+
+    async def run():
+        leader = asyncio.ensure_future(single_flight.do('key', load))
+        await asyncio.sleep(0)
+        cancelled_follower = asyncio.ensure_future(single_flight.do('key', load))
+        follower = asyncio.ensure_future(single_flight.do('key', load))
+        await asyncio.sleep(0.01)
+        cancelled_follower.cancel()
+        return await asyncio.gather(
+            leader, cancelled_follower, follower, return_exceptions=True
+        )
+
+    loop = asyncio.new_event_loop()
+    try:
+        results = loop.run_until_complete(run())
+    finally:
+        loop.close()
+
+    assert results[0] == 'result'
+    assert isinstance(results[1], asyncio.CancelledError)
+    assert results[2] == 'result'
+    assert single_flight.get_stats() == {"calls": 1, "coalesced": 2, "in_flight": 0}
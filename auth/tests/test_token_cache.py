@@ -0,0 +1,49 @@
+from time import time
+
+from freezegun import freeze_time
+
+from app.token.cache import VerifiedTokenCache
+
+
+def test_verified_token_cache_returns_cached_claims():
+    cache = VerifiedTokenCache(max_size=10)
+    claims = {'user_id': 'user', 'exp': int(time()) + 60}
+    cache.set('token', claims)
+
+    assert cache.get('token') == claims
+    assert cache.get('another-token') is None
+    assert cache.get_stats()['hits'] == 1
+    assert cache.get_stats()['misses'] == 1
+
+
+def test_verified_token_cache_expires_entries_with_token():
+    cache = VerifiedTokenCache(max_size=10)
+    with freeze_time("2000-01-01 00:00:00"):
+        claims = {'user_id': 'user', 'exp': int(time()) + 60}
+        cache.set('token', claims)
+        assert cache.get('token') == claims
+
+    with freeze_time("2000-01-01 00:01:00"):
+        assert cache.get('token') is None
+
+    assert cache.get_stats()['size'] == 0
+
+
+def test_verified_token_cache_evicts_least_recently_used_entries():
+    cache = VerifiedTokenCache(max_size=2)
+    exp = int(time()) + 60
+    cache.set('first', {'exp': exp})
+    cache.set('second', {'exp': exp})
+    assert cache.get('first') is not None
+
+    cache.set('third', {'exp': exp})
+    assert cache.get('second') is None
+    assert cache.get('first') is not None
+    assert cache.get('third') is not None
+    assert cache.get_stats()['evictions'] == 1
+
+
+def test_verified_token_cache_skips_tokens_without_expiration():
+    cache = VerifiedTokenCache(max_size=2)
+    cache.set('token', {'user_id': 'user'})
+    assert cache.get('token') is None
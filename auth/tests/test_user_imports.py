@@ -0,0 +1,71 @@
+import io
+
+import pytest
+from marshmallow import ValidationError
+
+from app.users.imports import chunked, clean_user_row, get_file_format, read_user_rows
+from app.users.security import hash_password, is_password_hash, verify_password
+
+
+def test_read_user_rows_from_jsonl():
+    stream = io.StringIO(
+        '{"username": "user", "password": "123456"}\n'
+        '\n'
+        'not a json\n'
+    )
+    rows = list(read_user_rows(stream, 'jsonl'))
+
+    assert rows == [(1, {"username": "user", "password": "123456"}), (3, None)]
+
+
+def test_read_user_rows_from_csv():
+    stream = io.StringIO('username,password\nuser,123456\n')
+    rows = list(read_user_rows(stream, 'csv'))
+
+    assert rows == [(2, {"username": "user", "password": "123456"})]
+
+
+def test_get_file_format_by_extension():
+    assert get_file_format('users.jsonl') == 'jsonl'
+    assert get_file_format('users.CSV') == 'csv'
+    assert get_file_format('users.txt', 'csv') == 'csv'
+
+
+def test_clean_user_row_validates_rows_like_the_registration():
+    assert clean_user_row({"username": "user", "password": "123456"}) == ("user", "123456")
+    assert clean_user_row({"username": " user ", "password": "123456"}) == (" user ", "123456")
+
+    with pytest.raises(ValidationError) as exc:
+        clean_user_row({"username": "user"})
+    assert 'password' in exc.value.normalized_messages().keys()
+
+    with pytest.raises(ValidationError) as exc:
+        clean_user_row({"username": "", "password": "123456"})
+    assert 'username' in exc.value.normalized_messages().keys()
+
+    with pytest.raises(ValidationError):
+        clean_user_row({"username": 123, "password": "123456"})
+
+    with pytest.raises(ValidationError):
+        clean_user_row(None)
+
+
+def test_chunked_splits_rows():
+    assert list(chunked(range(5), 2)) == [[0, 1], [2, 3], [4, ]]
+
+
+def test_clean_user_row_accepts_only_well_formed_password_hashes():
+    password_hash = hash_password('123456')
+
+    assert is_password_hash(password_hash)
+    assert not is_password_hash('$2b$12$short')
+    assert not is_password_hash('123456')
+    assert clean_user_row({"username": "user", "password": password_hash}) == \
+        ("user", password_hash)
+    with pytest.raises(ValidationError) as exc:
+        clean_user_row({"username": "user", "password": "$2b$12$short"})
+    assert 'password' in exc.value.normalized_messages().keys()
+
+
+def test_verify_password_rejects_malformed_hashes():
+    assert verify_password('123456', '$2b$12$short') is False
@@ -0,0 +1,118 @@
+from bson.objectid import ObjectId
+from sage_utils.amqp.clients import RpcAmqpClient
+from sage_utils.constants import TOKEN_ERROR, VALIDATION_ERROR
+from sage_utils.wrappers import Response
+
+from app.token.api.workers.generate_token import GenerateTokenWorker
+from app.token.json_web_token import build_payload, generate_access_token
+from app.users.documents import User
+from app.users.api.workers.user_profile_batch import UserProfileBatchWorker
+
+
+REQUEST_TOKEN_QUEUE = GenerateTokenWorker.QUEUE_NAME
+REQUEST_TOKEN_EXCHANGE = GenerateTokenWorker.REQUEST_EXCHANGE_NAME
+RESPONSE_TOKEN_EXCHANGE = GenerateTokenWorker.RESPONSE_EXCHANGE_NAME
+
+REQUEST_QUEUE = UserProfileBatchWorker.QUEUE_NAME
+REQUEST_EXCHANGE = UserProfileBatchWorker.REQUEST_EXCHANGE_NAME
+RESPONSE_EXCHANGE = UserProfileBatchWorker.RESPONSE_EXCHANGE_NAME
+
+
+async def test_user_profile_batch_returns_profiles_by_user_id(sanic_server):
+    await User.collection.delete_many({})
+    first_user = User(**{"username": "first_user", "password": "123456"})
+    await first_user.commit()
+    second_user = User(**{"username": "second_user", "password": "123456"})
+    await second_user.commit()
+    missing_user_id = str(ObjectId())
+
+    client = RpcAmqpClient(
+        sanic_server.app,
+        routing_key=REQUEST_TOKEN_QUEUE,
+        request_exchange=REQUEST_TOKEN_EXCHANGE,
+        response_queue='',
+        response_exchange=RESPONSE_TOKEN_EXCHANGE
+    )
+    response = await client.send(payload={"username": "second_user", "password": "123456"})
+    access_token = response[Response.CONTENT_FIELD_NAME]['access_token']
+
+    client = RpcAmqpClient(
+        sanic_server.app,
+        routing_key=REQUEST_QUEUE,
+        request_exchange=REQUEST_EXCHANGE,
+        response_queue='',
+        response_exchange=RESPONSE_EXCHANGE
+    )
+    response = await client.send(payload={
+        "user_ids": [str(first_user.id), missing_user_id],
+        "access_tokens": [access_token, access_token[:-1]]
+    })
+
+    assert Response.EVENT_FIELD_NAME in response.keys()
+    assert Response.CONTENT_FIELD_NAME in response.keys()
+    content = response[Response.CONTENT_FIELD_NAME]
+
+    assert content["users"] == {
+        str(first_user.id): {
+            "id": str(first_user.id),
+            "username": "first_user",
+            "permissions": []
+        },
+        str(second_user.id): {
+            "id": str(second_user.id),
+            "username": "second_user",
+            "permissions": []
+        },
+        missing_user_id: None,
+    }
+    errors = content["errors"]["access_tokens"]
+    assert list(errors.keys()) == ["1", ]
+    assert errors["1"][Response.ERROR_TYPE_FIELD_NAME] == TOKEN_ERROR
+
+    await User.collection.delete_many({})
+
+
+async def test_user_profile_batch_returns_validation_error_for_empty_request(sanic_server):
+    client = RpcAmqpClient(
+        sanic_server.app,
+        routing_key=REQUEST_QUEUE,
+        request_exchange=REQUEST_EXCHANGE,
+        response_queue='',
+        response_exchange=RESPONSE_EXCHANGE
+    )
+    response = await client.send(payload={})
+
+    assert Response.ERROR_FIELD_NAME in response.keys()
+    errors = response[Response.ERROR_FIELD_NAME]
+    assert errors[Response.ERROR_TYPE_FIELD_NAME] == VALIDATION_ERROR
+    assert errors[Response.ERROR_DETAILS_FIELD_NAME] == {
+        "user_ids": ["Specify from 1 to 1000 user identifiers and tokens in total."]
+    }
+
+
+async def test_user_profile_batch_returns_errors_for_tokens_without_user_id(sanic_server):
+    app = sanic_server.app
+    signing_key = app.jwt_key_set.active_key
+    access_tokens = [
+        generate_access_token(build_payload(app), signing_key),
+        generate_access_token(build_payload(app, extra_data={"user_id": "invalid"}), signing_key),
+    ]
+
+    client = RpcAmqpClient(
+        sanic_server.app,
+        routing_key=REQUEST_QUEUE,
+        request_exchange=REQUEST_EXCHANGE,
+        response_queue='',
+        response_exchange=RESPONSE_EXCHANGE
+    )
+    response = await client.send(payload={"user_ids": [], "access_tokens": access_tokens})
+
+    assert Response.CONTENT_FIELD_NAME in response.keys()
+    content = response[Response.CONTENT_FIELD_NAME]
+    assert content["users"] == {}
+    errors = content["errors"]["access_tokens"]
+    assert sorted(errors.keys()) == ["0", "1"]
+    for error in errors.values():
+        assert error[Response.ERROR_TYPE_FIELD_NAME] == VALIDATION_ERROR
+        assert error[Response.ERROR_DETAILS_FIELD_NAME] == \
+            "Token doesn't contain a valid user identifier."
@@ -0,0 +1,135 @@
+import asyncio
+
+from app.users.cache import UserProfileCache, invalidate_user_profile, invalidate_user_profiles
+
+
+async def test_user_profile_cache_serves_stale_profiles_while_revalidating(sanic_server):
+    storage = sanic_server.app.redis_storage
+    cache = UserProfileCache(storage, 'test.profiles', ttl=0, stale_ttl=60)
+    await sanic_server.app.redis.delete(
+        cache.generation_key, cache.get_key('user'), cache.get_version_key('user')
+    )
+    calls = []
+
+    async def loader(user_id):
+        calls.append(user_id)
+        return {"id": user_id, "version": len(calls)}
+
+    assert await cache.get_or_load('user', loader) == {"id": 'user', "version": 1}
+    assert await cache.get_or_load('user', loader) == {"id": 'user', "version": 1}
+    await asyncio.sleep(0.1)
+    assert await cache.get_or_load('user', loader) == {"id": 'user', "version": 2}
+    await asyncio.sleep(0.1)
+
+    await cache.invalidate_all()
+    assert await cache.get_or_load('user', loader) == {"id": 'user', "version": 4}
+
+    stats = cache.get_stats()
+    assert stats["misses"] == 2
+    assert stats["stale_hits"] == 2
+    assert stats["refreshes"] == 2
+    assert stats["hit_ratio"] == 0.5
+
+    await sanic_server.app.redis.delete(
+        cache.generation_key, cache.get_key('user'), cache.get_version_key('user')
+    )
+
+
+async def test_user_profile_cache_invalidates_a_single_user(sanic_server):
+    storage = sanic_server.app.redis_storage
+    cache = UserProfileCache(storage, 'test.profiles', ttl=60, stale_ttl=60)
+    keys = [cache.generation_key, cache.get_key('user'), cache.get_version_key('user')]
+    await sanic_server.app.redis.delete(*keys)
+    calls = []
+
+    async def loader(user_id):
+        calls.append(user_id)
+        return {"id": user_id, "version": len(calls)}
+
+    assert await cache.get_or_load('user', loader) == {"id": 'user', "version": 1}
+    assert await cache.get_or_load('user', loader) == {"id": 'user', "version": 1}
+    await cache.invalidate_user('user')
+    assert await cache.get_or_load('user', loader) == {"id": 'user', "version": 2}
+
+    stats = cache.get_stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 2
+
+    await sanic_server.app.redis.delete(*keys)
+
+
+async def test_user_profile_cache_ignores_profiles_loaded_before_invalidation(sanic_server):
+    storage = sanic_server.app.redis_storage
+    cache = UserProfileCache(storage, 'test.profiles', ttl=60, stale_ttl=60)
+    keys = [cache.generation_key, cache.get_key('user'), cache.get_version_key('user')]
+    await sanic_server.app.redis.delete(*keys)
+    loading = asyncio.Event()
+    release = asyncio.Event()
+    calls = []
+
+    async def slow_loader(user_id):
+        calls.append(user_id)
+        loading.set()
+        await release.wait()
+        return {"id": user_id, "version": len(calls)}
+
+    task = asyncio.ensure_future(cache.get_or_load('user', slow_loader))
+    await loading.wait()
+    # The profile is updated while the previous state is being loaded
+    await cache.invalidate_user('user')
+    release.set()
+    assert await task == {"id": 'user', "version": 1}
+
+    assert await cache.get_or_load('user', slow_loader) == {"id": 'user', "version": 2}
+    assert cache.get_stats()["misses"] == 2
+
+    await sanic_server.app.redis.delete(*keys)
+
+
+async def test_user_profile_cache_serves_stale_profiles_when_refresh_fails(sanic_server):
+    storage = sanic_server.app.redis_storage
+    cache = UserProfileCache(storage, 'test.profiles', ttl=0, stale_ttl=60)
+    keys = [cache.generation_key, cache.get_key('user'), cache.get_version_key('user')]
+    await sanic_server.app.redis.delete(*keys)
+    calls = []
+
+    async def failing_loader(user_id):
+        calls.append(user_id)
+        if len(calls) > 1:
+            raise ValueError('Lookup failed.')
+        return {"id": user_id}
+
+    assert await cache.get_or_load('user', failing_loader) == {"id": 'user'}
+    assert await cache.get_or_load('user', failing_loader) == {"id": 'user'}
+    await asyncio.sleep(0.1)
+    assert await cache.get_or_load('user', failing_loader) == {"id": 'user'}
+    await asyncio.sleep(0.1)
+
+    stats = cache.get_stats()
+    assert stats["stale_hits"] == 2
+    assert stats["refresh_errors"] == 2
+    assert stats["refreshes"] == 0
+
+    await sanic_server.app.redis.delete(*keys)
+
+
+def test_invalidate_user_profile_ignores_redis_failures():
+
+    class FailingStorage(object):
+
+        async def transaction(self, *commands):
+            raise ConnectionError('Redis is unavailable.')
+
+        async def execute(self, command, *args):
+            raise ConnectionError('Redis is unavailable.')
+
+    class FakeApp(object):
+        redis = 'redis'
+        profile_cache = UserProfileCache(FailingStorage(), 'test.profiles', ttl=60)
+
+    loop = asyncio.new_event_loop()
+    try:
+        loop.run_until_complete(invalidate_user_profile(FakeApp(), 'user'))
+        loop.run_until_complete(invalidate_user_profiles(FakeApp()))
+    finally:
+        loop.close()
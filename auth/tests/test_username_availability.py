@@ -0,0 +1,67 @@
+from sage_utils.amqp.clients import RpcAmqpClient
+from sage_utils.constants import VALIDATION_ERROR
+from sage_utils.wrappers import Response
+
+from app.users.documents import User
+from app.users.api.workers.username_availability import UsernameAvailabilityWorker
+
+
+REQUEST_QUEUE = UsernameAvailabilityWorker.QUEUE_NAME
+REQUEST_EXCHANGE = UsernameAvailabilityWorker.REQUEST_EXCHANGE_NAME
+RESPONSE_EXCHANGE = UsernameAvailabilityWorker.RESPONSE_EXCHANGE_NAME
+
+
+async def test_username_availability_for_a_registered_username(sanic_server):
+    await User.collection.delete_many({})
+    await User(**{"username": "user", "password": "123456"}).commit()
+
+    client = RpcAmqpClient(
+        sanic_server.app,
+        routing_key=REQUEST_QUEUE,
+        request_exchange=REQUEST_EXCHANGE,
+        response_queue='',
+        response_exchange=RESPONSE_EXCHANGE
+    )
+    response = await client.send(payload={"username": "user"})
+
+    assert Response.EVENT_FIELD_NAME in response.keys()
+    assert Response.CONTENT_FIELD_NAME in response.keys()
+    assert response[Response.CONTENT_FIELD_NAME] == {"username": "user", "is_available": False}
+
+    await User.collection.delete_many({})
+
+
+async def test_username_availability_for_an_unknown_username(sanic_server):
+    await User.collection.delete_many({})
+
+    client = RpcAmqpClient(
+        sanic_server.app,
+        routing_key=REQUEST_QUEUE,
+        request_exchange=REQUEST_EXCHANGE,
+        response_queue='',
+        response_exchange=RESPONSE_EXCHANGE
+    )
+    response = await client.send(payload={"username": "unknown_user"})
+
+    assert Response.EVENT_FIELD_NAME in response.keys()
+    assert Response.CONTENT_FIELD_NAME in response.keys()
+    assert response[Response.CONTENT_FIELD_NAME] == {
+        "username": "unknown_user",
+        "is_available": True
+    }
+
+
+async def test_username_availability_returns_validation_error_for_an_empty_username(sanic_server):  # NOQA
+    client = RpcAmqpClient(
+        sanic_server.app,
+        routing_key=REQUEST_QUEUE,
+        request_exchange=REQUEST_EXCHANGE,
+        response_queue='',
+        response_exchange=RESPONSE_EXCHANGE
+    )
+    response = await client.send(payload={"username": ""})
+
+    assert Response.ERROR_FIELD_NAME in response.keys()
+    error = response[Response.ERROR_FIELD_NAME]
+    assert error[Response.ERROR_TYPE_FIELD_NAME] == VALIDATION_ERROR
+    assert error[Response.ERROR_DETAILS_FIELD_NAME] == {"username": ["Field cannot be blank."]}
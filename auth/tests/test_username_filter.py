@@ -0,0 +1,86 @@
+import asyncio
+
+from app.users.usernames import USERNAME_ADDED_EVENT, UsernameFilter, register_username
+
+
+def test_username_filter_falls_back_to_database_until_loaded():
+    username_filter = UsernameFilter(capacity=100)
+
+    assert username_filter.might_exist("user") is True
+    assert username_filter.get_stats()["checks"] == 0
+
+
+def test_username_filter_rejects_unknown_usernames():
+    username_filter = UsernameFilter(capacity=100)
+    bloom_filter = username_filter.create_bloom_filter(expected_count=2)
+    bloom_filter.add("first_user")
+    bloom_filter.add("second_user")
+    username_filter.replace(bloom_filter)
+
+    assert username_filter.might_exist("first_user") is True
+    assert username_filter.might_exist("second_user") is True
+    assert username_filter.might_exist("unknown_user") is False
+    stats = username_filter.get_stats()
+    assert stats["usernames"] == 2
+    assert stats["checks"] == 3
+    assert stats["rejected"] == 1
+
+
+def test_username_filter_keeps_usernames_added_while_loading():
+    username_filter = UsernameFilter(capacity=100)
+    bloom_filter = username_filter.create_bloom_filter()
+    bloom_filter.add("first_user")
+    username_filter.add("second_user")
+    username_filter.replace(bloom_filter)
+
+    assert username_filter.might_exist("first_user") is True
+    assert username_filter.might_exist("second_user") is True
+
+
+def test_register_username_is_broadcast_while_the_filter_is_loading():
+    published = []
+
+    class FakeBroadcaster(object):
+
+        async def publish(self, redis, event, data=None):
+            published.append((redis, event, data))
+
+    class FakeApp(object):
+        redis = 'redis'
+        broadcaster = FakeBroadcaster()
+        username_filter = UsernameFilter(capacity=100)
+
+    app = FakeApp()
+    app.username_filter.create_bloom_filter()
+
+    loop = asyncio.new_event_loop()
+    try:
+        loop.run_until_complete(register_username(app, "user"))
+    finally:
+        loop.close()
+
+    assert published == [('redis', USERNAME_ADDED_EVENT, {"username": "user"}), ]
+    assert app.username_filter.added_while_loading == ["user", ]
+
+
+def test_register_username_ignores_broadcast_failures():
+
+    class FailingBroadcaster(object):
+
+        async def publish(self, redis, event, data=None):
+            raise ConnectionError('Redis is unavailable.')
+
+    class FakeApp(object):
+        redis = 'redis'
+        broadcaster = FailingBroadcaster()
+        username_filter = UsernameFilter(capacity=100)
+
+    app = FakeApp()
+
+    loop = asyncio.new_event_loop()
+    try:
+        loop.run_until_complete(register_username(app, "user"))
+    finally:
+        loop.close()
+
+    assert "user" in app.username_filter.bloom_filter
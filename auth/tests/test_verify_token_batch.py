@@ -0,0 +1,110 @@
+from sage_utils.amqp.clients import RpcAmqpClient
+from sage_utils.constants import VALIDATION_ERROR, TOKEN_ERROR
+from sage_utils.wrappers import Response
+
+from app.token.api.workers.generate_token import GenerateTokenWorker
+from app.token.api.workers.verify_token_batch import VerifyTokenBatchWorker
+from app.users.documents import User
+
+
+REQUEST_TOKEN_QUEUE = GenerateTokenWorker.QUEUE_NAME
+REQUEST_TOKEN_EXCHANGE = GenerateTokenWorker.REQUEST_EXCHANGE_NAME
+RESPONSE_TOKEN_EXCHANGE = GenerateTokenWorker.RESPONSE_EXCHANGE_NAME
+
+REQUEST_QUEUE = VerifyTokenBatchWorker.QUEUE_NAME
+REQUEST_EXCHANGE = VerifyTokenBatchWorker.REQUEST_EXCHANGE_NAME
+RESPONSE_EXCHANGE = VerifyTokenBatchWorker.RESPONSE_EXCHANGE_NAME
+
+
+async def test_verify_token_batch_returns_result_per_access_token(sanic_server):
+    await User.collection.delete_many({})
+    user = User(**{"username": "user", "password": "123456"})
+    await user.commit()
+
+    payload = {
+        "username": "user",
+        "password": "123456"
+    }
+    client = RpcAmqpClient(
+        sanic_server.app,
+        routing_key=REQUEST_TOKEN_QUEUE,
+        request_exchange=REQUEST_TOKEN_EXCHANGE,
+        response_queue='',
+        response_exchange=RESPONSE_TOKEN_EXCHANGE
+    )
+    response = await client.send(payload=payload)
+
+    assert Response.EVENT_FIELD_NAME in response.keys()
+    assert Response.CONTENT_FIELD_NAME in response.keys()
+    tokens = response[Response.CONTENT_FIELD_NAME]
+
+    verify_payload = {
+        "access_tokens": [tokens['access_token'], tokens['access_token'][:-1]]
+    }
+    client = RpcAmqpClient(
+        sanic_server.app,
+        routing_key=REQUEST_QUEUE,
+        request_exchange=REQUEST_EXCHANGE,
+        response_queue='',
+        response_exchange=RESPONSE_EXCHANGE
+    )
+    response = await client.send(payload=verify_payload)
+
+    assert Response.EVENT_FIELD_NAME in response.keys()
+    assert Response.CONTENT_FIELD_NAME in response.keys()
+    content = response[Response.CONTENT_FIELD_NAME]
+
+    assert 'results' in content.keys()
+    assert len(content['results']) == 2
+
+    valid_token_result = content['results'][0]
+    assert valid_token_result['is_valid'] is True
+    assert valid_token_result['claims']['user_id'] == str(user.id)
+
+    invalid_token_result = content['results'][1]
+    assert invalid_token_result['is_valid'] is False
+    assert 'claims' not in invalid_token_result.keys()
+    error = invalid_token_result[Response.ERROR_FIELD_NAME]
+    assert error[Response.ERROR_TYPE_FIELD_NAME] == TOKEN_ERROR
+    assert error[Response.ERROR_DETAILS_FIELD_NAME] == 'Signature verification failed.'
+
+    await User.collection.delete_one({'id': user.id})
+
+
+async def test_verify_token_batch_returns_a_validation_error_for_missing_tokens(sanic_server):
+    client = RpcAmqpClient(
+        sanic_server.app,
+        routing_key=REQUEST_QUEUE,
+        request_exchange=REQUEST_EXCHANGE,
+        response_queue='',
+        response_exchange=RESPONSE_EXCHANGE
+    )
+    response = await client.send(payload={})
+
+    assert Response.ERROR_FIELD_NAME in response.keys()
+    assert Response.EVENT_FIELD_NAME in response.keys()
+    assert Response.CONTENT_FIELD_NAME not in response.keys()
+
+    errors = response[Response.ERROR_FIELD_NAME]
+    assert errors[Response.ERROR_TYPE_FIELD_NAME] == VALIDATION_ERROR
+    assert 'access_tokens' in errors[Response.ERROR_DETAILS_FIELD_NAME]
+    assert len(errors[Response.ERROR_DETAILS_FIELD_NAME]['access_tokens']) == 1
+    assert errors[Response.ERROR_DETAILS_FIELD_NAME]['access_tokens'][0] == 'Missing data for ' \
+                                                                            'required field.'
+
+
+async def test_verify_token_batch_returns_a_validation_error_for_an_empty_list(sanic_server):
+    client = RpcAmqpClient(
+        sanic_server.app,
+        routing_key=REQUEST_QUEUE,
+        request_exchange=REQUEST_EXCHANGE,
+        response_queue='',
+        response_exchange=RESPONSE_EXCHANGE
+    )
+    response = await client.send(payload={"access_tokens": []})
+
+    assert Response.ERROR_FIELD_NAME in response.keys()
+    errors = response[Response.ERROR_FIELD_NAME]
+    assert errors[Response.ERROR_TYPE_FIELD_NAME] == VALIDATION_ERROR
+    assert errors[Response.ERROR_DETAILS_FIELD_NAME]['access_tokens'][0] == \
+        'Field must contain from 1 to 1000 tokens.'